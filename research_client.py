@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_URL = "https://chat-api.you.com/research"
+
+# Retried with backoff; any other status fails the query immediately
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class ResearchError(Exception):
+    """A research query failed after all retries."""
+
+
+class ResearchResult(NamedTuple):
+    """Outcome of one query: either ``data`` or ``error`` is set."""
+    index: int
+    query: str
+    data: Optional[dict]
+    error: Optional[str]
+    attempts: int
+    seconds: float
+    cached: bool
+
+
+class ResponseCache:
+    """
+    In-memory cache of research responses keyed by query text.
+
+    Entries expire ``ttl`` seconds after they were stored; beyond
+    ``max_entries`` the oldest are dropped.
+    """
+
+    def __init__(self, ttl=3600, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(query)
+            if entry is None:
+                return None
+            stored, data = entry
+            if self.ttl is not None and time.monotonic() - stored > self.ttl:
+                del self._entries[query]
+                return None
+            return data
+
+    def put(self, query: str, data: dict):
+        with self._lock:
+            # Re-inserting moves the query to the end, i.e. the newest entry
+            self._entries.pop(query, None)
+            self._entries[query] = (time.monotonic(), data)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResearchClient:
+    """
+    Client for the You.com research API that reuses pooled connections.
+
+    Queries share one ``requests.Session``, so repeated calls skip the TCP
+    and TLS handshakes. Every request has a timeout; connection errors,
+    timeouts and 408/409/429/5xx answers are retried with exponential
+    backoff (honouring Retry-After). Answers are cached by query text.
+
+    Args:
+        api_key (str): You.com API key
+        chat_id (str): Chat the research queries belong to
+        url (str): Research endpoint, e.g. a local stub server in tests
+        timeout (tuple): (connect, read) timeouts in seconds
+        max_retries (int): Retries per query after the first attempt
+        base_delay (float): Initial backoff in seconds
+        max_delay (float): Longest backoff in seconds
+        pool_size (int): Connections kept open to the API
+        cache (ResponseCache): Response cache; None disables caching
+    """
+
+    def __init__(
+        self,
+        api_key,
+        chat_id,
+        url=DEFAULT_URL,
+        timeout=(5.0, 120.0),
+        max_retries=3,
+        base_delay=1.0,
+        max_delay=30.0,
+        pool_size=10,
+        cache=None,
+    ):
+        self.chat_id = chat_id
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.pool_size = pool_size
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"X-API-Key": api_key, "Content-Type": "application/json"})
+
+    def research(self, query: str) -> dict:
+        """
+        Run one research query.
+
+        Args:
+            query (str): The research question
+
+        Returns:
+            dict: The decoded JSON answer
+
+        Raises:
+            ResearchError: If the query still fails after all retries
+        """
+        data, error, _, _ = self._research(query)
+        if error is not None:
+            raise ResearchError(error)
+        return data
+
+    def research_many(self, queries, max_workers=None):
+        """
+        Run research queries concurrently over the pooled connections.
+
+        Repeated queries are sent once.
+
+        Args:
+            queries (iterable of str): The research questions
+            max_workers (int): Queries in flight (default: the pool size)
+
+        Returns:
+            list of ResearchResult: One result per query, in input order
+        """
+        queries = list(queries)
+        unique = list(dict.fromkeys(queries))
+
+        def run(query):
+            started = time.perf_counter()
+            data, error, attempts, cached = self._research(query)
+            return data, error, attempts, time.perf_counter() - started, cached
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.pool_size) as pool:
+            outcomes = dict(zip(unique, pool.map(run, unique)))
+        results = []
+        seen = set()
+        for index, query in enumerate(queries):
+            data, error, attempts, seconds, cached = outcomes[query]
+            if query in seen:
+                # A repeat is answered by the first occurrence's request
+                attempts, seconds, cached = 0, 0.0, True
+            seen.add(query)
+            results.append(ResearchResult(index, query, data, error, attempts, seconds, cached))
+        return results
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _research(self, query):
+        """Returns (data, error, attempts, cached)."""
+        if self.cache is not None:
+            data = self.cache.get(query)
+            if data is not None:
+                return data, None, 0, True
+        payload = {"query": query, "chat_id": self.chat_id}
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error, retryable = f"Error: {str(e)}", True
+            except requests.RequestException as e:
+                error, retryable = f"Error: {str(e)}", False
+            else:
+                if response.status_code < 400:
+                    try:
+                        data = response.json()
+                    except ValueError as e:
+                        return None, f"Error: Invalid JSON response: {str(e)}", attempt, False
+                    if self.cache is not None:
+                        self.cache.put(query, data)
+                    return data, None, attempt, False
+                error = f"Error: HTTP {response.status_code}: {response.text[:200]}"
+                retryable = response.status_code in RETRY_STATUS_CODES
+                retry_after = response.headers.get("retry-after")
+            if not retryable or attempt > self.max_retries:
+                return None, error, attempt, False
+            time.sleep(self._retry_delay(attempt, retry_after))
+
+    def _retry_delay(self, attempt, retry_after):
+        """Seconds to wait: the server's Retry-After, else full-jitter backoff."""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def client_from_env(**kwargs) -> ResearchClient:
+    """
+    ResearchClient configured from the environment: YOU_API_KEY, CHAT_ID
+    and optionally YOU_RESEARCH_URL, with a response cache of
+    RESEARCH_CACHE_TTL seconds (default one hour; 0 disables it).
+
+    Args:
+        **kwargs: Overrides of the ResearchClient arguments
+    """
+    ttl = float(os.environ.get("RESEARCH_CACHE_TTL", 3600))
+    options = {
+        "api_key": os.environ.get("YOU_API_KEY"),
+        "chat_id": os.environ.get("CHAT_ID"),
+        "url": os.environ.get("YOU_RESEARCH_URL", DEFAULT_URL),
+        "cache": ResponseCache(ttl=ttl) if ttl > 0 else None,
+    }
+    options.update(kwargs)
+    return ResearchClient(**options)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run You.com research queries concurrently.")
+    parser.add_argument("input", help="File with one query per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Where to write JSONL results ('-' for stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="Queries in flight")
+    parser.add_argument("--url", default=None, help="Research endpoint (e.g. a local stub server)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Read timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per query")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with infile:
+        queries = [line.strip() for line in infile if line.strip()]
+    overrides = {"pool_size": args.concurrency, "timeout": (5.0, args.timeout), "max_retries": args.retries}
+    if args.url:
+        overrides["url"] = args.url
+    with client_from_env(**overrides) as client:
+        results = client.research_many(queries)
+
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for result in results:
+            outfile.write(json.dumps(result._asdict()) + "\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    failed = sum(1 for result in results if result.error)
+    print(f"{len(results) - failed} answered, {failed} failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The modules are imported as top-level names, the way the apps import them
+for path in (
+    ROOT,
+    os.path.join(ROOT, "yoast_seo", "streamlit_app"),
+    os.path.join(ROOT, "yoast_seo", "yoastEvalsFinal", "mainyoastfiles"),
+):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Never read or write the shared completion cache from the tests
+os.environ["LLM_CACHE_PATH"] = "off"
@@ -0,0 +1,87 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class OpenAIStub:
+    """
+    Local HTTP server answering the chat completions endpoint like the
+    OpenAI API, plain or streamed, with a fixed reply.
+
+    ``errors`` is a list of (status, headers) answered, in order, before any
+    successful reply. Every request body is kept in ``requests``.
+
+    Use as a context manager; ``base_url`` is the value for the clients.
+    """
+
+    def __init__(self, reply="Rewritten article.", errors=()):
+        self.reply = reply
+        self.errors = list(errors)
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.requests.append({
+                        "path": self.path, "authorization": self.headers.get("Authorization"), "body": body,
+                    })
+                    error = stub.errors.pop(0) if stub.errors else None
+                if error is not None:
+                    status, headers = error
+                    self._send(status, {"error": {"message": f"stub error {status}", "type": "stub"}}, headers)
+                elif body.get("stream"):
+                    self._stream(body)
+                else:
+                    self._send(200, {
+                        "id": "stub", "object": "chat.completion", "created": 0, "model": body.get("model"),
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": stub.reply}}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                    })
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                base = {"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body.get("model")}
+                # One chunk per word, spaces kept
+                words = stub.reply.split(" ")
+                pieces = [word + " " for word in words[:-1]] + words[-1:]
+                chunks = [
+                    {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                    for piece in pieces
+                ]
+                chunks.append({**base, "choices": [], "usage": {
+                    "prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15,
+                }})
+                for chunk in chunks:
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}/v1"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+openai = pytest.importorskip("openai")
+
+from async_correction import TokenBucket, run_completions_async
+
+
+def _status_error(error_class, status, headers=None):
+    # Only the attributes the errors and the retry logic read from a response
+    response = SimpleNamespace(request=None, status_code=status, headers=headers or {})
+    return error_class(f"stub error {status}", response=response, body=None)
+
+
+class FakeClient:
+    """
+    AsyncOpenAI-shaped client. ``script`` maps a prompt to the errors raised
+    by its first calls; later calls answer "<prompt> rewritten" after a delay
+    that makes earlier prompts finish last.
+    """
+
+    def __init__(self, script=None):
+        self.script = {prompt: list(errors) for prompt, errors in (script or {}).items()}
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages):
+        prompt = messages[-1]["content"]
+        self.calls.append(prompt)
+        errors = self.script.get(prompt)
+        if errors:
+            raise errors.pop(0)
+        await asyncio.sleep(0.01 * (10 - int(prompt.split()[-1])))
+        message = SimpleNamespace(content=f"{prompt} rewritten")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(total_tokens=12))
+
+
+def _requests(n):
+    return [([{"role": "user", "content": f"article {i}"}], 10) for i in range(n)]
+
+
+def _run(client, n, **kwargs):
+    return asyncio.run(run_completions_async(_requests(n), client=client, base_delay=0.0, **kwargs))
+
+
+def test_rate_limit_error_is_retried_and_results_keep_input_order():
+    client = FakeClient({"article 2": [_status_error(openai.RateLimitError, 429, {"retry-after": "0"})]})
+    results = _run(client, 5, concurrency=3)
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.content for result in results] == [f"article {i} rewritten" for i in range(5)]
+    assert [result.attempts for result in results] == [1, 1, 2, 1, 1]
+    assert all(result.error is None and result.tokens == 12 for result in results)
+    assert client.calls.count("article 2") == 2
+
+
+def test_retries_stop_after_max_retries():
+    errors = [_status_error(openai.InternalServerError, 503) for _ in range(3)]
+    results = _run(FakeClient({"article 0": errors}), 2, max_retries=2)
+    assert results[0].attempts == 3
+    assert results[0].content is None and "503" in results[0].error
+    assert results[1].content == "article 1 rewritten"
+
+
+def test_client_errors_are_not_retried():
+    client = FakeClient({"article 1": [_status_error(openai.BadRequestError, 400)]})
+    results = _run(client, 2)
+    assert results[1].attempts == 1
+    assert results[1].error is not None
+    assert client.calls.count("article 1") == 1
+
+
+def test_token_bucket_limits_rate():
+    async def acquire_all(bucket, n):
+        started = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire(1)
+        return time.monotonic() - started
+
+    # 600 per minute is 10 per second; the first one comes from the full bucket
+    elapsed = asyncio.run(acquire_all(TokenBucket(600, capacity=1), 4))
+    assert 0.25 <= elapsed < 1.0
@@ -0,0 +1,56 @@
+import json
+import os
+from contextlib import contextmanager
+
+import pytest
+
+import article_document
+from article_document import parse_article
+from eval_profiler import count_regex_calls_for, profile_evaluation
+from yoastevals import CRITERIA, collect_stats, evaluate_article_detailed
+
+SAMPLE_CORPUS = os.path.join(
+    os.path.dirname(__file__), "..", "yoast_seo", "yoastEvalsFinal", "benchmarks", "sample_corpus.jsonl"
+)
+ARTICLES = [
+    ("", "anything"),
+    ("Just one sentence about bread", "bread"),
+    (
+        "# Baking bread\n\nBaking bread at home is fun. However, it takes time! "
+        "Bread needs flour. Bread needs water. Bread needs salt.\n\n"
+        "## Tools\n\nSee [our guide](/guide) and https://example.com for more.\n\n"
+        "![A loaf](loaf.png)\n\n<img src=\"crumb.jpg\">",
+        "baking bread",
+    ),
+]
+with open(SAMPLE_CORPUS, encoding="utf-8") as corpus:
+    ARTICLES += [(row["content"], row["keyphrase"]) for row in map(json.loads, corpus)]
+
+
+@pytest.mark.parametrize("content, keyphrase", ARTICLES)
+def test_profile_matches_plain_evaluation(content, keyphrase):
+    results, profile = profile_evaluation(content, keyphrase, count_regex_calls=True)
+    assert results == evaluate_article_detailed(content, keyphrase)
+    assert set(profile.criteria) == set(CRITERIA)
+    assert set(profile.stages) >= {"keyphrase search", "scoring"}
+    assert profile.counts["regex_calls"] > 0 or not content.strip()
+
+
+@pytest.mark.parametrize("content, keyphrase", ARTICLES)
+def test_timed_stats_match_plain_stats(content, keyphrase):
+    names = []
+
+    @contextmanager
+    def timer(name):
+        names.append(name)
+        yield
+
+    doc = parse_article(content)
+    assert collect_stats(doc, timer) == collect_stats(doc)
+    assert names and set(names) <= set(CRITERIA)
+
+
+def test_regex_counting_leaves_module_patterns_alone():
+    patterns = {name: value for name, value in vars(article_document).items() if name.endswith("_RE")}
+    count_regex_calls_for(ARTICLES[2][0])
+    assert patterns == {name: value for name, value in vars(article_document).items() if name.endswith("_RE")}
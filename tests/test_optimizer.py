@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("openai")
+
+from openai_stub import OpenAIStub
+from optimizer import optimize_until_green
+
+ARTICLE = "A short article about sourdough bread.\n\nIt needs more words."
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_own_client_uses_api_key_and_base_url(streamed):
+    deltas = []
+    with OpenAIStub(reply="Sourdough bread is easy to bake at home.") as stub:
+        result = optimize_until_green(
+            ARTICLE, "sourdough bread",
+            max_iterations=1,
+            api_key="test-key",
+            base_url=stub.base_url,
+            on_delta=deltas.append if streamed else None,
+        )
+    assert len(stub.requests) == 1
+    assert stub.requests[0]["path"] == "/v1/chat/completions"
+    assert stub.requests[0]["authorization"] == "Bearer test-key"
+    assert stub.requests[0]["body"].get("stream", False) is streamed
+    assert result.iterations[1].error is None
+    assert result.stop_reason != "rewrite failed"
+    if streamed:
+        assert "".join(deltas) == "Sourdough bread is easy to bake at home."
+
+
+def test_targeted_rewrite_uses_base_url():
+    with OpenAIStub(reply="Sourdough bread is easy to bake at home.") as stub:
+        result = optimize_until_green(
+            ARTICLE, "sourdough bread", max_iterations=1, targeted=True,
+            api_key="test-key", base_url=stub.base_url,
+        )
+    assert stub.requests
+    assert all(request["authorization"] == "Bearer test-key" for request in stub.requests)
+    assert result.stop_reason != "rewrite failed"
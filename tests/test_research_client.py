@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+import research_client
+from research_client import ResearchClient, ResponseCache
+
+
+class ResearchStub:
+    """Local research endpoint answering ``responses`` (status, headers) in order, then 200s."""
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.queries = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.queries.append(body["query"])
+                status, headers = stub.responses.pop(0) if stub.responses else (200, {})
+                payload = {"answer": f"about {body['query']}"} if status == 200 else {"error": "busy"}
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/research"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def test_429_with_retry_after_is_retried_once(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(research_client.time, "sleep", sleeps.append)
+    with ResearchStub([(429, {"Retry-After": "7"})]) as stub, \
+            ResearchClient("key", "chat", url=stub.url, max_retries=3) as client:
+        (result,) = client.research_many(["sourdough"])
+    assert result.error is None
+    assert result.data == {"answer": "about sourdough"}
+    assert result.attempts == 2
+    assert stub.queries == ["sourdough", "sourdough"]
+    # Retry-After is honoured instead of the jittered backoff
+    assert sleeps == [7.0]
+
+
+def test_non_retryable_status_fails_at_once():
+    with ResearchStub([(400, {})]) as stub, ResearchClient("key", "chat", url=stub.url) as client:
+        (result,) = client.research_many(["sourdough"])
+    assert result.attempts == 1
+    assert "HTTP 400" in result.error
+    assert stub.queries == ["sourdough"]
+
+
+def test_cached_responses_expire_after_ttl():
+    cache = ResponseCache(ttl=0.2)
+    with ResearchStub() as stub, ResearchClient("key", "chat", url=stub.url, cache=cache) as client:
+        first = client.research_many(["sourdough"])[0]
+        second = client.research_many(["sourdough"])[0]
+        time.sleep(0.3)
+        third = client.research_many(["sourdough"])[0]
+    assert (first.cached, second.cached, third.cached) == (False, True, False)
+    assert second.data == first.data
+    assert stub.queries == ["sourdough", "sourdough"]
@@ -1,29 +1,24 @@
-import requests
 import streamlit as st
 import os
 from dotenv import load_dotenv
 
+from research_client import client_from_env
+
 # Load environment variables
 load_dotenv()
 
-def research(query):
-    url = "https://chat-api.you.com/research"
-    
-    # Get API key from environment variable
-    api_key = os.getenv('YOU_API_KEY', st.secrets["YOU_API_KEY"])
-    chat_id = os.getenv('CHAT_ID', st.secrets["CHAT_ID"])
+def _secret(name):
+    # The environment wins; st.secrets is only consulted as a fallback
+    return os.getenv(name) or st.secrets[name]
 
-    payload = {
-        "query": query,
-        "chat_id": chat_id
-    }
-    headers = {
-        "X-API-Key": api_key,
-        "Content-Type": "application/json"
-    }
+@st.cache_resource
+def get_research_client():
+    # Created once per server process, so reruns reuse pooled connections
+    # and the response cache
+    return client_from_env(api_key=_secret("YOU_API_KEY"), chat_id=_secret("CHAT_ID"))
 
-    response = requests.request("POST", url, json=payload, headers=headers)
-    return response.json()
+def research(query):
+    return get_research_client().research(query)
 
 # Streamlit UI with some styling
 st.set_page_config(
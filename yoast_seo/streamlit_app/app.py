@@ -1,13 +1,12 @@
 import streamlit as st
 import sys
 import os
-import pandas as pd
 
 # Add the path to the yoastevals.py file
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
 
-# Import the evaluate_article function
-from yoastevals import evaluate_article
+# Import the evaluation cache so unchanged content is not re-scored
+from eval_cache import default_cache
 
 # Set page config
 st.set_page_config(
@@ -80,8 +79,10 @@ with col1:
     evaluate_button = st.button("Evaluate Content", type="primary")
 
 # Function to display results
-def display_results(results):
+def display_results(results, cached=False):
     st.subheader("Evaluation Results")
+    if cached:
+        st.caption("♻️ Served from the evaluation cache")
     
     # Count scores for summary
     green_count = 0
@@ -126,11 +127,11 @@ def display_results(results):
 if evaluate_button and article_content and focus_keyword:
     with st.spinner("Evaluating your content..."):
         # Run the evaluation
-        results = evaluate_article(article_content, focus_keyword)
+        results, cached = default_cache.get_with_status(article_content, focus_keyword)
         
         # Display results in the second column
         with col2:
-            display_results(results)
+            display_results(results, cached)
             
             # No additional table needed as results are already displayed as colored text
 elif evaluate_button:
@@ -161,4 +162,6 @@ with st.sidebar:
     """)
     
     st.markdown("---")
+    cache_stats = default_cache.stats()
+    st.caption(f"Evaluation cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
     st.markdown("Made with ❤️ using Streamlit")
@@ -1,16 +1,20 @@
 import streamlit as st
 import sys
 import os
-import pandas as pd
+import time
+from pathlib import Path
 
 # Add the path to the yoastevals.py file
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
 
-# Import the evaluate_article function
-from yoastevals import evaluate_article
+# Import the evaluation cache so unchanged content is not re-scored
+from eval_cache import default_cache
 
-# Import the GPT correction function
-from gpt_correction import generate_correction
+# optimize_until_green and pandas are imported where they are used, so
+# that opening the app does not wait for them (or for openai)
+from completion_cache import default_completion_cache
+from optimization_cache import OptimizationCache
+from prompt_templates import build_messages, prompt_size
 
 # Set page config
 st.set_page_config(
@@ -84,26 +88,48 @@ with col1:
     article_content = st.text_area("Paste your article content here (Markdown format supported)", height=400)
     focus_keyword = st.text_input("Enter your focus keyword or keyphrase")
     
+    targeted_mode = st.checkbox(
+        "Only rewrite the passages that fail a criterion",
+        help="Faster and cheaper on long articles; article-wide criteria such as keyphrase density are not addressed",
+    )
+    max_rounds = st.number_input(
+        "Rewrite rounds", min_value=1, max_value=10, value=3,
+        help="Each rewrite is re-evaluated; rewriting stops early once every criterion is Green or the score stops improving",
+    )
+    token_budget = st.number_input("Token budget (0 for no limit)", min_value=0, value=0, step=10_000)
+    
     # Optimize button (evaluates and rewrites content)
     optimize_button = st.button("Optimize", type="primary")
 
-# Run evaluation when button is clicked
-# Import dotenv to load environment variables from .env file
-import dotenv
-from pathlib import Path
+# Load environment variables from the .env file in the agents/yoast_seo
+# directory, once per server process rather than on every rerun
+@st.cache_resource
+def load_environment():
+    import dotenv
+    dotenv.load_dotenv(Path(os.path.dirname(__file__)).parent / '.env')
 
-# Load environment variables from .env file in the agents/yoast_seo directory
-dotenv_path = Path(os.path.dirname(__file__)).parent / '.env'
-dotenv.load_dotenv(dotenv_path)
+load_environment()
+
+# Finished optimizations, shared by every session of this server process
+# and bounded like st.cache_data(max_entries=...)
+@st.cache_resource
+def optimization_cache():
+    return OptimizationCache(maxsize=32)
 
 # Check if OpenAI API key is set
 if 'OPENAI_API_KEY' not in os.environ:
     st.sidebar.warning("⚠️ OpenAI API key not set. Please check the .env file in the agents/yoast_seo directory.")
 
+# Run evaluation when button is clicked
 if optimize_button and article_content and focus_keyword:
+    import pandas as pd
+    from optimizer import optimize_until_green
+    
     with st.spinner("Evaluating your content..."):
-        # Run the evaluation
-        results = evaluate_article(article_content, focus_keyword)
+        # Run the evaluation, unless this text was scored before
+        started = time.perf_counter()
+        results, evaluation_cached = default_cache.get_with_status(article_content, focus_keyword)
+        evaluation_seconds = time.perf_counter() - started
         
         # Store results in session state for later use with GPT
         st.session_state.article_content = article_content
@@ -113,6 +139,10 @@ if optimize_button and article_content and focus_keyword:
         # Display results in the second column
         with col2:
             st.subheader("Evaluation Results")
+            if evaluation_cached:
+                st.caption("♻️ Served from the evaluation cache")
+            else:
+                st.caption(f"Evaluated in {evaluation_seconds * 1000:.0f} ms")
             
             # Count scores for summary
             green_count = 0
@@ -168,10 +198,74 @@ if optimize_button and article_content and focus_keyword:
             results_df = pd.DataFrame(results_data)
             st.dataframe(results_df)
             
-                        # Now automatically generate rewritten content
-            with st.spinner("Generating AI-rewritten content..."):
-                # Call GPT API to get rewritten content
-                st.session_state.rewritten_content = generate_correction(article_content, focus_keyword, results)
+            # Now automatically generate rewritten content, showing the text
+            # as it streams in and scoring each round as soon as it ends
+            st.subheader("Optimization Rounds")
+            rounds_table = st.empty()
+            stream_status = st.empty()
+            stream_box = st.empty()
+            rounds = []
+            streamed = []
+            last_render = [0.0]
+            
+            def show_delta(text):
+                streamed.append(text)
+                # Re-render at most ~10 times a second; long articles arrive
+                # in thousands of small pieces
+                now = time.monotonic()
+                if now - last_render[0] > 0.1:
+                    last_render[0] = now
+                    stream_box.markdown("".join(streamed))
+            
+            def show_round(report):
+                rounds.append(report._asdict())
+                rounds_table.dataframe(pd.DataFrame(rounds))
+                streamed.clear()
+                stream_status.caption(f"Round {report.iteration + 1} in progress...")
+            
+            # The same text, keyword and settings give the same rewrite, so a
+            # repeated request is answered without evaluating or calling o3-mini
+            options = dict(
+                max_iterations=int(max_rounds),
+                token_budget=int(token_budget) or None,
+                targeted=targeted_mode,
+            )
+            optimization = optimization_cache().get(article_content, focus_keyword, **options)
+            rewrite_cached = optimization is not None
+            if rewrite_cached:
+                rounds_table.dataframe(pd.DataFrame([report._asdict() for report in optimization.iterations]))
+            else:
+                if not targeted_mode:
+                    size = prompt_size(build_messages(article_content, focus_keyword, results))
+                    st.caption(
+                        f"First-round prompt: about {size.total:,} tokens "
+                        f"({size.system:,} in the shared system prompt)"
+                    )
+                
+                with st.spinner("Generating AI-rewritten content..."):
+                    # Rewrite, re-evaluate and repeat until Green or out of budget
+                    optimization = optimize_until_green(
+                        article_content,
+                        focus_keyword,
+                        on_iteration=show_round,
+                        on_delta=show_delta,
+                        **options,
+                    )
+                optimization_cache().put(article_content, focus_keyword, optimization, **options)
+                stream_status.empty()
+                stream_box.empty()
+            st.session_state.rewritten_content = optimization.content
+            
+            if rewrite_cached:
+                st.caption("♻️ Served from the rewrite cache: no rewriting or API calls for this run")
+            st.caption(
+                f"Stopped: {optimization.stop_reason}. "
+                f"Best score {optimization.score} using {optimization.tokens_used:,} tokens."
+            )
+            if optimization.stop_reason == "rewrite failed":
+                st.error(optimization.iterations[-1].error)
+            elif optimization.content == article_content:
+                st.warning("No rewrite scored better than the original, so the original is shown.")
                 
             # Display rewritten content
             st.markdown("---")
@@ -251,4 +345,12 @@ with st.sidebar:
     """)
     
     st.markdown("---")
+    cache_stats = default_cache.stats()
+    st.caption(f"Evaluation cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    optimization_stats = optimization_cache().stats()
+    st.caption(f"Optimization cache: {optimization_stats['hits']} hits, {optimization_stats['size']} stored")
+    completion_cache = default_completion_cache()
+    if completion_cache is not None:
+        completion_stats = completion_cache.stats()
+        st.caption(f"Rewrite cache: {completion_stats['hits']} hits, {completion_stats['size']} stored")
     st.markdown("Made with ❤️ using Streamlit and OpenAI's o3-mini model")
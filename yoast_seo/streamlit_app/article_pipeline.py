@@ -0,0 +1,320 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, NamedTuple, Optional
+
+# Add the path to the yoastevals.py file, and the repository root for
+# research_client.py
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from yoastevals import evaluate_article_detailed
+
+_DONE = object()
+
+
+class ArticleJob(NamedTuple):
+    """One article moving through the pipeline; each stage fills in a field."""
+    index: int
+    topic: str
+    keyphrase: str
+    research: Optional[dict] = None
+    draft: Optional[str] = None
+    draft_results: Optional[dict] = None
+    content: Optional[str] = None
+    results: Optional[dict] = None
+    # Set by the first stage that failed; later stages pass the job through
+    error: Optional[str] = None
+
+
+class Stage(NamedTuple):
+    """
+    A pipeline stage: ``workers`` threads apply ``func`` to jobs taken from
+    a queue of at most ``queue_size`` jobs.
+    """
+    name: str
+    func: Callable[[ArticleJob], ArticleJob]
+    workers: int
+    queue_size: int
+
+
+class StageMetrics(NamedTuple):
+    """Throughput of one stage over a pipeline run."""
+    name: str
+    completed: int
+    failed: int
+    # Summed over workers: time spent in the stage function
+    busy_seconds: float
+    # Summed over workers: time spent waiting for room in the next queue
+    blocked_seconds: float
+    max_queue_depth: int
+    items_per_second: float
+
+
+class _StageState:
+    def __init__(self, stage):
+        self.stage = stage
+        self.queue = queue.Queue(maxsize=stage.queue_size)
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.max_depth = 0
+        self.first_start = None
+        self.last_end = None
+        self.running = stage.workers
+
+
+def run_pipeline(jobs, stages: List[Stage]):
+    """
+    Push jobs through stages that run concurrently.
+
+    Every stage has its own worker threads and a bounded input queue, so a
+    slow stage fills its queue and blocks the stage before it instead of
+    letting work pile up in memory. Network-bound stages therefore overlap
+    with CPU-bound ones. A job whose ``error`` is set skips the remaining
+    stages.
+
+    Args:
+        jobs (iterable of ArticleJob): The work; consumed lazily
+        stages (list of Stage): Stages in order
+
+    Returns:
+        tuple: (list of ArticleJob in input order, list of StageMetrics)
+    """
+    states = [_StageState(stage) for stage in stages]
+    finished = []
+    started = time.perf_counter()
+
+    def worker(position):
+        state = states[position]
+        next_queue = states[position + 1].queue if position + 1 < len(states) else None
+        while True:
+            job = state.queue.get()
+            if job is _DONE:
+                break
+            with state.lock:
+                state.max_depth = max(state.max_depth, state.queue.qsize() + 1)
+            begin = time.perf_counter()
+            if job.error is None:
+                try:
+                    job = state.stage.func(job)
+                except Exception as e:
+                    job = job._replace(error=f"Error: {state.stage.name}: {str(e)}")
+                failed = job.error is not None
+            else:
+                failed = None
+            end = time.perf_counter()
+            with state.lock:
+                if failed is not None:
+                    state.completed += not failed
+                    state.failed += failed
+                    state.busy += end - begin
+                    state.first_start = begin if state.first_start is None else min(state.first_start, begin)
+                    state.last_end = end if state.last_end is None else max(state.last_end, end)
+            if next_queue is None:
+                finished.append(job)
+            else:
+                next_queue.put(job)
+                with state.lock:
+                    state.blocked += time.perf_counter() - end
+        with state.lock:
+            state.running -= 1
+            last = state.running == 0
+        if last and next_queue is not None:
+            # The stage is drained: let the next one stop as well
+            for _ in range(states[position + 1].stage.workers):
+                next_queue.put(_DONE)
+
+    threads = [
+        threading.Thread(target=worker, args=(position,), name=f"{state.stage.name}-{n}", daemon=True)
+        for position, state in enumerate(states)
+        for n in range(state.stage.workers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for job in jobs:
+            states[0].queue.put(job)
+    finally:
+        # Even if ``jobs`` raises, stop the stages once the jobs already
+        # queued are done, so no thread is left waiting on its queue
+        for _ in range(stages[0].workers):
+            states[0].queue.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    elapsed = time.perf_counter() - started
+    metrics = []
+    for state in states:
+        active = (state.last_end - state.first_start) if state.first_start is not None else 0.0
+        done = state.completed + state.failed
+        metrics.append(StageMetrics(
+            state.stage.name,
+            state.completed,
+            state.failed,
+            state.busy,
+            state.blocked,
+            state.max_depth,
+            done / (active or elapsed or 1.0),
+        ))
+    finished.sort(key=lambda job: job.index)
+    return finished, metrics
+
+
+def _llm_error(answer):
+    return answer if answer.startswith("Error:") else None
+
+
+def build_article_stages(
+    research_client,
+    research_workers=4,
+    llm_workers=4,
+    cpu_pool=None,
+    cpu_workers=2,
+    queue_size=8,
+    cache=None,
+):
+    """
+    The research → draft → evaluate → rewrite → evaluate stages.
+
+    Args:
+        research_client (ResearchClient): Client for the research API
+        research_workers (int): Research queries in flight
+        llm_workers (int): Draft and rewrite requests in flight, per stage
+        cpu_pool (concurrent.futures.Executor): Pool that scores articles;
+            None scores them in the stage's own threads
+        cpu_workers (int): Threads feeding the scoring pool, per stage
+        queue_size (int): Jobs waiting in front of each stage
+        cache (CompletionCache): Completion cache for the model calls
+
+    Returns:
+        list of Stage: Stages for run_pipeline
+    """
+    from gpt_correction import complete, generate_correction
+    from prompt_templates import build_draft_messages
+
+    def evaluate(content, keyphrase):
+        if cpu_pool is None:
+            return evaluate_article_detailed(content, keyphrase)
+        return cpu_pool.submit(evaluate_article_detailed, content, keyphrase).result()
+
+    def research(job):
+        return job._replace(research=research_client.research(job.topic))
+
+    def draft(job):
+        answer = complete(build_draft_messages(job.topic, job.keyphrase, job.research), cache)
+        return job._replace(draft=answer, error=_llm_error(answer))
+
+    def evaluate_draft(job):
+        return job._replace(draft_results=evaluate(job.draft, job.keyphrase))
+
+    def rewrite(job):
+        answer = generate_correction(job.draft, job.keyphrase, job.draft_results, cache=cache)
+        return job._replace(content=answer, error=_llm_error(answer))
+
+    def evaluate_rewrite(job):
+        return job._replace(results=evaluate(job.content, job.keyphrase))
+
+    return [
+        Stage("research", research, research_workers, queue_size),
+        Stage("draft", draft, llm_workers, queue_size),
+        Stage("evaluate draft", evaluate_draft, cpu_workers, queue_size),
+        Stage("rewrite", rewrite, llm_workers, queue_size),
+        Stage("evaluate", evaluate_rewrite, cpu_workers, queue_size),
+    ]
+
+
+def research_to_articles(topics, research_client=None, processes=2, **kwargs):
+    """
+    Research, draft, score and rewrite an article per (topic, keyphrase).
+
+    Args:
+        topics (iterable of tuple): (topic, keyphrase) pairs
+        research_client (ResearchClient): Defaults to one configured from
+            the environment
+        processes (int): Worker processes scoring articles (0 scores them
+            in threads). They are started with "spawn", so a script calling
+            this needs an ``if __name__ == "__main__":`` guard
+        **kwargs: Worker and queue options of build_article_stages
+
+    Returns:
+        tuple: (list of ArticleJob in input order, list of StageMetrics)
+    """
+    from research_client import client_from_env
+
+    own_client = research_client is None
+    if own_client:
+        research_client = client_from_env(pool_size=kwargs.get("research_workers", 4))
+    cpu_pool = None
+    if processes:
+        # Workers start on the first submit, from a stage thread. Forking
+        # then would copy a process whose research and model threads may
+        # hold locks (HTTP pools, logging), so start clean interpreters.
+        cpu_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        kwargs.setdefault("cpu_workers", processes or 2)
+        stages = build_article_stages(research_client, cpu_pool=cpu_pool, **kwargs)
+        jobs = (ArticleJob(index, topic, keyphrase) for index, (topic, keyphrase) in enumerate(topics))
+        return run_pipeline(jobs, stages)
+    finally:
+        if cpu_pool is not None:
+            cpu_pool.shutdown()
+        if own_client:
+            research_client.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Research, draft, score and rewrite articles in bulk.")
+    parser.add_argument("input", help="JSONL file with 'topic' and 'keyphrase' fields per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Where to write JSONL results ('-' for stdout)")
+    parser.add_argument("--research-workers", type=int, default=4, help="Research queries in flight")
+    parser.add_argument("--llm-workers", type=int, default=4, help="Model requests in flight per stage")
+    parser.add_argument("-j", "--processes", type=int, default=2, help="Worker processes scoring articles")
+    parser.add_argument("--queue-size", type=int, default=8, help="Jobs waiting in front of each stage")
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with infile:
+        records = [json.loads(line) for line in infile if line.strip()]
+    jobs, metrics = research_to_articles(
+        ((record["topic"], record["keyphrase"]) for record in records),
+        processes=args.processes,
+        research_workers=args.research_workers,
+        llm_workers=args.llm_workers,
+        queue_size=args.queue_size,
+    )
+
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for job in jobs:
+            row = {"index": job.index, "topic": job.topic, "keyphrase": job.keyphrase}
+            if records[job.index].get("id") is not None:
+                row["id"] = records[job.index]["id"]
+            row.update(
+                content=job.content,
+                draft_scores={c: r.score for c, r in (job.draft_results or {}).items()},
+                scores={c: r.score for c, r in (job.results or {}).items()},
+                error=job.error,
+            )
+            outfile.write(json.dumps(row) + "\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    for m in metrics:
+        print(
+            f"{m.name:>15}: {m.completed} ok, {m.failed} failed, {m.items_per_second:.2f}/s, "
+            f"busy {m.busy_seconds:.1f}s, blocked {m.blocked_seconds:.1f}s, max queue {m.max_queue_depth}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
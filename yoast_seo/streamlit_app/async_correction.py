@@ -0,0 +1,465 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import NamedTuple, Optional
+
+# openai is imported in the functions that call the API: it is the slowest
+# import of the app, and cached or dry-run completions never need it
+from completion_cache import default_completion_cache
+from prompt_templates import build_messages, prompt_size
+
+# Retried with backoff; any other API error fails the item immediately
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Asynchronous token bucket refilled continuously at ``rate_per_minute``.
+
+    acquire() waits until enough capacity is available. Callers are served
+    in arrival order, so a large request is not starved by small ones.
+
+    Args:
+        rate_per_minute (float): Capacity added per minute
+        capacity (float): Maximum burst size (defaults to one minute's worth)
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A request larger than the bucket would wait forever; let it through
+        # once the bucket is full instead
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._available < amount:
+                await asyncio.sleep((amount - self._available) / self.rate)
+                self._refill()
+            self._available -= amount
+
+    def adjust(self, amount: float):
+        """Charge (or refund, if negative) the difference from an estimate."""
+        self._refill()
+        self._available = min(self.capacity, self._available - amount)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits applied together.
+
+    Args:
+        requests_per_minute (float): Maximum requests started per minute
+        tokens_per_minute (float): Maximum (estimated) tokens per minute
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, tokens: float):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+def estimate_tokens(messages, expected_output_chars: int) -> int:
+    """
+    Rough token count of a request: the prompt plus the expected answer
+    (about four characters per token).
+    """
+    prompt_chars = sum(len(message["content"]) for message in messages)
+    return (prompt_chars + expected_output_chars) // 4 + 1
+
+
+class CorrectionResult(NamedTuple):
+    """Outcome of one rewrite: either ``content`` or ``error`` is set."""
+    index: int
+    content: Optional[str]
+    error: Optional[str]
+    attempts: int
+    seconds: float
+    # Tokens billed: reported usage, or the estimate if none was reported
+    tokens: int = 0
+
+
+def _retry_delay(error, attempt, base_delay, max_delay):
+    """Delay before the next attempt: Retry-After if sent, else full jitter."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(max_delay, float(retry_after))
+            except ValueError:
+                pass
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def _is_retryable(error):
+    import openai
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRY_STATUS_CODES
+
+
+async def _complete(client, limiter, cache, model, index, request, max_retries, base_delay, max_delay):
+    messages, expected_output_chars = request
+    started = time.monotonic()
+    if cache is not None:
+        cached = cache.get(model, messages)
+        if cached is not None:
+            return CorrectionResult(index, cached, None, 0, time.monotonic() - started)
+        if cache.dry_run:
+            return CorrectionResult(index, None, "Error: No cached completion (dry run).", 0, time.monotonic() - started)
+    import openai
+    estimate = estimate_tokens(messages, expected_output_chars)
+    attempt = 0
+    while True:
+        attempt += 1
+        await limiter.acquire(estimate)
+        try:
+            response = await client.chat.completions.create(model=model, messages=messages)
+        except openai.OpenAIError as e:
+            if attempt > max_retries or not _is_retryable(e):
+                return CorrectionResult(index, None, f"Error: {str(e)}", attempt, time.monotonic() - started)
+            await asyncio.sleep(_retry_delay(e, attempt - 1, base_delay, max_delay))
+            continue
+
+        usage = getattr(response, "usage", None)
+        tokens = estimate
+        if usage is not None and usage.total_tokens:
+            tokens = usage.total_tokens
+            limiter.tokens.adjust(tokens - estimate)
+        if response.choices and response.choices[0].message.content:
+            content = response.choices[0].message.content.strip()
+            if cache is not None:
+                cache.put(model, messages, content)
+            return CorrectionResult(index, content, None, attempt, time.monotonic() - started, tokens)
+        return CorrectionResult(
+            index, None, "Error: Unable to generate rewritten content.", attempt, time.monotonic() - started, tokens
+        )
+
+
+async def stream_completion_async(
+    messages,
+    on_delta,
+    model="o3-mini",
+    concurrency=None,
+    requests_per_minute=500,
+    tokens_per_minute=200_000,
+    max_retries=5,
+    base_delay=1.0,
+    max_delay=60.0,
+    client=None,
+    api_key=None,
+    base_url=None,
+    cache=None,
+    on_result=None,
+):
+    """
+    Run one chat completion, passing the text to ``on_delta`` as it arrives.
+
+    Errors before the first piece of text are retried like in
+    run_completions_async; once text has been delivered an error ends the
+    request. A cached completion is delivered in one piece. Takes the
+    options of run_completions_async, so callers can use either.
+
+    Args:
+        messages (list): The chat messages
+        on_delta (callable): Called with each new piece of text
+        model (str): Chat model to use
+        concurrency (int): Has no effect on a single request
+        requests_per_minute (float): Request rate limit
+        tokens_per_minute (float): Token rate limit
+        max_retries (int): Retries after the first attempt
+        base_delay (float): Backoff before the first retry, in seconds
+        max_delay (float): Upper bound of any single backoff, in seconds
+        client (openai.AsyncOpenAI): Client to use (created if not given)
+        api_key (str): Key for the created client (default: OPENAI_API_KEY)
+        base_url (str): API base URL for the created client (default:
+            OPENAI_BASE_URL)
+        cache (CompletionCache): Cache of earlier completions (defaults to
+            the shared on-disk cache)
+        on_result (callable): Optional callback invoked with the
+            CorrectionResult once the request completes
+
+    Returns:
+        CorrectionResult: The complete text (index 0)
+    """
+    started = time.monotonic()
+
+    def finish(result):
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    if cache is None:
+        cache = default_completion_cache()
+    if cache is not None:
+        cached = cache.get(model, messages)
+        if cached is not None:
+            on_delta(cached)
+            return finish(CorrectionResult(0, cached, None, 0, time.monotonic() - started))
+        if cache.dry_run:
+            return finish(CorrectionResult(0, None, "Error: No cached completion (dry run).", 0, time.monotonic() - started))
+
+    import openai
+    own_client = client is None
+    if own_client:
+        client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    # The rewrite is expected to be about as long as the prompt's article
+    estimate = estimate_tokens(messages, len(messages[-1]["content"]))
+    attempt = 0
+    try:
+        while True:
+            attempt += 1
+            pieces = []
+            tokens = 0
+            await limiter.acquire(estimate)
+            try:
+                stream = await client.chat.completions.create(
+                    model=model, messages=messages, stream=True, stream_options={"include_usage": True}
+                )
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None) is not None:
+                        tokens = chunk.usage.total_tokens
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        piece = chunk.choices[0].delta.content
+                        pieces.append(piece)
+                        on_delta(piece)
+            except openai.OpenAIError as e:
+                if pieces or attempt > max_retries or not _is_retryable(e):
+                    return finish(CorrectionResult(0, None, f"Error: {str(e)}", attempt, time.monotonic() - started))
+                await asyncio.sleep(_retry_delay(e, attempt - 1, base_delay, max_delay))
+                continue
+            break
+    finally:
+        if own_client:
+            await client.close()
+
+    content = "".join(pieces).strip()
+    if not tokens:
+        tokens = estimate_tokens(messages, len(content))
+    limiter.tokens.adjust(tokens - estimate)
+    if not content:
+        return finish(CorrectionResult(
+            0, None, "Error: Unable to generate rewritten content.", attempt, time.monotonic() - started, tokens
+        ))
+    if cache is not None:
+        cache.put(model, messages, content)
+    return finish(CorrectionResult(0, content, None, attempt, time.monotonic() - started, tokens))
+
+
+async def run_completions_async(
+    requests,
+    model="o3-mini",
+    concurrency=8,
+    requests_per_minute=500,
+    tokens_per_minute=200_000,
+    max_retries=5,
+    base_delay=1.0,
+    max_delay=60.0,
+    client=None,
+    api_key=None,
+    base_url=None,
+    cache=None,
+    on_result=None,
+):
+    """
+    Run many chat completions concurrently with one shared OpenAI client.
+
+    At most ``concurrency`` requests are in flight, and requests and
+    estimated tokens are both rate limited. Rate-limit (429), server (5xx)
+    and connection errors are retried with jittered exponential backoff;
+    a failing item is reported in its result and does not stop the others.
+
+    Args:
+        requests (iterable): (messages, expected_output_chars) tuples
+        model (str): Chat model to use
+        concurrency (int): Maximum number of requests in flight
+        requests_per_minute (float): Request rate limit
+        tokens_per_minute (float): Token rate limit
+        max_retries (int): Retries per item after the first attempt
+        base_delay (float): Backoff before the first retry, in seconds
+        max_delay (float): Upper bound of any single backoff, in seconds
+        client (openai.AsyncOpenAI): Client to use; by default one is created
+            and closed here
+        api_key (str): Key for the created client (default: OPENAI_API_KEY)
+        base_url (str): API base URL for the created client, e.g. a local
+            OpenAI-compatible mock server (default: OPENAI_BASE_URL)
+        cache (CompletionCache): Cache of earlier completions (defaults to
+            the shared on-disk cache); hits cost no tokens and no requests
+        on_result (callable): Optional callback invoked with each
+            CorrectionResult as soon as it completes
+
+    Returns:
+        list of CorrectionResult: One result per request, in input order
+    """
+    if cache is None:
+        cache = default_completion_cache()
+    # A dry run never reaches the API, so it needs no client (or API key)
+    own_client = client is None and not (cache is not None and cache.dry_run)
+    if own_client:
+        import openai
+        # Retries are handled here, with the rate limiter in the loop
+        client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = []
+
+    async def worker():
+        while True:
+            entry = await queue.get()
+            try:
+                if entry is None:
+                    return
+                started = time.monotonic()
+                try:
+                    result = await _complete(client, limiter, cache, model, *entry, max_retries, base_delay, max_delay)
+                    if on_result is not None:
+                        on_result(result)
+                except Exception as e:
+                    # A cache error, a malformed response or a failing
+                    # callback fails this item only, like an API error
+                    result = CorrectionResult(entry[0], None, f"Error: {type(e).__name__}: {e}", 0,
+                                              time.monotonic() - started)
+                results.append(result)
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    all_workers = asyncio.gather(*workers)
+
+    async def put(entry):
+        try:
+            queue.put_nowait(entry)
+            return
+        except asyncio.QueueFull:
+            pass
+        # Wait for room, unless the workers stop: nothing would then empty
+        # the queue and the put would block forever
+        put_task = asyncio.ensure_future(queue.put(entry))
+        await asyncio.wait({put_task, all_workers}, return_when=asyncio.FIRST_COMPLETED)
+        if not put_task.done():
+            put_task.cancel()
+            all_workers.result()
+            raise RuntimeError("all completion workers stopped")
+
+    try:
+        # Feed requests lazily so that a large backlog is not held in the queue
+        for index, request in enumerate(requests):
+            await put((index, request))
+        for _ in workers:
+            await put(None)
+        await all_workers
+    finally:
+        for task in workers:
+            task.cancel()
+        if not all_workers.done():
+            all_workers.cancel()
+        elif not all_workers.cancelled():
+            # Already raised above, if it failed; keeps asyncio from
+            # reporting the exception as never retrieved
+            all_workers.exception()
+        if own_client:
+            await client.close()
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+async def generate_corrections_async(items, **kwargs):
+    """
+    Rewrite many articles concurrently, each as generate_correction would.
+
+    Args:
+        items (iterable): (user_input, focus_keyword, yoast_results) tuples
+        **kwargs: Concurrency, rate limit, retry and client options of
+            run_completions_async
+
+    Returns:
+        list of CorrectionResult: One result per item, in input order
+    """
+    # The rewritten article is expected to be about as long as the original
+    requests = (
+        (build_messages(user_input, focus_keyword, yoast_results), len(user_input))
+        for user_input, focus_keyword, yoast_results in items
+    )
+    return await run_completions_async(requests, **kwargs)
+
+
+def generate_corrections(items, **kwargs):
+    """Blocking wrapper around generate_corrections_async."""
+    return asyncio.run(generate_corrections_async(items, **kwargs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite a JSONL file of articles concurrently.")
+    parser.add_argument("input", help="JSONL file with 'content' and 'keyphrase' fields per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Where to write JSONL results ('-' for stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--rpm", type=float, default=500, help="Requests per minute")
+    parser.add_argument("--tpm", type=float, default=200_000, help="Tokens per minute")
+    parser.add_argument("--model", default="o3-mini", help="Chat model")
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible API base URL (e.g. a mock server)")
+    parser.add_argument("--dry-run", action="store_true", help="Only serve rewrites from the completion cache")
+    args = parser.parse_args(argv)
+    if args.dry_run:
+        # Read by default_completion_cache when the shared cache is opened
+        os.environ["LLM_CACHE_DRY_RUN"] = "1"
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+    from yoastevals import evaluate_article_detailed
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    with infile:
+        records = [json.loads(line) for line in infile if line.strip()]
+    items = [
+        (record["content"], record["keyphrase"], evaluate_article_detailed(record["content"], record["keyphrase"]))
+        for record in records
+    ]
+    sizes = [prompt_size(build_messages(*item)) for item in items]
+    print(
+        f"{len(items)} prompts, {sum(size.total for size in sizes):,} input tokens "
+        f"({sum(size.system for size in sizes):,} in the shared system prompt)",
+        file=sys.stderr,
+    )
+    results = generate_corrections(
+        items,
+        model=args.model,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        base_url=args.base_url,
+    )
+
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for result in results:
+            row = {"index": result.index}
+            if records[result.index].get("id") is not None:
+                row["id"] = records[result.index]["id"]
+            row.update(content=result.content, error=result.error, attempts=result.attempts)
+            outfile.write(json.dumps(row) + "\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    failed = sum(1 for result in results if result.error)
+    print(f"{len(results) - failed} rewritten, {failed} failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
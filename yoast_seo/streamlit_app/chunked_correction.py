@@ -0,0 +1,204 @@
+import asyncio
+import os
+import sys
+from typing import List, NamedTuple, Optional
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from article_document import parse_article, rstrip_end
+from async_correction import CorrectionResult, run_completions_async
+from problem_spans import distribution_spans, splice_spans
+from prompt_templates import failing_summary
+from targeted_correction import build_span_messages
+from yoastevals import evaluate_article_detailed
+
+# Articles estimated above this many tokens are rewritten in chunks
+DEFAULT_CHUNK_TOKENS = 3000
+
+CHUNK_SYSTEM_PROMPT = """You are an expert SEO content optimizer. A long Markdown article has been split into parts that are rewritten separately and then joined back together in order. You will be given ONE part and a brief that applies to the whole article.
+
+Rewrite the part to improve its SEO performance following the brief. Keep every Markdown heading at its level (you may add lower-level subheadings), and keep the facts, numbers, links, images and citations (such as <sup> tags). Do not add an introduction or a conclusion unless the part is the first or the last one.
+
+Reply with the rewritten part only: no commentary and no code fences."""
+
+
+class Chunk(NamedTuple):
+    """A part of the article, ``text[start:end]``, rewritten on its own."""
+    start: int
+    end: int
+
+
+class ChunkedCorrection(NamedTuple):
+    """Outcome of a chunked rewrite."""
+    content: str
+    chunks: List[Chunk]
+    # One result per chunk; chunks whose rewrite failed are left unchanged
+    results: List[CorrectionResult]
+    # Paragraphs given the keyphrase afterwards to even out its distribution
+    distribution_results: List[CorrectionResult]
+    tokens: int
+    # Set only if no chunk could be rewritten
+    error: Optional[str]
+
+
+def split_into_chunks(article_content: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[Chunk]:
+    """
+    Split an article at its '#' heading lines into chunks of about
+    ``max_tokens`` tokens (four characters per token) at most.
+
+    Consecutive sections are packed into one chunk while they fit; a single
+    section larger than that is cut between paragraphs instead.
+
+    Args:
+        article_content (str): The article text
+        max_tokens (int): Token budget of one chunk
+
+    Returns:
+        list of Chunk: Chunks in article order; only whitespace lies between them
+    """
+    doc = parse_article(article_content)
+    if doc.body_start == doc.body_end:
+        return []
+    max_chars = max_tokens * 4
+
+    # Places where a chunk may start: the body start and every heading line,
+    # plus every paragraph inside sections too large for one chunk
+    section_starts = sorted({doc.body_start} | {doc.line_spans[i][0] for i in doc.heading_line_indices})
+    section_bounds = list(zip(section_starts, section_starts[1:] + [doc.body_end]))
+    cut_points = []
+    paragraph_starts = [p.start for p in doc.paragraphs]
+    for start, end in section_bounds:
+        cut_points.append(start)
+        if end - start > max_chars:
+            cut_points.extend(s for s in paragraph_starts if start < s < end)
+    cut_points.append(doc.body_end)
+
+    chunks = []
+    chunk_start = cut_points[0]
+    for previous, cut in zip(cut_points[1:-1], cut_points[2:]):
+        # Close the chunk before ``previous`` if the next unit would overflow it
+        if cut - chunk_start > max_chars and previous > chunk_start:
+            chunks.append(Chunk(chunk_start, rstrip_end(article_content, chunk_start, previous)))
+            chunk_start = previous
+    chunks.append(Chunk(chunk_start, doc.body_end))
+    return chunks
+
+
+def build_brief(focus_keyword, yoast_results):
+    """
+    The guidance shared by every chunk: the keyphrase, the article-wide
+    problems and the style every part has to follow.
+    """
+    return f"""Focus keyphrase: "{focus_keyword}"
+
+Problems found in the whole article:
+{failing_summary(yoast_results)}
+
+Style for every part:
+- Use the exact keyphrase about once every 100-150 words, spread evenly, and in some subheadings
+- Keep the voice, tense and reading level of the original
+- Paragraphs of at least three sentences and fewer than 150 words
+- Sentences of at most 20 words; at least 30% of sentences use transition words
+- No more than 300 words without a subheading
+- Do not start consecutive sentences with the same word"""
+
+
+def build_chunk_messages(chunk_text, position, count, brief):
+    """
+    Build the chat messages asking the model to rewrite one chunk.
+
+    Args:
+        chunk_text (str): The text of the chunk
+        position (int): Index of the chunk in the article
+        count (int): Number of chunks
+        brief (str): The shared brief from build_brief
+
+    Returns:
+        list: The system and user messages for the chat completions API
+    """
+    if count == 1:
+        place = "This is the whole article."
+    elif position == 0:
+        place = f"This is part 1 of {count}: the beginning of the article."
+    elif position == count - 1:
+        place = f"This is part {count} of {count}: the end of the article."
+    else:
+        place = f"This is part {position + 1} of {count}."
+    user_prompt = f"""{brief}
+
+{place}
+
+Part to rewrite:
+
+{chunk_text}
+
+REWRITTEN PART:"""
+    return [
+        {"role": "system", "content": CHUNK_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+async def generate_chunked_correction_async(
+    article_content,
+    focus_keyword,
+    yoast_results=None,
+    max_chunk_tokens=DEFAULT_CHUNK_TOKENS,
+    fix_distribution=True,
+    **kwargs,
+):
+    """
+    Rewrite a long article as heading-aligned chunks in parallel.
+
+    Every chunk gets the same keyphrase and style brief. The rewritten
+    chunks are joined back in order, then the keyphrase distribution of the
+    joined article is re-checked and paragraphs in segments lacking the
+    keyphrase are given it. Latency is that of the slowest chunk rather
+    than of the whole article.
+
+    Args:
+        article_content (str): The original article
+        focus_keyword (str): The focus keyword or keyphrase
+        yoast_results (dict): Evaluation results for the article, computed
+            here if not given
+        max_chunk_tokens (int): Token budget of one chunk
+        fix_distribution (bool): Re-check and fix the keyphrase
+            distribution after reassembly
+        **kwargs: Concurrency, rate limit, retry and client options of
+            run_completions_async
+
+    Returns:
+        ChunkedCorrection: The rewritten article and what was done
+    """
+    if yoast_results is None:
+        yoast_results = evaluate_article_detailed(article_content, focus_keyword)
+    chunks = split_into_chunks(article_content, max_chunk_tokens)
+    brief = build_brief(focus_keyword, yoast_results)
+    requests = [
+        (build_chunk_messages(article_content[c.start:c.end], i, len(chunks), brief), c.end - c.start)
+        for i, c in enumerate(chunks)
+    ]
+    results = await run_completions_async(requests, **kwargs) if requests else []
+    tokens = sum(result.tokens for result in results)
+    if results and all(result.error for result in results):
+        return ChunkedCorrection(article_content, chunks, results, [], tokens, results[0].error)
+    content = splice_spans(article_content, chunks, [result.content for result in results])
+
+    distribution_results = []
+    if fix_distribution:
+        spans = distribution_spans(content, focus_keyword)
+        fixes = [
+            (build_span_messages(content[span.start:span.end], focus_keyword, span.instructions), span.end - span.start)
+            for span in spans
+        ]
+        if fixes:
+            distribution_results = await run_completions_async(fixes, **kwargs)
+            tokens += sum(result.tokens for result in distribution_results)
+            content = splice_spans(content, spans, [result.content for result in distribution_results])
+    return ChunkedCorrection(content, chunks, results, distribution_results, tokens, None)
+
+
+def generate_chunked_correction(article_content, focus_keyword, yoast_results=None, **kwargs):
+    """Blocking wrapper around generate_chunked_correction_async."""
+    return asyncio.run(generate_chunked_correction_async(article_content, focus_keyword, yoast_results, **kwargs))
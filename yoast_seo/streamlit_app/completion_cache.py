@@ -0,0 +1,149 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+# Default location, next to the .env file in the yoast_seo directory
+DEFAULT_PATH = Path(os.path.dirname(__file__)).parent / '.llm_cache.sqlite'
+
+
+def completion_key(model: str, messages) -> str:
+    """Fingerprint of a chat request: the model and every message."""
+    digest = hashlib.sha256()
+    parts = [model]
+    for message in messages:
+        parts.extend((message["role"], message["content"]))
+    for part in parts:
+        encoded = part.encode("utf-8", "surrogatepass")
+        # Length-prefix each part so that ("ab", "c") and ("a", "bc") differ
+        digest.update(str(len(encoded)).encode("ascii") + b":" + encoded)
+    return digest.hexdigest()
+
+
+class CompletionCache:
+    """
+    SQLite cache of chat completions keyed on the model and a hash of the
+    prompts, so an identical request is answered without calling the API.
+
+    Entries expire ``ttl`` seconds after they were written and the table is
+    trimmed to ``max_entries`` rows, evicting the least recently used. In
+    dry-run mode callers must not call the API on a miss (see ``dry_run``).
+
+    Args:
+        path (str): SQLite file; None keeps the cache in memory
+        ttl (float): Seconds an entry stays valid (None for no expiry)
+        max_entries (int): Maximum number of completions kept
+        dry_run (bool): Serve only from the cache
+    """
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=10_000, dry_run=False):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.dry_run = dry_run
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(":memory:" if path is None else str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, content TEXT NOT NULL, "
+            "created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used)")
+        self._db.commit()
+        self._size = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+
+    def get(self, model: str, messages) -> Optional[str]:
+        """Return the cached completion, or None on a miss or if it expired."""
+        key = completion_key(model, messages)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT content, created FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self._db.commit()
+                self._size -= 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, messages, content: str):
+        """Store a completion, evicting expired and least recently used ones."""
+        key = completion_key(model, messages)
+        now = time.time()
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM completions WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, model, content, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now),
+            )
+            if not exists:
+                self._size += 1
+            if self.ttl is not None:
+                self._size -= self._db.execute(
+                    "DELETE FROM completions WHERE created < ?", (now - self.ttl,)
+                ).rowcount
+            excess = self._size - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM completions WHERE key IN "
+                    "(SELECT key FROM completions ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._size -= excess
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and the number of stored completions."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": self._size}
+
+    def clear(self):
+        """Drop every cached completion."""
+        with self._lock:
+            self._db.execute("DELETE FROM completions")
+            self._db.commit()
+            self._size = 0
+
+    def close(self):
+        self._db.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_completion_cache() -> Optional[CompletionCache]:
+    """
+    Process-wide cache shared by generate_correction and the async pipeline.
+
+    Configured from the environment: LLM_CACHE_PATH (file, default
+    yoast_seo/.llm_cache.sqlite; "off" disables caching), LLM_CACHE_TTL
+    (seconds), LLM_CACHE_MAX_ENTRIES and LLM_CACHE_DRY_RUN ("1" to serve
+    only from the cache).
+
+    Returns:
+        CompletionCache: The shared cache, or None if caching is off
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            path = os.environ.get("LLM_CACHE_PATH", str(DEFAULT_PATH))
+            if path.lower() == "off":
+                return None
+            ttl = os.environ.get("LLM_CACHE_TTL")
+            _default_cache = CompletionCache(
+                path=path,
+                ttl=float(ttl) if ttl else 7 * 24 * 3600,
+                max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 10_000)),
+                dry_run=os.environ.get("LLM_CACHE_DRY_RUN", "") == "1",
+            )
+        return _default_cache
@@ -0,0 +1,63 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from eval_cache import cache_key
+
+
+def _run_key(article_content, focus_keyword, options):
+    # Options are keyword arguments of optimize_until_green, all hashable
+    return cache_key(article_content, focus_keyword), tuple(sorted(options.items()))
+
+
+class OptimizationCache:
+    """
+    Bounded in-memory LRU of finished optimize_until_green runs, keyed on a
+    hash of the article, the focus keyword and the ruleset version plus the
+    options that shape the run, so repeating a request costs no evaluation
+    and no API call.
+
+    Runs that ended in "rewrite failed" are not kept: the failure is
+    usually transient (a rate limit or a missing key) and worth retrying.
+
+    Args:
+        maxsize (int): Maximum number of runs kept
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._runs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, article_content, focus_keyword, **options):
+        """Return the cached OptimizationResult for these inputs and options, or None."""
+        key = _run_key(article_content, focus_keyword, options)
+        with self._lock:
+            result = self._runs.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._runs.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, article_content, focus_keyword, result, **options):
+        """Keep a finished run; ``options`` must match those passed to get."""
+        if result.stop_reason == "rewrite failed":
+            return
+        key = _run_key(article_content, focus_keyword, options)
+        with self._lock:
+            self._runs[key] = result
+            self._runs.move_to_end(key)
+            while len(self._runs) > self.maxsize:
+                self._runs.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._runs)}
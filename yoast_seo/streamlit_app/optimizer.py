@@ -0,0 +1,205 @@
+import asyncio
+import os
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from async_correction import estimate_tokens, run_completions_async, stream_completion_async
+from chunked_correction import DEFAULT_CHUNK_TOKENS, generate_chunked_correction_async
+from completion_cache import default_completion_cache
+from prompt_templates import build_messages
+from incremental_eval import IncrementalEvaluator
+from targeted_correction import generate_targeted_correction_async
+from yoastevals import CRITERIA
+
+# Points per criterion; an article scoring MAX_SCORE is Green everywhere
+SCORE_POINTS = {"Green": 2, "Orange": 1, "Red": 0}
+MAX_SCORE = SCORE_POINTS["Green"] * len(CRITERIA)
+
+
+def article_score(results) -> int:
+    """Total points of a results dict (labels or CriterionResult values)."""
+    return sum(SCORE_POINTS[getattr(result, "score", result)] for result in results.values())
+
+
+class IterationReport(NamedTuple):
+    """One round of the loop; iteration 0 is the original article."""
+    iteration: int
+    score: int
+    green: int
+    tokens: int
+    rewrite_seconds: float
+    evaluate_seconds: float
+    error: Optional[str]
+
+
+class OptimizationResult(NamedTuple):
+    """Best candidate found by optimize_until_green and how it was reached."""
+    content: str
+    results: dict
+    score: int
+    iterations: List[IterationReport]
+    # "all green", "max iterations", "token budget", "no improvement" or
+    # "rewrite failed"
+    stop_reason: str
+    tokens_used: int
+
+
+async def _rewrite_whole(article_content, focus_keyword, results, on_delta=None, **kwargs):
+    if len(article_content) // 4 > DEFAULT_CHUNK_TOKENS:
+        # Too long for one call: rewrite heading-aligned chunks in parallel
+        # (there is then no single stream to show)
+        chunked = await generate_chunked_correction_async(article_content, focus_keyword, results, **kwargs)
+        return chunked.content, chunked.tokens, chunked.error
+    messages = build_messages(article_content, focus_keyword, results)
+    if on_delta is not None:
+        result = await stream_completion_async(messages, on_delta, **kwargs)
+    else:
+        (result,) = await run_completions_async([(messages, len(article_content))], **kwargs)
+    return result.content, result.tokens, result.error
+
+
+async def _rewrite_targeted(article_content, focus_keyword, results, on_delta=None, **kwargs):
+    # Passages are rewritten concurrently, so there is no single stream
+    targeted = await generate_targeted_correction_async(article_content, focus_keyword, results, **kwargs)
+    errors = [result.error for result in targeted.results if result.error]
+    if targeted.spans and len(errors) == len(targeted.spans):
+        return None, 0, errors[0]
+    return targeted.content, sum(result.tokens for result in targeted.results), None
+
+
+async def optimize_until_green_async(
+    article_content,
+    focus_keyword,
+    max_iterations=3,
+    token_budget=None,
+    patience=1,
+    targeted=False,
+    on_iteration=None,
+    on_delta=None,
+    client=None,
+    **kwargs,
+):
+    """
+    Rewrite an article repeatedly until every criterion is Green.
+
+    Each round rewrites the best candidate so far and re-scores the rewrite
+    in-process with an IncrementalEvaluator, which only re-parses paragraphs
+    the model actually changed. The loop stops when everything is Green,
+    after ``max_iterations`` rewrites, when the next rewrite would exceed
+    ``token_budget``, or after ``patience`` rounds without improvement.
+
+    Args:
+        article_content (str): The original article
+        focus_keyword (str): The focus keyword or keyphrase
+        max_iterations (int): Maximum number of rewrites
+        token_budget (int): Optional limit on total tokens spent
+        patience (int): Rounds without a better score before stopping
+        targeted (bool): Rewrite only failing passages instead of the whole
+            article each round
+        on_iteration (callable): Optional callback invoked with each
+            IterationReport as soon as it is available
+        on_delta (callable): Optional callback invoked with each piece of
+            text of a whole-article rewrite as the model streams it; every
+            rewrite is scored as soon as its stream ends
+        client (openai.AsyncOpenAI): Client to use; by default one is
+            created for the whole loop from ``api_key`` and ``base_url``
+        **kwargs: Rate limit, retry and client options (``api_key``,
+            ``base_url``) of run_completions_async
+
+    Returns:
+        OptimizationResult: The best-scoring candidate (possibly the
+            original) with a report of every round
+    """
+    evaluator = IncrementalEvaluator()
+    iterations = []
+
+    def report(iteration, score, results, tokens, rewrite_seconds, evaluate_seconds, error=None):
+        green = sum(1 for result in results.values() if result.score == "Green")
+        entry = IterationReport(iteration, score, green, tokens, rewrite_seconds, evaluate_seconds, error)
+        iterations.append(entry)
+        if on_iteration is not None:
+            on_iteration(entry)
+
+    started = time.perf_counter()
+    results = evaluator.evaluate_detailed(article_content, focus_keyword)
+    best_content, best_results, best_score = article_content, results, article_score(results)
+    report(0, best_score, results, 0, 0.0, time.perf_counter() - started)
+
+    rewrite = _rewrite_targeted if targeted else _rewrite_whole
+    cache = kwargs.get("cache") or default_completion_cache()
+    # The shared client below replaces the one the rewrite functions would
+    # build from these
+    api_key = kwargs.pop("api_key", None)
+    base_url = kwargs.pop("base_url", None)
+    # A dry run never reaches the API, so it needs no client (or API key)
+    own_client = client is None and not (cache is not None and cache.dry_run)
+    if own_client:
+        # Imported here so that loading the app does not wait for openai
+        import openai
+        try:
+            client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        except openai.OpenAIError as e:
+            # Typically a missing OPENAI_API_KEY
+            report(1, best_score, best_results, 0, 0.0, 0.0, f"Error: {str(e)}")
+            return OptimizationResult(best_content, best_results, best_score, iterations, "rewrite failed", 0)
+    tokens_used = 0
+    stale = 0
+    stop_reason = "max iterations"
+    try:
+        for iteration in range(1, max_iterations + 1):
+            if best_score == MAX_SCORE:
+                stop_reason = "all green"
+                break
+            if token_budget is not None:
+                expected = 0
+                if not targeted:
+                    # Stop before a whole rewrite that cannot fit rather than
+                    # overshooting the budget
+                    messages = build_messages(best_content, focus_keyword, best_results)
+                    expected = estimate_tokens(messages, len(best_content))
+                if tokens_used >= token_budget or tokens_used + expected > token_budget:
+                    stop_reason = "token budget"
+                    break
+
+            started = time.perf_counter()
+            candidate, tokens, error = await rewrite(
+                best_content, focus_keyword, best_results, on_delta=on_delta, client=client, **kwargs
+            )
+            rewrite_seconds = time.perf_counter() - started
+            tokens_used += tokens
+            if error is not None:
+                report(iteration, best_score, best_results, tokens, rewrite_seconds, 0.0, error)
+                stop_reason = "rewrite failed"
+                break
+
+            started = time.perf_counter()
+            results = evaluator.evaluate_detailed(candidate, focus_keyword)
+            evaluate_seconds = time.perf_counter() - started
+            score = article_score(results)
+            report(iteration, score, results, tokens, rewrite_seconds, evaluate_seconds)
+
+            if score > best_score:
+                best_content, best_results, best_score = candidate, results, score
+                stale = 0
+            else:
+                stale += 1
+                if stale >= patience:
+                    stop_reason = "no improvement"
+                    break
+        else:
+            if best_score == MAX_SCORE:
+                stop_reason = "all green"
+    finally:
+        if own_client:
+            await client.close()
+
+    return OptimizationResult(best_content, best_results, best_score, iterations, stop_reason, tokens_used)
+
+
+def optimize_until_green(article_content, focus_keyword, **kwargs):
+    """Blocking wrapper around optimize_until_green_async."""
+    return asyncio.run(optimize_until_green_async(article_content, focus_keyword, **kwargs))
@@ -0,0 +1,95 @@
+import streamlit as st
+import sys
+import os
+import io
+import json
+import pandas as pd
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from corpus_analytics import CorpusResults
+from yoastevals import CRITERIA
+
+# Set page config
+st.set_page_config(
+    page_title="Corpus Analytics",
+    page_icon="📊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+
+@st.cache_data
+def load_corpus(data, group_field):
+    # Cached on the uploaded bytes so changing a widget does not re-parse the file
+    return CorpusResults.from_jsonl(io.StringIO(data.decode("utf-8")), group_field or None)
+
+
+@st.cache_data
+def row_fields(data):
+    # Fields other than the results that the corpus can be grouped by
+    first_line = data.split(b"\n", 1)[0].strip()
+    if not first_line:
+        return []
+    return [field for field in json.loads(first_line) if field not in ("index", "results")]
+
+
+# Page title
+st.title("Corpus Analytics")
+st.markdown(
+    "Site-wide statistics over a batch of evaluation results. Generate the file with "
+    "`python batch_eval.py articles.jsonl --detailed -o results.jsonl`; "
+    "results without `--detailed` only include the score labels."
+)
+
+uploaded = st.file_uploader("Batch results (JSONL)", type=["jsonl", "json"])
+
+if uploaded is not None:
+    data = uploaded.getvalue()
+    fields = row_fields(data)
+    group_field = st.selectbox("Group articles by", ["(none)"] + fields)
+    corpus = load_corpus(data, None if group_field == "(none)" else group_field)
+
+    if len(corpus) == 0:
+        st.warning("The file does not contain any results.")
+        st.stop()
+
+    st.subheader(f"Scores across {len(corpus):,} articles")
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.bar_chart(corpus.score_counts(), color=["#2e7d32", "#ef6c00", "#c62828"])
+    with col2:
+        include_orange = st.checkbox("Count Orange as failing")
+        rates = corpus.failure_rates(include_orange).to_frame()
+        st.dataframe(rates.style.format("{:.1%}"))
+
+    st.subheader("Measured values")
+    st.dataframe(corpus.percentiles().style.format("{:.2f}", na_rep="-"))
+
+    criterion = st.selectbox("Distribution of", CRITERIA, index=CRITERIA.index("Keyphrase Density"))
+    bins = st.slider("Bins", min_value=5, max_value=100, value=20)
+    counts, edges = corpus.histogram(criterion, bins=bins)
+    if counts.sum() == 0:
+        st.info("No measured values for this criterion. Re-run the batch with --detailed.")
+    else:
+        labels = [f"{low:.2f}-{high:.2f}" for low, high in zip(edges[:-1], edges[1:])]
+        st.bar_chart(pd.DataFrame({"articles": counts}, index=labels))
+
+    if corpus.groups is not None:
+        st.subheader(f"By {group_field}")
+        group_criterion = st.selectbox("Criterion", CRITERIA, index=CRITERIA.index("Paragraph Length"))
+        group_score = st.radio("Score", ["Red", "Orange", "Green"], horizontal=True)
+        st.bar_chart(corpus.group_rates(group_criterion, group_score))
+
+# Add a sidebar with information
+with st.sidebar:
+    st.header("About Corpus Analytics")
+    st.markdown("""
+    Upload the JSONL output of `batch_eval.py` to see:
+
+    - How many articles score Green, Orange or Red on each criterion
+    - Failure rates per criterion
+    - Percentiles and histograms of the measured values
+    - Score rates per group, e.g. per site section
+    """)
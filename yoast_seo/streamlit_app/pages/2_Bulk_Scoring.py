@@ -0,0 +1,201 @@
+import streamlit as st
+import sys
+import os
+import json
+import time
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from article_sources import LoadedArticles, read_file, read_folder
+from batch_eval import BatchJob, detailed_json
+from yoastevals import CRITERIA
+
+# Set page config
+st.set_page_config(
+    page_title="Bulk Scoring",
+    page_icon="🗂️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Seconds between progress updates while a batch is scored
+POLL_INTERVAL = 0.5
+# Folder on the server whose subfolders may be scored; without it only
+# uploads are accepted
+FOLDER_ROOT = os.environ.get("BULK_SCORING_ROOT")
+
+
+def article_loader(files, folder, default_keyphrase, loaded):
+    # Runs in the job's background thread and fills ``loaded`` as it reads
+    def load():
+        if folder is None:
+            for name, data in files:
+                read_file(name, data, default_keyphrase, loaded)
+        else:
+            read_folder(folder, default_keyphrase, loaded, root=FOLDER_ROOT)
+        return [(a.content, a.keyphrase) for a in loaded.articles]
+    return load
+
+
+def results_table(articles, results):
+    # One row per article: counts of each score, then every criterion label
+    import pandas as pd
+    rows = []
+    for article, result in zip(articles, results):
+        if result is None:
+            continue
+        labels = [result[criterion].score for criterion in CRITERIA]
+        row = {
+            "Article": article.id,
+            "Keyphrase": article.keyphrase,
+            "Words": int(result["Content Length"].value),
+            "Green": labels.count("Green"),
+            "Orange": labels.count("Orange"),
+            "Red": labels.count("Red"),
+        }
+        row.update(zip(CRITERIA, labels))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def jsonl_report(articles, results):
+    # The batch_eval.py --detailed format, so the report opens in the Corpus page
+    lines = []
+    for index, (article, result) in enumerate(zip(articles, results)):
+        if result is not None:
+            row = {"index": index, "id": article.id, "keyphrase": article.keyphrase, "results": detailed_json(result)}
+            lines.append(json.dumps(row))
+    return "\n".join(lines) + "\n"
+
+
+# Page title
+st.title("Bulk Scoring")
+st.markdown(
+    "Score a whole batch of articles at once: a ZIP of Markdown files, several `.md` files, "
+    "or a CSV/JSONL table with `content` and `keyphrase` columns."
+)
+
+# Add a sidebar with information (before the progress loop, which reruns
+# the page before reaching the end)
+with st.sidebar:
+    st.header("About Bulk Scoring")
+    st.markdown("""
+    Accepted inputs:
+
+    - A ZIP archive of Markdown files, in any folder structure
+    - One or more `.md` files
+    - A folder on the server running this app, if `BULK_SCORING_ROOT` is set
+    - CSV or JSONL tables with `content`, `keyphrase` and optional `id` columns
+
+    Markdown files take their keyphrase from a `keyphrase:` front matter
+    field, or from the default keyphrase.
+
+    Articles are scored in parallel worker processes. The results table
+    can be sorted by any column.
+    """)
+
+job = st.session_state.get("bulk_job")
+running = job is not None and not job.done
+
+col1, col2 = st.columns([3, 2])
+with col1:
+    sources = ["Upload files", "Folder on the server"] if FOLDER_ROOT else ["Upload files"]
+    source = st.radio("Articles from", sources, horizontal=True, disabled=running)
+    uploads = []
+    folder = None
+    if source == "Upload files":
+        uploads = st.file_uploader(
+            "ZIP, Markdown, CSV or JSONL files",
+            type=["zip", "md", "markdown", "txt", "csv", "jsonl"],
+            accept_multiple_files=True,
+            disabled=running,
+        )
+    else:
+        folder = st.text_input(
+            f"Folder under {FOLDER_ROOT} with .md, .csv or .jsonl files (searched recursively)",
+            disabled=running,
+        )
+with col2:
+    default_keyphrase = st.text_input(
+        "Default keyphrase",
+        help="Used for files without a 'keyphrase' front matter field and for rows without a keyphrase",
+        disabled=running,
+    )
+    workers = st.number_input(
+        "Worker processes", min_value=1, max_value=64, value=os.cpu_count() or 1, disabled=running,
+    )
+    score_button = st.button("Score articles", type="primary", disabled=running)
+
+if score_button:
+    loaded = LoadedArticles([], [])
+    files = [(upload.name, upload.getvalue()) for upload in uploads or []]
+    # Read and scored from a background thread (scoring in worker
+    # processes); this script only polls the job, so the page stays
+    # responsive
+    load = article_loader(files, folder, default_keyphrase, loaded)
+    job = BatchJob(load, int(workers)).start()
+    st.session_state.bulk_job = job
+    st.session_state.bulk_loaded = loaded
+    st.session_state.bulk_table = None
+    running = True
+
+if job is not None and job.loading:
+    st.progress(0.0, text="Reading articles...")
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
+
+loaded = st.session_state.get("bulk_loaded")
+if loaded is not None and loaded.skipped:
+    with st.expander(f"{len(loaded.skipped)} files or rows skipped"):
+        st.text("\n".join(loaded.skipped))
+
+if job is not None and job.done and not job.total:
+    if job.error:
+        st.error(f"Reading stopped: {job.error}")
+    else:
+        st.warning("No articles to score.")
+elif job is not None:
+    articles = loaded.articles
+    if not job.done:
+        rate = job.completed / job.seconds if job.seconds else 0.0
+        st.progress(
+            job.completed / job.total,
+            text=f"Scored {job.completed:,} of {job.total:,} articles ({rate:,.0f}/s)",
+        )
+        if st.button("Cancel"):
+            job.cancel()
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
+
+    if job.error:
+        st.error(f"Scoring stopped: {job.error}")
+    st.subheader(f"Results for {job.completed:,} of {job.total:,} articles")
+    processes = "process" if job.workers == 1 else "processes"
+    st.caption(f"Scored in {job.seconds:.1f} s with {job.workers} worker {processes}")
+
+    # Built once per batch rather than on every rerun
+    if st.session_state.get("bulk_table") is None:
+        st.session_state.bulk_table = results_table(articles, job.results)
+        st.session_state.bulk_report = jsonl_report(articles, job.results)
+    table = st.session_state.bulk_table
+    if len(table):
+        # Click a column header to sort
+        st.dataframe(table.sort_values(["Red", "Orange"], ascending=False), hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "Download report (CSV)",
+                data=table.to_csv(index=False),
+                file_name="seo_bulk_report.csv",
+                mime="text/csv",
+            )
+        with col2:
+            st.download_button(
+                "Download detailed report (JSONL)",
+                data=st.session_state.bulk_report,
+                file_name="seo_bulk_report.jsonl",
+                mime="application/json",
+                help="Measured values for every criterion; open it in the Corpus page for site-wide statistics",
+            )
@@ -0,0 +1,178 @@
+import os
+import sys
+from typing import NamedTuple
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from yoastevals import CRITERIA, THRESHOLDS
+
+# Built once at import and identical for every request, so providers that
+# cache prompt prefixes can reuse it across a batch
+SYSTEM_PROMPT = """You are an expert SEO content optimizer. Rewrite the Markdown article you are given so that it scores better on the Yoast SEO criteria below, fixing the failing criteria first. Keep the original meaning, facts, links, images and citations (such as <sup> tags).
+
+Yoast SEO criteria:
+{criteria}
+
+Reply with the complete rewritten article only, ready to be used: no suggestions, no commentary and no code fences.""".format(
+    criteria="\n".join(f"- {criterion}: {THRESHOLDS[criterion]}" for criterion in CRITERIA)
+)
+
+USER_TEMPLATE = """Focus keyphrase: {focus_keyword}
+
+Failing criteria:
+{failing}
+
+Article:
+
+{article}
+
+REWRITTEN CONTENT:"""
+
+DRAFT_SYSTEM_PROMPT = """You are an expert SEO content writer. Write a Markdown article on the topic you are given, using only the facts in the research notes. Start with a "#" title, open with a sentence containing the focus keyphrase, use "##" subheadings at least every 300 words, and link to some of the research sources.
+
+Reply with the article only: no commentary and no code fences."""
+
+DRAFT_TEMPLATE = """Topic: {topic}
+
+Focus keyphrase: {focus_keyword}
+
+Research notes:
+
+{notes}
+
+ARTICLE:"""
+
+
+class PromptSize(NamedTuple):
+    """Token counts of a request's messages."""
+    system: int
+    user: int
+    total: int
+
+
+def failing_summary(yoast_results) -> str:
+    """
+    One line per criterion that is not Green, with the measured value when
+    the results come from evaluate_article_detailed.
+    """
+    lines = []
+    for criterion, result in yoast_results.items():
+        score = getattr(result, "score", result)
+        if score == "Green":
+            continue
+        if hasattr(result, "value") and result.unit != "bool":
+            # Yes/no criteria are fully described by their score
+            lines.append(f"- {criterion}: {score} ({result.value:.3g} {result.unit})")
+        else:
+            lines.append(f"- {criterion}: {score}")
+    return "\n".join(lines) or "- None; keep every criterion Green"
+
+
+def build_messages(user_input, focus_keyword, yoast_results):
+    """
+    Build the chat messages asking the model to rewrite an article.
+
+    Args:
+        user_input (str): The original content provided by the user
+        focus_keyword (str): The focus keyword or keyphrase
+        yoast_results (dict): The evaluation results from Yoast SEO
+
+    Returns:
+        list: The system and user messages for the chat completions API
+    """
+    user_prompt = USER_TEMPLATE.format(
+        focus_keyword=focus_keyword,
+        failing=failing_summary(yoast_results),
+        article=user_input,
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def research_notes(research) -> str:
+    """
+    Render a research API answer as notes for the draft prompt: the answer
+    text followed by its sources.
+    """
+    if not isinstance(research, dict):
+        return str(research)
+    lines = [str(research.get("answer", "")).strip()]
+    sources = research.get("search_results") or []
+    if sources:
+        lines.append("\nSources:")
+        for source in sources:
+            title = source.get("name") or source.get("title") or source.get("url", "")
+            snippet = (source.get("snippet") or "").strip()
+            lines.append(f"- [{title}]({source.get('url', '')}) {snippet}".rstrip())
+    return "\n".join(line for line in lines if line)
+
+
+def build_draft_messages(topic, focus_keyword, research):
+    """
+    Build the chat messages asking the model to draft an article from
+    research results.
+
+    Args:
+        topic (str): What the article is about (the research query)
+        focus_keyword (str): The focus keyword or keyphrase
+        research (dict): The research API answer
+
+    Returns:
+        list: The system and user messages for the chat completions API
+    """
+    user_prompt = DRAFT_TEMPLATE.format(topic=topic, focus_keyword=focus_keyword, notes=research_notes(research))
+    return [
+        {"role": "system", "content": DRAFT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Number of tokens in a text, counted with tiktoken when it is installed
+    and estimated at four characters per token otherwise.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except ImportError:
+            _encoding = False
+    if _encoding is False:
+        return len(text) // 4 + 1
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+_system_tokens = None
+
+
+def prompt_size(messages) -> PromptSize:
+    """
+    Token counts of a request before it is sent; the system prompt is
+    counted once and remembered, since it never changes.
+
+    Args:
+        messages (list): Messages from build_messages
+
+    Returns:
+        PromptSize: Tokens of the system prompt, of the rest and in total
+    """
+    global _system_tokens
+    system = user = 0
+    for message in messages:
+        if message["role"] == "system" and message["content"] == SYSTEM_PROMPT:
+            if _system_tokens is None:
+                _system_tokens = count_tokens(SYSTEM_PROMPT)
+            system += _system_tokens
+        elif message["role"] == "system":
+            system += count_tokens(message["content"])
+        else:
+            user += count_tokens(message["content"])
+    return PromptSize(system, user, system + user)
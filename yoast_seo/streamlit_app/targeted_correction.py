@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+from typing import List, NamedTuple
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'yoastEvalsFinal', 'mainyoastfiles'))
+
+from async_correction import CorrectionResult, run_completions_async
+from problem_spans import ProblemSpan, find_problem_spans, global_failures, splice_spans
+from yoastevals import evaluate_article_detailed
+
+SPAN_SYSTEM_PROMPT = """You are an expert SEO content editor. You will be given ONE passage taken from a longer Markdown article, the article's focus keyphrase, and a list of problems to fix in that passage.
+
+Rewrite ONLY that passage so that the listed problems are fixed. Keep its meaning, facts, numbers, links, images, citations (such as <sup> tags) and Markdown formatting. Do not add an introduction, a conclusion or content that belongs elsewhere in the article.
+
+Reply with the rewritten passage only: no commentary, no quotes and no code fences."""
+
+
+class TargetedCorrection(NamedTuple):
+    """Outcome of a targeted rewrite."""
+    # The article with every successfully rewritten passage spliced in
+    content: str
+    spans: List[ProblemSpan]
+    # One result per span; passages whose rewrite failed are left unchanged
+    results: List[CorrectionResult]
+    # Failing criteria that only a whole-article rewrite can fix
+    untargeted: List[str]
+
+
+def build_span_messages(passage, focus_keyword, instructions):
+    """
+    Build the chat messages asking the model to rewrite one passage.
+
+    Args:
+        passage (str): The text of the passage
+        focus_keyword (str): The focus keyword or keyphrase
+        instructions (list of str): What the rewrite has to achieve
+
+    Returns:
+        list: The system and user messages for the chat completions API
+    """
+    problems = "\n".join(f"- {instruction}" for instruction in instructions)
+    user_prompt = f"""Focus Keyphrase: {focus_keyword}
+
+Problems to fix:
+{problems}
+
+Passage:
+
+{passage}
+
+REWRITTEN PASSAGE:"""
+    return [
+        {"role": "system", "content": SPAN_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+async def generate_targeted_correction_async(article_content, focus_keyword, yoast_results=None, **kwargs):
+    """
+    Rewrite only the passages of an article that fail a criterion.
+
+    The evaluator locates over-long paragraphs and sections, headings and
+    the introduction lacking the keyphrase, long sentences and repeated
+    sentence openings. Those passages are rewritten concurrently and spliced
+    back, so cost and latency follow the size of the problems rather than
+    the size of the article.
+
+    Args:
+        article_content (str): The original article
+        focus_keyword (str): The focus keyword or keyphrase
+        yoast_results (dict): evaluate_article_detailed results for the
+            article, computed here if not given
+        **kwargs: Concurrency, rate limit, retry and client options of
+            run_completions_async
+
+    Returns:
+        TargetedCorrection: The corrected article and what was done
+    """
+    if yoast_results is None:
+        yoast_results = evaluate_article_detailed(article_content, focus_keyword)
+    spans = find_problem_spans(article_content, focus_keyword, yoast_results)
+    requests = [
+        (build_span_messages(article_content[span.start:span.end], focus_keyword, span.instructions), span.end - span.start)
+        for span in spans
+    ]
+    results = await run_completions_async(requests, **kwargs) if requests else []
+    content = splice_spans(article_content, spans, [result.content for result in results])
+    return TargetedCorrection(content, spans, results, global_failures(yoast_results))
+
+
+def generate_targeted_correction(article_content, focus_keyword, yoast_results=None, **kwargs):
+    """Blocking wrapper around generate_targeted_correction_async."""
+    return asyncio.run(generate_targeted_correction_async(article_content, focus_keyword, yoast_results, **kwargs))
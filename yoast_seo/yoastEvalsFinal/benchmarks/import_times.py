@@ -0,0 +1,156 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EVALUATOR_DIR = os.path.normpath(os.path.join(HERE, '..', 'mainyoastfiles'))
+APP_DIR = os.path.normpath(os.path.join(HERE, '..', '..', 'streamlit_app'))
+
+# Modules imported when the apps start, evaluator first
+DEFAULT_MODULES = (
+    "yoastevals",
+    "eval_cache",
+    "prompt_templates",
+    "completion_cache",
+    "gpt_correction",
+    "async_correction",
+    "optimizer",
+)
+DEFAULT_APPS = ("app.py", "app_new.py")
+
+
+class ImportTime(NamedTuple):
+    """Cold import of one module in a fresh interpreter."""
+    module: str
+    # Fastest cumulative import time over the runs
+    seconds: float
+    # (imported module, seconds) of its slowest direct imports
+    heaviest: List[Tuple[str, float]]
+
+
+def _import_tree(module):
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        list: (depth, name, cumulative seconds) per import, in the order
+            Python reports them (children before their parent)
+    """
+    code = f"import sys; sys.path[:0] = {[EVALUATOR_DIR, APP_DIR]!r}; import {module}"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=APP_DIR,
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"import {module} failed: {last_line[0]}")
+    tree = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            # The header line
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        tree.append((depth, name.strip(), int(cumulative) / 1e6))
+    return tree
+
+
+def time_import(module, repeat=5, top=5) -> ImportTime:
+    """
+    Time a cold import of a module, keeping the fastest of ``repeat`` runs.
+
+    Every run starts a new interpreter, so nothing is cached in
+    ``sys.modules``; the modules the interpreter itself loads at startup
+    are not counted.
+    """
+    best = None
+    for _ in range(max(1, repeat)):
+        tree = _import_tree(module)
+        # Children are listed before their parent; anything imported after
+        # the module (such as startup hooks of installed packages) is not
+        # part of it
+        end = max(i for i, (_, name, _) in enumerate(tree) if name == module)
+        root_depth, _, seconds = tree[end]
+        start = end
+        while start > 0 and tree[start - 1][0] > root_depth:
+            start -= 1
+        if best is None or seconds < best[0]:
+            best = (seconds, [(name, s) for depth, name, s in tree[start:end] if depth == root_depth + 1])
+    seconds, children = best
+    heaviest = sorted(children, key=lambda child: -child[1])[:top]
+    return ImportTime(module, seconds, heaviest)
+
+
+_APP_RUNS = """
+import time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({path!r}, default_timeout=60)
+for _ in range({reruns} + 1):
+    started = time.perf_counter()
+    app.run()
+    print(time.perf_counter() - started)
+"""
+
+
+def time_app(path, reruns=5):
+    """
+    Time the first run of a Streamlit script and the reruns after it, in a
+    fresh interpreter with Streamlit's script test harness.
+
+    Returns:
+        tuple: (first run seconds, fastest rerun seconds)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _APP_RUNS.format(path=path, reruns=reruns)],
+        capture_output=True, text=True, cwd=APP_DIR,
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"{os.path.basename(path)} failed: {last_line[0]}")
+    runs = [float(line) for line in completed.stdout.split()]
+    return runs[0], min(runs[1:] or runs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import times of the evaluator and app modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Fresh interpreters per module; the fastest counts")
+    parser.add_argument("--top", type=int, default=3, help="Slowest direct imports to show per module")
+    parser.add_argument("--apps", action="store_true", help="Also time the first run and reruns of the Streamlit apps")
+    parser.add_argument("--max-ms", type=float, help="Exit 1 if any import takes longer than this")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':<20} {'ms':>9}  slowest imports")
+    for module in args.modules:
+        try:
+            result = time_import(module, args.repeat, args.top)
+        except RuntimeError as e:
+            print(f"{module:<20} {'-':>9}  {e}")
+            failed = True
+            continue
+        heaviest = ", ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in result.heaviest)
+        print(f"{module:<20} {result.seconds * 1000:>9.1f}  {heaviest}")
+        if args.max_ms is not None and result.seconds * 1000 > args.max_ms:
+            failed = True
+
+    if args.apps:
+        print()
+        print(f"{'app':<20} {'first ms':>9} {'rerun ms':>9}")
+        for app in DEFAULT_APPS:
+            try:
+                first, rerun = time_app(os.path.join(APP_DIR, app))
+            except RuntimeError as e:
+                # Typically Streamlit not being installed
+                print(f"{app:<20} {'-':>9} {'-':>9}  {e}")
+                continue
+            print(f"{app:<20} {first * 1000:>9.1f} {rerun * 1000:>9.1f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
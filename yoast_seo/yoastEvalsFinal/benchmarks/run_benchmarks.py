@@ -0,0 +1,228 @@
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+import tracemalloc
+from collections import Counter
+from time import perf_counter
+from typing import Dict, NamedTuple
+
+# Add the path to the yoastevals.py file
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'mainyoastfiles'))
+
+from eval_profiler import profile_evaluation
+from synthetic import KEYPHRASE, SCENARIOS, Scenario, generate_article
+from yoastevals import evaluate_article
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# The example article from yoastevals.py, as a real-content fixture
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'sample_corpus.jsonl')
+
+
+class BenchmarkResult(NamedTuple):
+    """Measurements of one fixture."""
+    name: str
+    words: int
+    # Fastest evaluate_article call
+    seconds: float
+    # seconds in units of the calibration workload; compared with the baseline
+    relative: float
+    words_per_second: float
+    peak_memory_bytes: int
+    # Fastest measuring time per criterion, from eval_profiler
+    criteria_seconds: Dict[str, float]
+    results: Dict[str, str]
+
+
+_CALIBRATION_TEXT = generate_article(Scenario(400, seed=99))
+_CALIBRATION_WORD_RE = re.compile(r"\w+")
+
+
+def calibration_run() -> float:
+    """
+    Seconds for one run of a fixed pure-Python workload.
+
+    Fixture timings are divided by it before they are compared with the
+    baseline, so a baseline recorded on one machine remains usable on a
+    faster or slower one. It is run in between the timed evaluations so
+    that both see the same load on the machine.
+    """
+    started = perf_counter()
+    Counter(word.lower() for word in _CALIBRATION_WORD_RE.findall(_CALIBRATION_TEXT))
+    sorted(_CALIBRATION_TEXT.split("\n"))
+    return perf_counter() - started
+
+
+def measure(name, article, keyphrase, repeat=5, min_seconds=0.5) -> BenchmarkResult:
+    """
+    Time evaluate_article on one article.
+
+    The article is evaluated at least ``repeat`` times and for at least
+    ``min_seconds`` with garbage collection paused, alternating with the
+    calibration workload. The fastest call of each is kept, being the one
+    least disturbed by other load on the machine. Peak memory is traced in
+    a separate call so that tracing does not slow the timed ones.
+    """
+    results = evaluate_article(article, keyphrase)
+    runs = []
+    calibration_runs = []
+    total = 0.0
+    # Like timeit, keep garbage collection pauses out of the timings
+    gc.collect()
+    gc.disable()
+    try:
+        while len(runs) < repeat or total < min_seconds:
+            started = perf_counter()
+            evaluate_article(article, keyphrase)
+            elapsed = perf_counter() - started
+            runs.append(elapsed)
+            total += elapsed
+            calibration_runs.append(calibration_run())
+    finally:
+        gc.enable()
+    seconds = min(runs)
+    relative = seconds / min(calibration_runs)
+
+    criteria = None
+    for _ in range(repeat):
+        profile = profile_evaluation(article, keyphrase)[1]
+        if criteria is None:
+            criteria = dict(profile.criteria)
+        else:
+            criteria = {c: min(s, profile.criteria[c]) for c, s in criteria.items()}
+
+    tracemalloc.start()
+    try:
+        evaluate_article(article, keyphrase)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    words = len(article.split())
+    return BenchmarkResult(
+        name, words, seconds, relative, words / seconds if seconds else 0.0, peak, criteria, results
+    )
+
+
+def synthetic_fixtures(names=None):
+    """(name, article, keyphrase) for each synthetic scenario."""
+    for name, scenario in SCENARIOS.items():
+        if names and name not in names:
+            continue
+        yield name, generate_article(scenario), KEYPHRASE
+
+
+def corpus_fixtures(path):
+    """(name, article, keyphrase) for each line of a batch_eval-style JSONL file."""
+    with open(path, encoding="utf-8") as infile:
+        for index, line in enumerate(infile):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            name = f"corpus {record.get('id', index)}"
+            yield name, record["content"], record["keyphrase"]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        list of str: One message per regression; empty if there is none
+    """
+    problems = []
+    for result in results:
+        expected = baseline["fixtures"].get(result.name)
+        if expected is None:
+            continue
+        if expected["results"] != result.results:
+            changed = sorted(c for c in result.results if expected["results"].get(c) != result.results[c])
+            problems.append(f"{result.name}: scores changed for {', '.join(changed)}")
+        slowdown = result.relative / expected["relative"] - 1
+        if slowdown > tolerance:
+            # The baseline time as it would be on this machine
+            scaled = result.seconds / (1 + slowdown)
+            problems.append(
+                f"{result.name}: {result.seconds * 1000:.2f} ms, baseline {scaled * 1000:.2f} ms "
+                f"(+{slowdown:.0%}, tolerance {tolerance:.0%})"
+            )
+    return problems
+
+
+def save_baseline(path, results):
+    baseline = {
+        "python": sys.version.split()[0],
+        "fixtures": {
+            r.name: {"words": r.words, "seconds": r.seconds, "relative": r.relative, "results": r.results}
+            for r in results
+        },
+    }
+    with open(path, "w", encoding="utf-8") as outfile:
+        json.dump(baseline, outfile, indent=2)
+        outfile.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark evaluate_article on synthetic and real articles.")
+    parser.add_argument("-s", "--scenario", action="append", help="Only run this synthetic scenario (repeatable)")
+    parser.add_argument(
+        "--corpus", default=DEFAULT_CORPUS,
+        help="Also benchmark the articles of this JSONL file ('content' and 'keyphrase'); '' for none",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Minimum timed runs per fixture")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--json", help="Also write the full report, with per-criterion times, to this file")
+    args = parser.parse_args(argv)
+
+    fixtures = list(synthetic_fixtures(args.scenario))
+    if args.corpus:
+        fixtures.extend(corpus_fixtures(args.corpus))
+
+    results = []
+    print(f"{'fixture':<24} {'words':>8} {'ms':>10} {'words/s':>12} {'peak KiB':>10}  slowest criterion")
+    for name, article, keyphrase in fixtures:
+        result = measure(name, article, keyphrase, args.repeat)
+        results.append(result)
+        slowest = max(result.criteria_seconds, key=result.criteria_seconds.get)
+        print(
+            f"{name:<24} {result.words:>8} {result.seconds * 1000:>10.2f} {result.words_per_second:>12,.0f} "
+            f"{result.peak_memory_bytes / 1024:>10,.0f}  {slowest}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as outfile:
+            json.dump({"fixtures": [r._asdict() for r in results]}, outfile, indent=2)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    with open(args.baseline, encoding="utf-8") as infile:
+        baseline = json.load(infile)
+    # A slowdown has to show up twice: fixtures that look slower are
+    # measured again, so that a burst of load on the machine does not fail
+    # the run
+    for i, ((name, article, keyphrase), result) in enumerate(zip(fixtures, results)):
+        expected = baseline["fixtures"].get(name)
+        if expected is not None and result.relative / expected["relative"] - 1 > args.tolerance:
+            retry = measure(name, article, keyphrase, args.repeat)
+            if retry.relative < result.relative:
+                results[i] = retry
+    problems = compare(results, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
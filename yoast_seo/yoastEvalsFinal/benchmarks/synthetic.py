@@ -0,0 +1,97 @@
+import random
+from typing import NamedTuple
+
+# Plain vocabulary; none of these is a transition word
+WORDS = (
+    "patients clinics report health data rates study cases doctors treatment "
+    "testing results county public people access risk women men adults young "
+    "older state program local national survey trend increase record levels "
+    "care services prevention awareness infection symptoms screening research "
+    "experts agency hospital community numbers region population medical "
+    "figures growth across recent years months weeks analysis evidence guidance"
+).split()
+
+TRANSITIONS = (
+    "however", "moreover", "therefore", "for example", "in addition",
+    "as a result", "meanwhile", "similarly", "in fact", "finally",
+)
+
+
+class Scenario(NamedTuple):
+    """Shape of a synthetic article; see generate_article."""
+    words: int
+    heading_every: int = 250
+    link_every: int = 400
+    transition_ratio: float = 0.3
+    keyphrase_every: int = 120
+    seed: int = 0
+
+
+KEYPHRASE = "health data"
+
+# Sizes from 300 to 100k words, plus variations in heading and link density
+# and in how many sentences use transition words
+SCENARIOS = {
+    "300 words": Scenario(300),
+    "1k words": Scenario(1_000),
+    "5k words": Scenario(5_000),
+    "20k words": Scenario(20_000),
+    "100k words": Scenario(100_000),
+    "5k dense headings": Scenario(5_000, heading_every=60),
+    "5k no headings": Scenario(5_000, heading_every=0),
+    "5k link heavy": Scenario(5_000, link_every=25),
+    "5k transition heavy": Scenario(5_000, transition_ratio=0.9),
+    "5k transition sparse": Scenario(5_000, transition_ratio=0.0),
+}
+
+
+def generate_article(scenario: Scenario, keyphrase: str = KEYPHRASE) -> str:
+    """
+    Deterministic Markdown article of about ``scenario.words`` words.
+
+    The same scenario always yields the same text, on every Python version
+    and platform, so benchmark runs are comparable.
+
+    Args:
+        scenario (Scenario): Size and shape of the article
+        keyphrase (str): Phrase used every ``keyphrase_every`` words
+
+    Returns:
+        str: The article
+    """
+    rng = random.Random(scenario.seed)
+    parts = [f"# A report on {keyphrase}", "", "![Chart](https://example.com/chart.png)", ""]
+    written = 0
+    since_heading = since_link = since_keyphrase = 0
+    paragraph = []
+    while written < scenario.words:
+        length = rng.randint(6, 24)
+        words = [rng.choice(WORDS) for _ in range(length)]
+        if since_keyphrase >= scenario.keyphrase_every:
+            position = rng.randint(0, length - 1)
+            words[position:position + 1] = keyphrase.split()
+            since_keyphrase = 0
+        sentence = " ".join(words)
+        if rng.random() < scenario.transition_ratio:
+            sentence = f"{rng.choice(TRANSITIONS)}, {sentence}"
+        sentence = sentence[0].upper() + sentence[1:] + "."
+        if scenario.link_every and since_link >= scenario.link_every:
+            if rng.random() < 0.5:
+                sentence += " See [the source](https://example.com/source)."
+            else:
+                sentence += " Read [our guide](/guides/health)."
+            since_link = 0
+        paragraph.append(sentence)
+        written += len(words)
+        since_heading += len(words)
+        since_link += len(words)
+        since_keyphrase += len(words)
+        if len(paragraph) >= rng.randint(3, 6):
+            parts.extend((" ".join(paragraph), ""))
+            paragraph = []
+        if scenario.heading_every and since_heading >= scenario.heading_every and not paragraph:
+            parts.extend((f"## {rng.choice(WORDS).capitalize()} and {rng.choice(WORDS)}", ""))
+            since_heading = 0
+    if paragraph:
+        parts.append(" ".join(paragraph))
+    return "\n".join(parts).rstrip() + "\n"
@@ -0,0 +1,258 @@
+import re
+from bisect import bisect_left
+from typing import List, NamedTuple
+
+# Patterns shared by every check. They are compiled once at import time and
+# reused for every article instead of being rebuilt inside evaluate_article.
+WORD_RE = re.compile(r"\w+")
+SENTENCE_CHUNK_RE = re.compile(r"[^.?!]+")
+PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+NON_SPACE_RE = re.compile(r"\S")
+MARKDOWN_IMAGE_RE = re.compile(r'!\[.*?\]\(.*?\)')
+HTML_IMAGE_RE = re.compile(r'<img\s+[^>]*>')
+EXTERNAL_LINK_RE = re.compile(r'https?://[^\s)]+')
+# Internal links are assumed to be markdown links without http/https
+INTERNAL_LINK_RE = re.compile(r'\[[^\]]*\]\((?!https?://)[^)]+\)')
+
+
+class Sentence(NamedTuple):
+    """A sentence as produced by splitting the article on ``[.?!]+``.
+
+    ``start``/``end`` are character offsets into the article text and
+    ``token_start``/``token_end`` index into ``ArticleDocument.tokens``.
+    """
+    start: int
+    end: int
+    token_start: int
+    token_end: int
+
+
+class Paragraph(NamedTuple):
+    """A blank-line separated paragraph with its own sentence count."""
+    start: int
+    end: int
+    token_start: int
+    token_end: int
+    sentence_count: int
+
+
+class ArticleDocument:
+    """
+    Parsed representation of an article, built in a single pass over the text.
+
+    The document records token spans, sentence and paragraph boundaries,
+    line and heading offsets and link/image spans so that every criterion in
+    evaluate_article can read from it instead of re-splitting the text.
+
+    Args:
+        text (str): The raw article content (Markdown supported)
+    """
+
+    # The module patterns, read through the instance so that a subclass or
+    # a single document can swap them without touching the shared globals
+    word_re = WORD_RE
+    sentence_chunk_re = SENTENCE_CHUNK_RE
+    paragraph_break_re = PARAGRAPH_BREAK_RE
+    non_space_re = NON_SPACE_RE
+    markdown_image_re = MARKDOWN_IMAGE_RE
+    html_image_re = HTML_IMAGE_RE
+    external_link_re = EXTERNAL_LINK_RE
+    internal_link_re = INTERNAL_LINK_RE
+
+    def __init__(self, text: str):
+        self.text = text
+        # Lowercased tokens and their character spans in ``text``
+        self.tokens: List[str] = []
+        self.token_starts: List[int] = []
+        self.token_ends: List[int] = []
+        self.sentences: List[Sentence] = []
+        self.paragraphs: List[Paragraph] = []
+        # Lines of the stripped article as (start, end) offsets
+        self.line_spans: List[tuple] = []
+        # Indices into line_spans of lines that start with '#' once stripped
+        self.heading_line_indices: List[int] = []
+        # Stripped text of lines that start with '#' verbatim
+        self.headings: List[str] = []
+        self.intro_span = (0, 0)
+        # Offsets of the article once leading/trailing whitespace is stripped
+        self.body_start = self.body_end = 0
+
+        self._find_images()
+        self._find_external_links()
+        self._find_internal_links()
+
+        first = self.non_space_re.search(text)
+        if first is None:
+            self.line_spans.append((0, 0))
+            return
+        self.body_start = first.start()
+        self.body_end = rstrip_end(text, self.body_start, len(text))
+
+        self._parse_lines()
+        self._parse_paragraphs()
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    def _find_images(self):
+        text = self.text
+        self.image_spans = [m.span() for m in self.markdown_image_re.finditer(text)]
+        self.image_spans += [m.span() for m in self.html_image_re.finditer(text)]
+
+    def _find_external_links(self):
+        self.external_link_spans = [m.span() for m in self.external_link_re.finditer(self.text)]
+
+    def _find_internal_links(self):
+        self.internal_link_spans = [m.span() for m in self.internal_link_re.finditer(self.text)]
+
+    def _parse_lines(self):
+        text = self.text
+        non_space_re = self.non_space_re
+        start, body_end = self.body_start, self.body_end
+        while True:
+            end = text.find('\n', start, body_end)
+            if end == -1:
+                end = body_end
+            index = len(self.line_spans)
+            self.line_spans.append((start, end))
+            if text.startswith('#', start, end):
+                self.headings.append(text[start:end].strip())
+                self.heading_line_indices.append(index)
+            else:
+                m = non_space_re.search(text, start, end)
+                if m is not None and m.group() == '#':
+                    self.heading_line_indices.append(index)
+            if end == body_end:
+                break
+            start = end + 1
+
+    def _parse_paragraphs(self):
+        text = self.text
+        tokens, starts, ends = self.tokens, self.token_starts, self.token_ends
+        lower = str.lower
+        word_re, non_space_re = self.word_re, self.non_space_re
+
+        # State of the sentence currently being assembled. A sentence that is
+        # not closed by [.?!] at the end of a paragraph runs on into the next
+        # one, exactly like re.split over the whole article would behave.
+        sent_start = sent_end = sent_token_start = 0
+        sent_has_text = False
+        sentence_open = False
+
+        piece_start = self.body_start
+        breaks = [m.span() for m in self.paragraph_break_re.finditer(text, self.body_start, self.body_end)]
+        breaks.append((self.body_end, self.body_end))
+        for piece_end, next_piece_start in breaks:
+            ps_match = non_space_re.search(text, piece_start, piece_end)
+            if ps_match is None:
+                piece_start = next_piece_start
+                continue
+            ps = ps_match.start()
+            pe = rstrip_end(text, ps, piece_end)
+            paragraph_token_start = len(tokens)
+            sentence_count = 0
+            last_chunk_end = -1
+            for chunk in self.sentence_chunk_re.finditer(text, ps, pe):
+                cs, ce = chunk.span()
+                chunk_token_start = len(tokens)
+                for m in word_re.finditer(text, cs, ce):
+                    tokens.append(lower(m.group()))
+                    starts.append(m.start())
+                    ends.append(m.end())
+                has_text = len(tokens) > chunk_token_start or non_space_re.search(text, cs, ce) is not None
+                if has_text:
+                    sentence_count += 1
+                if cs == ps and not self.paragraphs:
+                    self.intro_span = (cs, ce)
+
+                if sentence_open and cs == ps:
+                    sent_end = ce
+                    sent_has_text = sent_has_text or has_text
+                else:
+                    if sentence_open and sent_has_text:
+                        self.sentences.append(Sentence(sent_start, sent_end, sent_token_start, chunk_token_start))
+                    sent_start, sent_end = cs, ce
+                    sent_token_start = chunk_token_start
+                    sent_has_text = has_text
+                    sentence_open = True
+                last_chunk_end = ce
+            if sentence_open and last_chunk_end != pe:
+                # The paragraph ends with a terminator, so the sentence is closed
+                if sent_has_text:
+                    self.sentences.append(Sentence(sent_start, sent_end, sent_token_start, len(tokens)))
+                sentence_open = False
+            self.paragraphs.append(Paragraph(ps, pe, paragraph_token_start, len(tokens), sentence_count))
+            piece_start = next_piece_start
+        if sentence_open and sent_has_text:
+            self.sentences.append(Sentence(sent_start, sent_end, sent_token_start, len(tokens)))
+
+    def count_tokens(self, start: int, end: int) -> int:
+        """Number of tokens starting within the character range [start, end)."""
+        return bisect_left(self.token_starts, end) - bisect_left(self.token_starts, start)
+
+    def has_text(self, start: int, end: int) -> bool:
+        """True if the character range [start, end) contains non-whitespace."""
+        if self.count_tokens(start, end):
+            return True
+        return self.non_space_re.search(self.text, start, end) is not None
+
+    def intro_sentence(self) -> str:
+        """First sentence of the first paragraph, stripped."""
+        return self.text[self.intro_span[0]:self.intro_span[1]].strip()
+
+    def sentence_text(self, sentence: Sentence) -> str:
+        return self.text[sentence.start:sentence.end]
+
+    def section_word_counts(self) -> List[int]:
+        """
+        Word counts of the sections between headings.
+
+        Text before the first heading is not part of any section and empty
+        sections are skipped. An article without headings is a single section.
+        """
+        if not self.heading_line_indices:
+            return [self.word_count]
+        return [self.count_tokens(start, end) for _, start, end in self.section_spans()]
+
+    def section_spans(self) -> List[tuple]:
+        """
+        Sections between headings as (heading line index, start, end).
+
+        Sections are those counted by section_word_counts; an article without
+        headings yields the whole body with a heading line index of None.
+        """
+        if not self.heading_line_indices:
+            return [(None, self.body_start, self.body_end)]
+        spans = []
+        lines = self.line_spans
+        indices = self.heading_line_indices
+        for idx, heading_index in enumerate(indices):
+            first_line = heading_index + 1
+            last_line = indices[idx + 1] if idx + 1 < len(indices) else len(lines)
+            if first_line >= last_line:
+                continue
+            start, end = lines[first_line][0], lines[last_line - 1][1]
+            if self.has_text(start, end):
+                spans.append((heading_index, start, end))
+        return spans
+
+
+def rstrip_end(text: str, start: int, end: int) -> int:
+    """Offset just past the last non-whitespace character in text[start:end]."""
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def parse_article(article_content: str) -> ArticleDocument:
+    """
+    Parse an article once so that all SEO checks can share the result.
+
+    Args:
+        article_content (str): The article text
+
+    Returns:
+        ArticleDocument: The parsed document
+    """
+    return ArticleDocument(article_content)
@@ -0,0 +1,281 @@
+import csv
+import io
+import json
+import os
+import zipfile
+import zlib
+from typing import List, NamedTuple
+
+MARKDOWN_EXTENSIONS = (".md", ".markdown", ".txt")
+TABLE_EXTENSIONS = (".csv", ".jsonl")
+# Front matter fields read as the focus keyphrase, in order of preference
+KEYPHRASE_FIELDS = ("keyphrase", "focus_keyphrase", "focus_keyword", "keyword")
+# Uncompressed size limits, so that a small ZIP cannot expand into
+# gigabytes of memory
+MAX_FILE_BYTES = 50 * 2 ** 20
+MAX_ARCHIVE_BYTES = 200 * 2 ** 20
+
+
+class SourceArticle(NamedTuple):
+    """An article to score and where it came from."""
+    # File name, or file name and row number for tables
+    id: str
+    content: str
+    keyphrase: str
+
+
+class LoadedArticles(NamedTuple):
+    """Articles read from an upload, and what could not be used."""
+    articles: List[SourceArticle]
+    # One "<source>: <reason>" message per skipped file or row
+    skipped: List[str]
+
+
+def split_front_matter(text):
+    """
+    Separate a ``---`` delimited front matter block from a Markdown file.
+
+    Only flat ``key: value`` lines are read, which covers the fields
+    exported by common CMSs; nested YAML is ignored.
+
+    Returns:
+        tuple: (dict of front matter fields, the remaining text)
+    """
+    if not text.startswith("---"):
+        return {}, text
+    lines = text.split("\n")
+    if lines[0].strip() != "---":
+        return {}, text
+    for end in range(1, len(lines)):
+        if lines[end].strip() in ("---", "..."):
+            break
+    else:
+        return {}, text
+    fields = {}
+    for line in lines[1:end]:
+        key, separator, value = line.partition(":")
+        if separator and not line[:1].isspace():
+            fields[key.strip().lower()] = value.strip().strip("'\"")
+    return fields, "\n".join(lines[end + 1:]).lstrip("\n")
+
+
+def _keyphrase(fields, default_keyphrase):
+    for field in KEYPHRASE_FIELDS:
+        if fields.get(field):
+            return fields[field]
+    return default_keyphrase
+
+
+def _decode(data):
+    # utf-8-sig also drops the byte order mark some editors and Excel write
+    return data.decode("utf-8-sig") if isinstance(data, bytes) else data
+
+
+def read_markdown(name, data, default_keyphrase="", loaded=None):
+    """
+    Read one Markdown file; its keyphrase comes from the front matter or
+    ``default_keyphrase``.
+
+    Args:
+        name (str): File name, used as the article id
+        data (bytes or str): File contents
+        default_keyphrase (str): Keyphrase for files without one
+        loaded (LoadedArticles): Collection to add to (a new one if None)
+
+    Returns:
+        LoadedArticles: ``loaded`` with the article or the reason it was skipped
+    """
+    if loaded is None:
+        loaded = LoadedArticles([], [])
+    try:
+        text = _decode(data)
+    except UnicodeDecodeError:
+        loaded.skipped.append(f"{name}: not UTF-8 text")
+        return loaded
+    fields, content = split_front_matter(text)
+    keyphrase = _keyphrase(fields, default_keyphrase).strip()
+    if not content.strip():
+        loaded.skipped.append(f"{name}: empty")
+    elif not keyphrase:
+        loaded.skipped.append(f"{name}: no keyphrase in the front matter and no default keyphrase")
+    else:
+        loaded.articles.append(SourceArticle(name, content, keyphrase))
+    return loaded
+
+
+def read_table(name, data, default_keyphrase="", loaded=None):
+    """
+    Read a CSV (with a header row) or JSONL file of articles.
+
+    Each row needs ``content``; ``keyphrase`` falls back to
+    ``default_keyphrase`` and ``id`` to the file name and row number.
+
+    Args:
+        name (str): File name; its extension selects the format
+        data (bytes or str): File contents
+        default_keyphrase (str): Keyphrase for rows without one
+        loaded (LoadedArticles): Collection to add to (a new one if None)
+
+    Returns:
+        LoadedArticles: ``loaded`` with the rows read and the rows skipped
+    """
+    if loaded is None:
+        loaded = LoadedArticles([], [])
+    try:
+        text = _decode(data)
+    except UnicodeDecodeError:
+        loaded.skipped.append(f"{name}: not UTF-8 text")
+        return loaded
+    if name.lower().endswith(".csv"):
+        # Articles are long; the default field limit of 128 KiB is too small
+        csv.field_size_limit(2 ** 30)
+        rows = enumerate(csv.DictReader(io.StringIO(text, newline="")), start=2)
+    else:
+        rows = ((number, line) for number, line in enumerate(text.splitlines(), start=1) if line.strip())
+    for number, row in rows:
+        source = f"{name}:{number}"
+        if isinstance(row, str):
+            try:
+                row = json.loads(row)
+            except ValueError:
+                loaded.skipped.append(f"{source}: invalid JSON")
+                continue
+            if not isinstance(row, dict):
+                loaded.skipped.append(f"{source}: not a JSON object")
+                continue
+        content = row.get("content")
+        keyphrase = row.get("keyphrase") or default_keyphrase
+        if not isinstance(content, str) or not content.strip():
+            loaded.skipped.append(f"{source}: no content")
+        elif not isinstance(keyphrase, str) or not keyphrase.strip():
+            loaded.skipped.append(f"{source}: no keyphrase and no default keyphrase")
+        else:
+            article_id = row.get("id")
+            article_id = source if article_id in (None, "") else str(article_id)
+            loaded.articles.append(SourceArticle(article_id, content, keyphrase.strip()))
+    return loaded
+
+
+def read_file(name, data, default_keyphrase="", loaded=None):
+    """
+    Read an uploaded file by its extension: a ZIP archive, a CSV or JSONL
+    table, or a Markdown file.
+
+    Returns:
+        LoadedArticles: ``loaded`` (or a new collection) with its articles
+    """
+    if loaded is None:
+        loaded = LoadedArticles([], [])
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".zip":
+        return read_zip(name, data, default_keyphrase, loaded)
+    if extension in TABLE_EXTENSIONS:
+        return read_table(name, data, default_keyphrase, loaded)
+    if extension in MARKDOWN_EXTENSIONS:
+        return read_markdown(name, data, default_keyphrase, loaded)
+    loaded.skipped.append(f"{name}: unsupported file type")
+    return loaded
+
+
+def read_zip(name, data, default_keyphrase="", loaded=None):
+    """
+    Read every Markdown, CSV and JSONL file in a ZIP archive, in any folder.
+
+    Members that cannot be extracted (damaged, encrypted or using an
+    unsupported compression method) or that are larger than MAX_FILE_BYTES
+    are skipped; reading stops once MAX_ARCHIVE_BYTES have been extracted.
+
+    Returns:
+        LoadedArticles: ``loaded`` (or a new collection) with its articles
+    """
+    if loaded is None:
+        loaded = LoadedArticles([], [])
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        loaded.skipped.append(f"{name}: not a ZIP archive")
+        return loaded
+    extracted = 0
+    with archive:
+        for member in sorted(archive.infolist(), key=lambda info: info.filename):
+            path = member.filename
+            parts = path.split("/")
+            # Folders, macOS resource forks and hidden files
+            if member.is_dir() or "__MACOSX" in parts or any(part.startswith(".") for part in parts):
+                continue
+            if os.path.splitext(path)[1].lower() not in MARKDOWN_EXTENSIONS + TABLE_EXTENSIONS:
+                continue
+            # file_size is what the member decompresses to; zipfile stops
+            # reading there, so a member cannot exceed it
+            if member.file_size > MAX_FILE_BYTES:
+                loaded.skipped.append(f"{path}: larger than {MAX_FILE_BYTES // 2 ** 20} MiB")
+                continue
+            extracted += member.file_size
+            if extracted > MAX_ARCHIVE_BYTES:
+                loaded.skipped.append(
+                    f"{name}: stopped at {path}, more than {MAX_ARCHIVE_BYTES // 2 ** 20} MiB uncompressed"
+                )
+                break
+            try:
+                data = archive.read(member)
+            except (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError) as e:
+                loaded.skipped.append(f"{path}: cannot be extracted ({e})")
+                continue
+            read_file(path, data, default_keyphrase, loaded)
+    return loaded
+
+
+def _inside(path, root):
+    return os.path.commonpath([path, root]) == root
+
+
+def read_folder(path, default_keyphrase="", loaded=None, root=None):
+    """
+    Read every Markdown, CSV and JSONL file under a folder on disk.
+
+    Article ids are paths relative to the folder. Symbolic links to folders
+    are not followed and files larger than MAX_FILE_BYTES are skipped.
+
+    Args:
+        path (str): The folder; relative paths are taken from ``root``
+        default_keyphrase (str): Keyphrase for files and rows without one
+        loaded (LoadedArticles): Collection to add to (a new one if None)
+        root (str): If given, nothing outside this folder is read, including
+            files reached through symbolic links
+
+    Returns:
+        LoadedArticles: ``loaded`` with the articles found and the files skipped
+    """
+    if loaded is None:
+        loaded = LoadedArticles([], [])
+    if root is not None:
+        root = os.path.realpath(root)
+        requested, path = path, os.path.realpath(os.path.join(root, path))
+        if not _inside(path, root):
+            loaded.skipped.append(f"{requested}: outside {root}")
+            return loaded
+    if not os.path.isdir(path):
+        loaded.skipped.append(f"{path}: not a folder")
+        return loaded
+    for folder, folders, files in os.walk(path):
+        folders[:] = sorted(name for name in folders if not name.startswith("."))
+        for file_name in sorted(files):
+            extension = os.path.splitext(file_name)[1].lower()
+            if file_name.startswith(".") or extension not in MARKDOWN_EXTENSIONS + TABLE_EXTENSIONS:
+                continue
+            full_path = os.path.join(folder, file_name)
+            relative_path = os.path.relpath(full_path, path)
+            if root is not None and not _inside(os.path.realpath(full_path), root):
+                loaded.skipped.append(f"{relative_path}: links outside {root}")
+                continue
+            try:
+                if os.path.getsize(full_path) > MAX_FILE_BYTES:
+                    loaded.skipped.append(f"{relative_path}: larger than {MAX_FILE_BYTES // 2 ** 20} MiB")
+                    continue
+                with open(full_path, "rb") as infile:
+                    data = infile.read()
+            except OSError as e:
+                loaded.skipped.append(f"{relative_path}: {e.strerror or e}")
+                continue
+            read_file(relative_path, data, default_keyphrase, loaded)
+    return loaded
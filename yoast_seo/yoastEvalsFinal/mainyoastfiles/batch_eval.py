@@ -0,0 +1,281 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from operator import itemgetter
+
+from yoastevals import evaluate_article, evaluate_article_detailed
+
+
+def _evaluate_chunk(chunk, detailed=False):
+    """Worker entry point: score a list of (index, article, keyword) items."""
+    evaluate = evaluate_article_detailed if detailed else evaluate_article
+    return [(index, evaluate(article, keyword)) for index, article, keyword in chunk]
+
+
+def detailed_json(results):
+    """
+    JSON-ready form of evaluate_article_detailed results. Thresholds are
+    the same for every article, so they are left out.
+    """
+    return {
+        criterion: {"score": r.score, "value": r.value, "unit": r.unit, "details": r.details}
+        for criterion, r in results.items()
+    }
+
+
+def _chunks(pairs, chunksize):
+    numbered = ((i, article, keyword) for i, (article, keyword) in enumerate(pairs))
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_many(pairs, workers=None, chunksize=16, ordered=True, cache=None, detailed=False):
+    """
+    Evaluate many (article_content, focus_keyword) pairs across a process pool.
+
+    Pairs are consumed lazily and only a bounded number of chunks is in flight
+    at a time, so the input can be a generator over a very large export.
+
+    Args:
+        pairs (iterable): (article_content, focus_keyword) tuples
+        workers (int): Number of worker processes (defaults to all cores);
+            1 evaluates in the calling process
+        chunksize (int): Number of articles sent to a worker at once
+        ordered (bool): Yield results in input order if True, otherwise as
+            soon as each chunk completes
+        cache (EvaluationCache): Optional cache consulted before sending an
+            article to a worker and filled with the new results
+        detailed (bool): Return evaluate_article_detailed results instead
+            of labels (cannot be combined with a cache)
+
+    Yields:
+        tuple: (index, results) where index is the position of the pair in
+            the input and results is the dict returned by evaluate_article
+    """
+    if detailed and cache is not None:
+        raise ValueError("the evaluation cache only stores labels; use detailed=False with a cache")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(pairs, max(1, chunksize))
+    if workers == 1:
+        for chunk in chunks:
+            hits, misses = _split_cached(chunk, cache)
+            yield from _merge(hits, misses, _evaluate_chunk(misses, detailed), cache)
+        return
+
+    max_in_flight = workers * 2
+    submitted = {}
+
+    def submit(chunk):
+        hits, misses = _split_cached(chunk, cache)
+        if misses:
+            future = executor.submit(_evaluate_chunk, misses, detailed)
+        else:
+            future = Future()
+            future.set_result([])
+        submitted[future] = (hits, misses)
+        return future
+
+    def collect(future):
+        hits, misses = submitted.pop(future)
+        return _merge(hits, misses, future.result(), cache)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(submit(chunk) for chunk in islice(chunks, max_in_flight))
+        if ordered:
+            while pending:
+                results = collect(pending.popleft())
+                for chunk in islice(chunks, 1):
+                    pending.append(submit(chunk))
+                yield from results
+        else:
+            pending = set(pending)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for chunk in islice(chunks, 1):
+                        pending.add(submit(chunk))
+                    yield from collect(future)
+
+
+def _split_cached(chunk, cache):
+    """Separate a chunk into cached (index, results) hits and items to score."""
+    if cache is None:
+        return [], chunk
+    hits, misses = [], []
+    for item in chunk:
+        results = cache.lookup(item[1], item[2])
+        if results is None:
+            misses.append(item)
+        else:
+            hits.append((item[0], results))
+    return hits, misses
+
+
+def _merge(hits, misses, scored, cache):
+    if cache is not None:
+        for (_, article, keyword), (_, results) in zip(misses, scored):
+            cache.store(article, keyword, results)
+    if not hits:
+        return scored
+    return sorted(hits + scored, key=itemgetter(0))
+
+
+class BatchJob:
+    """
+    Runs evaluate_many in a background thread so that a UI can poll its
+    progress instead of waiting for the whole batch.
+
+    Results are detailed and arrive in completion order; ``results[i]`` is
+    None until pair ``i`` is scored. Call ``start`` once, then read
+    ``loading``, ``completed``, ``done`` and ``error`` at any time.
+
+    Args:
+        pairs (list or callable): (article_content, focus_keyword) tuples,
+            or a function returning them; it is called in the background
+            thread, so slow reading does not hold up the caller either
+        workers (int): Number of worker processes (defaults to all cores)
+        chunksize (int): Number of articles sent to a worker at once
+    """
+
+    def __init__(self, pairs, workers=None, chunksize=4):
+        self._load = pairs if callable(pairs) else None
+        self.pairs = [] if callable(pairs) else list(pairs)
+        self.workers = workers
+        self.chunksize = chunksize
+        self.results = [None] * len(self.pairs)
+        self.completed = 0
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def total(self) -> int:
+        return len(self.pairs)
+
+    @property
+    def loading(self) -> bool:
+        """True while the pairs are still being read."""
+        return self._load is not None and not self.done
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    @property
+    def seconds(self) -> float:
+        """Time spent so far, or in total once done."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def start(self):
+        self.started = time.monotonic()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop after the chunks already sent to the workers."""
+        self._cancelled = True
+
+    def _run(self):
+        if self._load is not None:
+            try:
+                pairs = list(self._load())
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self.finished = time.monotonic()
+                return
+            self.results = [None] * len(pairs)
+            self.pairs = pairs
+            self._load = None
+        scored = evaluate_many(self.pairs, self.workers, self.chunksize, ordered=False, detailed=True)
+        try:
+            for index, results in scored:
+                self.results[index] = results
+                self.completed += 1
+                if self._cancelled:
+                    break
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            # Shuts the pool down if the loop ended early
+            scored.close()
+            self.finished = time.monotonic()
+
+
+def _read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a JSONL file of articles against the Yoast SEO criteria."
+    )
+    parser.add_argument(
+        "input",
+        help="JSONL file with 'content' and 'keyphrase' fields per line ('-' for stdin); "
+             "other fields such as 'id' are copied to the output",
+    )
+    parser.add_argument("-o", "--output", default="-", help="Where to write JSONL results ('-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=16, help="Articles per worker task")
+    parser.add_argument("--unordered", action="store_true", help="Write results as they complete")
+    parser.add_argument("--cache", default=None, help="SQLite file caching results of unchanged articles between runs")
+    parser.add_argument("--detailed", action="store_true", help="Write measured values and thresholds with each score")
+    args = parser.parse_args(argv)
+    if args.detailed and args.cache:
+        parser.error("--detailed cannot be combined with --cache")
+
+    cache = None
+    if args.cache:
+        # Imported here so that worker processes do not open the database
+        from eval_cache import EvaluationCache
+        cache = EvaluationCache(path=args.cache)
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        extras = []
+
+        def pairs():
+            for record in _read_jsonl(infile):
+                content = record.pop("content")
+                keyphrase = record.pop("keyphrase")
+                extras.append(record)
+                yield content, keyphrase
+
+        scored = evaluate_many(pairs(), args.workers, args.chunksize, not args.unordered, cache, args.detailed)
+        for index, results in scored:
+            row = {"index": index}
+            row.update(extras[index])
+            extras[index] = None
+            if args.detailed:
+                results = detailed_json(results)
+            row["results"] = results
+            outfile.write(json.dumps(row) + "\n")
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+        if cache is not None:
+            print(f"cache: {cache.stats()}", file=sys.stderr)
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
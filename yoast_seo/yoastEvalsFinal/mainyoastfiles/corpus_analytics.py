@@ -0,0 +1,168 @@
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from yoastevals import CRITERIA
+
+# Labels are stored as small integer codes, in order of severity
+SCORES = ("Green", "Orange", "Red")
+SCORE_CODES = {score: code for code, score in enumerate(SCORES)}
+# Code for a criterion missing from a result
+MISSING = -1
+
+
+class CorpusResults:
+    """
+    Evaluation results of many articles in columnar form.
+
+    Row ``i`` holds article ``i``; column ``j`` holds criterion ``CRITERIA[j]``.
+    Every statistic below is computed on whole arrays, so aggregating a
+    corpus costs a few NumPy passes regardless of its size.
+
+    Args:
+        scores (np.ndarray): (articles, criteria) int8 score codes
+        values (np.ndarray): (articles, criteria) measured values, NaN where
+            only the label is known
+        groups (np.ndarray): Optional group (e.g. site section) of each article
+    """
+
+    def __init__(self, scores, values, groups=None):
+        self.scores = scores
+        self.values = values
+        self.groups = groups
+
+    @classmethod
+    def from_results(cls, results, groups=None):
+        """
+        Load results as returned by evaluate_article or evaluate_article_detailed.
+
+        Args:
+            results (iterable of dict): One results dict per article. Values
+                may be labels, CriterionResult tuples or their JSON form
+            groups (iterable): Optional group of each article, in the same order
+
+        Returns:
+            CorpusResults: The results as arrays
+        """
+        codes = []
+        values = []
+        for result in results:
+            for criterion in CRITERIA:
+                outcome = result.get(criterion)
+                if outcome is None:
+                    codes.append(MISSING)
+                    values.append(np.nan)
+                elif isinstance(outcome, str):
+                    codes.append(SCORE_CODES[outcome])
+                    values.append(np.nan)
+                elif isinstance(outcome, dict):
+                    codes.append(SCORE_CODES[outcome["score"]])
+                    values.append(outcome["value"])
+                else:
+                    codes.append(SCORE_CODES[outcome.score])
+                    values.append(outcome.value)
+        shape = (len(codes) // len(CRITERIA), len(CRITERIA))
+        return cls(
+            np.array(codes, dtype=np.int8).reshape(shape),
+            np.array(values, dtype=np.float64).reshape(shape),
+            None if groups is None else np.asarray(list(groups), dtype=object),
+        )
+
+    @classmethod
+    def from_jsonl(cls, stream, group_field=None):
+        """
+        Load the output of ``batch_eval.py`` (preferably run with --detailed).
+
+        Args:
+            stream: Iterable of JSONL lines, e.g. an open file
+            group_field (str): Optional row field to group articles by
+
+        Returns:
+            CorpusResults: The results as arrays
+        """
+        results = []
+        groups = [] if group_field else None
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            results.append(row["results"])
+            if groups is not None:
+                groups.append(row.get(group_field))
+        return cls.from_results(results, groups)
+
+    def __len__(self):
+        return self.scores.shape[0]
+
+    def _column(self, criterion):
+        return CRITERIA.index(criterion)
+
+    def score_counts(self) -> pd.DataFrame:
+        """Number of articles with each score, per criterion."""
+        counts = (self.scores[:, :, None] == np.arange(len(SCORES), dtype=np.int8)).sum(axis=0)
+        return pd.DataFrame(counts, index=list(CRITERIA), columns=list(SCORES))
+
+    def failure_rates(self, include_orange=False) -> pd.Series:
+        """
+        Share of articles failing each criterion.
+
+        Args:
+            include_orange (bool): Count Orange as a failure as well as Red
+
+        Returns:
+            pd.Series: Failure rate (0-1) per criterion
+        """
+        threshold = SCORE_CODES["Orange"] if include_orange else SCORE_CODES["Red"]
+        known = (self.scores != MISSING).sum(axis=0)
+        failed = (self.scores >= threshold).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = failed / known
+        return pd.Series(rates, index=list(CRITERIA), name="failure_rate")
+
+    def percentiles(self, q=(5, 25, 50, 75, 95)) -> pd.DataFrame:
+        """Percentiles of the measured value of each criterion (NaNs ignored)."""
+        with warnings.catch_warnings():
+            # "All-NaN slice encountered" for criteria never measured
+            warnings.simplefilter("ignore", RuntimeWarning)
+            table = np.nanpercentile(self.values, q, axis=0) if len(self) else np.full((len(q), len(CRITERIA)), np.nan)
+        return pd.DataFrame(table.T, index=list(CRITERIA), columns=[f"p{p}" for p in q])
+
+    def histogram(self, criterion, bins=20, value_range=None):
+        """
+        Histogram of the measured value of one criterion.
+
+        Args:
+            criterion (str): Criterion name, e.g. "Keyphrase Density"
+            bins (int or sequence): Passed to np.histogram
+            value_range (tuple): Optional (min, max) of the bins
+
+        Returns:
+            tuple: (counts, bin_edges) as returned by np.histogram
+        """
+        column = self.values[:, self._column(criterion)]
+        return np.histogram(column[~np.isnan(column)], bins=bins, range=value_range)
+
+    def group_rates(self, criterion, score="Red") -> pd.Series:
+        """
+        Share of articles in each group that received ``score`` on a criterion.
+
+        Args:
+            criterion (str): Criterion name, e.g. "Paragraph Length"
+            score (str): "Green", "Orange" or "Red"
+
+        Returns:
+            pd.Series: Rate (0-1) per group
+        """
+        if self.groups is None:
+            raise ValueError("results were loaded without groups")
+        codes, names = pd.factorize(self.groups, use_na_sentinel=False)
+        column = self.scores[:, self._column(criterion)]
+        known = column != MISSING
+        totals = np.bincount(codes, weights=known, minlength=len(names))
+        hits = np.bincount(codes, weights=column == SCORE_CODES[score], minlength=len(names))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = hits / totals
+        return pd.Series(rates, index=names, name=f"{score} rate")
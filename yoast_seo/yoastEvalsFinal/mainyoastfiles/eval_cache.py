@@ -0,0 +1,206 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from yoastevals import RULESET_VERSION, evaluate_article
+
+
+def cache_key(article_content: str, focus_keyword: str, ruleset_version: str = RULESET_VERSION,
+              evaluator: str = "yoastevals.evaluate_article") -> str:
+    """Content hash identifying one evaluation of an article by one evaluator."""
+    digest = hashlib.sha256()
+    for part in (ruleset_version, evaluator, focus_keyword, article_content):
+        encoded = part.encode("utf-8", "surrogatepass")
+        # Length-prefix each part so that ("ab", "c") and ("a", "bc") differ
+        digest.update(str(len(encoded)).encode("ascii") + b":" + encoded)
+    return digest.hexdigest()
+
+
+def evaluator_name(evaluate) -> str:
+    """Identifier of an evaluator function for cache keys, e.g. "yoastevals.evaluate_article"."""
+    return f"{evaluate.__module__}.{evaluate.__qualname__}"
+
+
+def _is_labels(results) -> bool:
+    return isinstance(results, dict) and all(
+        isinstance(criterion, str) and isinstance(label, str) for criterion, label in results.items()
+    )
+
+
+class EvaluationCache:
+    """
+    Cache of evaluation results keyed on a hash of the article text, the
+    focus keyword, the ruleset version and the evaluator.
+
+    Results are kept in a bounded in-memory LRU. If ``path`` is given, they
+    are also written to an SQLite database that survives restarts and is
+    trimmed to ``max_disk_entries`` rows, evicting the least recently used.
+    The database stores JSON, so only criterion -> label dicts (as returned
+    by evaluate_article) can go there; storing anything else, such as
+    evaluate_article_detailed results, raises TypeError.
+
+    Args:
+        maxsize (int): Maximum number of results kept in memory
+        path (str): Optional SQLite file for the on-disk tier
+        max_disk_entries (int): Maximum number of rows kept on disk
+        evaluate (callable): Evaluator called on a miss
+        evaluator (str): Identifier of ``evaluate`` in the cache keys;
+            defaults to its module and qualified name. Give one for lambdas
+            and other functions whose name does not identify them.
+    """
+
+    def __init__(self, maxsize=1024, path=None, max_disk_entries=100_000, evaluate=evaluate_article, evaluator=None):
+        self.maxsize = maxsize
+        self.max_disk_entries = max_disk_entries
+        self.evaluate = evaluate
+        self.evaluator = evaluator or evaluator_name(evaluate)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_size = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            self._db.commit()
+            row = self._db.execute("SELECT MAX(last_used), COUNT(*) FROM results").fetchone()
+            self._clock = row[0] or 0
+            self._disk_size = row[1]
+
+    def get(self, article_content: str, focus_keyword: str):
+        """
+        Return the evaluation results for an article, computing them on a miss.
+
+        Args:
+            article_content (str): The article text
+            focus_keyword (str): The focus keyword or keyphrase
+
+        Returns:
+            dict: A copy of the results of ``evaluate``
+        """
+        return self.get_with_status(article_content, focus_keyword)[0]
+
+    def get_with_status(self, article_content: str, focus_keyword: str):
+        """
+        Like get, also telling whether the results came from the cache.
+
+        Returns:
+            tuple: (dict of results, True if they were cached)
+        """
+        results = self.lookup(article_content, focus_keyword)
+        if results is not None:
+            return results, True
+        # Evaluate outside the lock so concurrent sessions are not serialised
+        results = self.evaluate(article_content, focus_keyword)
+        self.store(article_content, focus_keyword, results)
+        return dict(results), False
+
+    def lookup(self, article_content: str, focus_keyword: str):
+        """Return a copy of the cached results, or None on a miss."""
+        key = cache_key(article_content, focus_keyword, evaluator=self.evaluator)
+        with self._lock:
+            results = self._memory.get(key)
+            if results is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(results)
+            results = self._disk_get(key)
+            if results is not None:
+                self.disk_hits += 1
+                self._remember(key, results)
+                return dict(results)
+            self.misses += 1
+            return None
+
+    def store(self, article_content: str, focus_keyword: str, results):
+        """Add results computed elsewhere (e.g. in a worker process)."""
+        if self._db is not None and not _is_labels(results):
+            raise TypeError(
+                "the on-disk evaluation cache only stores criterion -> label dicts; "
+                "use a cache without a path for other results"
+            )
+        key = cache_key(article_content, focus_keyword, evaluator=self.evaluator)
+        with self._lock:
+            self._remember(key, results)
+            self._disk_put(key, results)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current sizes of both tiers."""
+        with self._lock:
+            disk_size = self._disk_size if self._db is not None else None
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_size": len(self._memory),
+                "disk_size": disk_size,
+            }
+
+    def clear(self):
+        """Drop every cached result from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+                self._disk_size = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key, results):
+        self._memory[key] = results
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._clock += 1
+        self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (self._clock, key))
+        self._db.commit()
+        return json.loads(row[0])
+
+    def _disk_put(self, key, results):
+        if self._db is None:
+            return
+        self._clock += 1
+        exists = self._db.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+            (key, json.dumps(results), self._clock),
+        )
+        if not exists:
+            self._disk_size += 1
+        excess = self._disk_size - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._disk_size -= excess
+        self._db.commit()
+
+
+# Process-wide cache shared by the Streamlit apps across reruns and sessions
+default_cache = EvaluationCache()
+
+
+def cached_evaluate_article(article_content: str, focus_keyword: str):
+    """evaluate_article backed by the process-wide cache."""
+    return default_cache.get(article_content, focus_keyword)
@@ -0,0 +1,189 @@
+import argparse
+import re
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, NamedTuple
+
+from article_document import ArticleDocument
+from yoastevals import CRITERIA, collect_stats, score_document
+
+
+class EvaluationProfile(NamedTuple):
+    """
+    Where the time of one evaluation went.
+
+    ``stages`` holds the shared parsing and scoring steps; ``criteria`` the
+    time spent measuring what only that criterion needs (criteria measured
+    during parsing, such as Content Length, show near zero). ``counts`` has
+    sizes such as sentences and tokens, and ``regex_calls`` when requested.
+    """
+    total_seconds: float
+    stages: Dict[str, float]
+    criteria: Dict[str, float]
+    counts: Dict[str, int]
+
+
+class _ProfiledDocument(ArticleDocument):
+    """ArticleDocument that times each parsing step into ``timings``."""
+
+    def __init__(self, text, timings, criteria):
+        self._timings = timings
+        self._criteria = criteria
+        super().__init__(text)
+
+    def _find_images(self):
+        started = perf_counter()
+        super()._find_images()
+        self._criteria["Images"] += perf_counter() - started
+
+    def _find_external_links(self):
+        started = perf_counter()
+        super()._find_external_links()
+        self._criteria["Outbound Links"] += perf_counter() - started
+
+    def _find_internal_links(self):
+        started = perf_counter()
+        super()._find_internal_links()
+        self._criteria["Internal Links"] += perf_counter() - started
+
+    def _parse_lines(self):
+        started = perf_counter()
+        super()._parse_lines()
+        self._timings["parse lines and headings"] = perf_counter() - started
+
+    def _parse_paragraphs(self):
+        started = perf_counter()
+        super()._parse_paragraphs()
+        self._timings["split paragraphs, sentences and tokens"] = perf_counter() - started
+
+
+def profile_evaluation(article_content: str, focus_keyword: str, count_regex_calls: bool = False):
+    """
+    Evaluate an article like evaluate_article_detailed, timing every step.
+
+    The article goes through the same score_document call as
+    evaluate_article_detailed, with a timer around each measurement.
+    Without a timer, score_document takes a path with no timing code, so
+    evaluations pay nothing while profiling is off.
+
+    Args:
+        article_content (str): The article text
+        focus_keyword (str): The focus keyword or keyphrase
+        count_regex_calls (bool): Also count regex calls. This parses the
+            article a second time with counting patterns, so the timings
+            are not affected.
+
+    Returns:
+        tuple: (dict of CriterionResult, EvaluationProfile)
+    """
+    stages = {}
+    criteria = dict.fromkeys(CRITERIA, 0.0)
+
+    @contextmanager
+    def timer(name):
+        timings = criteria if name in criteria else stages
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = timings.get(name, 0.0) + perf_counter() - started
+
+    started = perf_counter()
+    doc = _ProfiledDocument(article_content, stages, criteria)
+    results, keyphrase_index = score_document(doc, focus_keyword, timer)
+    total = perf_counter() - started
+
+    counts = {
+        "characters": len(article_content),
+        "lines": len(doc.line_spans),
+        "headings": len(doc.heading_line_indices),
+        "paragraphs": len(doc.paragraphs),
+        "sentences": len(doc.sentences),
+        "tokens": len(doc.tokens),
+        "keyphrase_occurrences": keyphrase_index.count,
+    }
+    if count_regex_calls:
+        counts["regex_calls"] = count_regex_calls_for(article_content)
+    return results, EvaluationProfile(total, stages, criteria, counts)
+
+
+class _CountingPattern:
+    """Stand-in for a compiled pattern that counts calls to it."""
+
+    def __init__(self, pattern, counter):
+        self._pattern = pattern
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._pattern, name)
+        if not callable(attr):
+            return attr
+        counter = self._counter
+
+        def counted(*args, **kwargs):
+            counter[0] += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class _CountingDocument(ArticleDocument):
+    """ArticleDocument whose own patterns count every call into ``counter``."""
+
+    def __init__(self, text, counter):
+        for name, value in vars(ArticleDocument).items():
+            if isinstance(value, re.Pattern):
+                setattr(self, name, _CountingPattern(value, counter))
+        super().__init__(text)
+
+
+def count_regex_calls_for(article_content: str) -> int:
+    """
+    Number of calls to the evaluator's compiled regexes while parsing and
+    measuring the article.
+
+    Only a private document is instrumented, so concurrent evaluations are
+    not affected. Transition and keyphrase matching work on tokens and make
+    no regex calls.
+    """
+    counter = [0]
+    collect_stats(_CountingDocument(article_content, counter))
+    return counter[0]
+
+
+def format_profile(profile: EvaluationProfile) -> str:
+    """Render a profile as a plain-text table, slowest entries first."""
+    total = profile.total_seconds or 1e-12
+    lines = [f"total {profile.total_seconds * 1000:.3f} ms"]
+    for title, timings in (("stage", profile.stages), ("criterion", profile.criteria)):
+        lines.append("")
+        lines.append(f"{title:<40} {'ms':>9} {'share':>7}")
+        for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+            lines.append(f"{name:<40} {seconds * 1000:9.3f} {seconds / total:7.1%}")
+    lines.append("")
+    lines.extend(f"{name:<40} {value:>9}" for name, value in profile.counts.items())
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show where the time of evaluating an article goes.")
+    parser.add_argument("file", help="Article file ('-' for stdin)")
+    parser.add_argument("keyphrase", help="Focus keyphrase")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Runs; the fastest time of each entry is shown")
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    with infile:
+        content = infile.read()
+    profiles = [profile_evaluation(content, args.keyphrase)[1] for _ in range(max(1, args.repeat))]
+    best = EvaluationProfile(
+        min(p.total_seconds for p in profiles),
+        {name: min(p.stages[name] for p in profiles) for name in profiles[0].stages},
+        {name: min(p.criteria[name] for p in profiles) for name in profiles[0].criteria},
+        {**profiles[0].counts, "regex_calls": count_regex_calls_for(content)},
+    )
+    print(format_profile(best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+import re
+from collections import OrderedDict
+
+from article_document import (
+    HTML_IMAGE_RE,
+    INTERNAL_LINK_RE,
+    NON_SPACE_RE,
+    PARAGRAPH_BREAK_RE,
+    ArticleDocument,
+)
+from keyphrase_index import KeyphraseIndex, find_keyphrase
+from transition_words import TRANSITION_MATCHER
+from yoastevals import ArticleStats, result_labels, score_article_detailed
+
+TERMINATORS = ".?!"
+# The start of an INTERNAL_LINK_RE or HTML_IMAGE_RE match that reaches the
+# end of a paragraph and could be completed by the paragraphs after it.
+# Only whitespace separates paragraphs, and both patterns accept whitespace
+# anywhere these prefixes can continue.
+OPEN_INTERNAL_LINK_RE = re.compile(r'\[[^\]]*(?:\]\((?!https?://)[^)]*)?\Z')
+OPEN_HTML_IMAGE_RE = re.compile(r'<img(?:\s[^>]*)?\Z')
+
+
+class ParagraphStats:
+    """
+    Partial statistics of one paragraph, enough to re-aggregate the 13 scores
+    without looking at the paragraph text again.
+
+    Args:
+        unit (str): The paragraph as it appears in the article, including the
+            indentation of its first line
+    """
+
+    __slots__ = (
+        "tokens", "word_count", "sentence_count", "sentences", "starts_open", "ends_open",
+        "intro_sentence", "headings", "has_heading", "head_words", "head_has_text",
+        "inner_sections", "tail_words", "tail_has_text", "external_link_count",
+        "internal_link_count", "image_count", "html_image_count", "internal_link_open",
+        "html_image_open", "_keyphrase", "_keyphrase_offsets",
+    )
+
+    def __init__(self, unit: str):
+        stripped = unit.lstrip()
+        doc = ArticleDocument(stripped)
+        self.tokens = doc.tokens
+        self.word_count = doc.word_count
+        self.sentence_count = doc.paragraphs[0].sentence_count if doc.paragraphs else 0
+        # (word count, first word, has transition) of every sentence
+        flags = TRANSITION_MATCHER.sentence_flags(doc)
+        self.sentences = [
+            (s.token_end - s.token_start, doc.tokens[s.token_start] if s.token_end > s.token_start else "", flag)
+            for s, flag in zip(doc.sentences, flags)
+        ]
+        # A paragraph that does not start/end with [.?!] shares its first/last
+        # sentence with the previous/next paragraph
+        self.starts_open = bool(stripped) and stripped[0] not in TERMINATORS
+        self.ends_open = bool(stripped) and stripped[-1] not in TERMINATORS
+        self.intro_sentence = doc.intro_sentence()
+
+        self.headings = doc.headings
+        if len(stripped) != len(unit) and stripped.startswith('#'):
+            # The first line is indented in the article, so it does not start
+            # with '#' verbatim (it still counts as a section heading)
+            self.headings = self.headings[1:]
+
+        self.external_link_count = len(doc.external_link_spans)
+        self.internal_link_count = len(doc.internal_link_spans)
+        self.image_count = len(doc.image_spans)
+        # Whether a link or <img> tag may continue across the paragraph
+        # break; matches only ever end before an open one
+        links = doc.internal_link_spans
+        self.internal_link_open = OPEN_INTERNAL_LINK_RE.search(stripped, links[-1][1] if links else 0) is not None
+        html_images = [m.end() for m in HTML_IMAGE_RE.finditer(stripped)] if "<img" in stripped else []
+        self.html_image_count = len(html_images)
+        self.html_image_open = OPEN_HTML_IMAGE_RE.search(stripped, html_images[-1] if html_images else 0) is not None
+
+        # Split the paragraph's words around its section headings: words
+        # before the first heading continue the previous section, words after
+        # the last heading start a section continued by later paragraphs
+        lines = doc.line_spans
+        heading_lines = doc.heading_line_indices
+        self.has_heading = bool(heading_lines)
+        self.inner_sections = []
+        if not heading_lines:
+            self.head_words, self.head_has_text = self.word_count, True
+            self.tail_words, self.tail_has_text = 0, False
+        else:
+            self.head_words, self.head_has_text = _line_range(doc, 0, heading_lines[0])
+            for first, last in zip(heading_lines, heading_lines[1:]):
+                words, has_text = _line_range(doc, first + 1, last)
+                if has_text:
+                    self.inner_sections.append(words)
+            self.tail_words, self.tail_has_text = _line_range(doc, heading_lines[-1] + 1, len(lines))
+
+        self._keyphrase = None
+        self._keyphrase_offsets = []
+
+    def keyphrase_offsets(self, keyphrase_words):
+        """Offsets of keyphrase occurrences lying entirely in this paragraph."""
+        if self._keyphrase != keyphrase_words:
+            self._keyphrase = keyphrase_words
+            self._keyphrase_offsets = find_keyphrase(self.tokens, keyphrase_words).offsets
+        return self._keyphrase_offsets
+
+
+def _count_across_paragraphs(pattern, open_pattern, units, counts, open_flags):
+    """
+    Number of matches of ``pattern`` in the article made of ``units``.
+
+    Paragraphs without an open match contribute their own count. From an
+    open one on, the paragraphs are joined and scanned together until no
+    match can run on past the joined text.
+    """
+    total = 0
+    i = 0
+    while i < len(units):
+        if not open_flags[i]:
+            total += counts[i]
+            i += 1
+            continue
+        window = units[i].lstrip()
+        j = i + 1
+        step = 1
+        open_from = 0
+        while j < len(units):
+            m = open_pattern.search(window, open_from)
+            if m is None:
+                break
+            # Matches before the open one are final; joining twice as many
+            # paragraphs each time keeps the rescans linear overall
+            open_from = m.start()
+            window = "\n\n".join([window] + [unit.lstrip() for unit in units[j:j + step]])
+            j += step
+            step *= 2
+        total += sum(1 for _ in pattern.finditer(window))
+        i = j
+    return total
+
+
+def _line_range(doc, first_line, end_line):
+    """(word count, has text) of the lines first_line..end_line-1 of doc."""
+    if first_line >= end_line:
+        return 0, False
+    start, end = doc.line_spans[first_line][0], doc.line_spans[end_line - 1][1]
+    return doc.count_tokens(start, end), doc.has_text(start, end)
+
+
+class StatsAggregator:
+    """
+    Combine ParagraphStats, in article order, into ArticleStats.
+
+    Only running totals are kept (plus one small entry per paragraph, section
+    and heading), so paragraphs can be discarded once added.
+    """
+
+    def __init__(self):
+        self.word_count = 0
+        self.external_link_count = 0
+        self.internal_link_count = 0
+        self.image_count = 0
+        self.sentence_count = 0
+        self.transition_sentence_count = 0
+        self.long_sentence_count = 0
+        self.paragraph_shapes = []
+        self.headings = []
+        self.intro_sentence = None
+        # The last sentence seen; it is only counted once we know it does not
+        # run on into the next paragraph
+        self._pending = None
+        # Running state for consecutive sentences starting with the same word
+        self._prev_first = None
+        self._run = 1
+        self._max_consecutive = 1
+        self._pairs = 0
+        # Sections between headings
+        self._sections = []
+        self._in_section = False
+        self._section_words = 0
+        self._section_has_text = False
+
+    def add(self, p: ParagraphStats):
+        self.word_count += p.word_count
+        self.external_link_count += p.external_link_count
+        self.internal_link_count += p.internal_link_count
+        self.image_count += p.image_count
+        self.paragraph_shapes.append((p.word_count, p.sentence_count))
+        self.headings.extend(p.headings)
+        if self.intro_sentence is None:
+            self.intro_sentence = p.intro_sentence
+
+        sentences = p.sentences
+        if self._pending is not None and p.starts_open and sentences:
+            # The sentence runs on across the paragraph break
+            words, first, transition = self._pending
+            next_words, next_first, next_transition = sentences[0]
+            self._pending = (words + next_words, first or next_first, transition or next_transition)
+            sentences = sentences[1:]
+        for sentence in sentences:
+            if self._pending is not None:
+                self._count_sentence(*self._pending)
+            self._pending = sentence
+        if not p.ends_open and self._pending is not None:
+            self._count_sentence(*self._pending)
+            self._pending = None
+
+        if not p.has_heading:
+            if self._in_section:
+                self._section_words += p.head_words
+                self._section_has_text = self._section_has_text or p.head_has_text
+            return
+        if self._in_section:
+            self._section_words += p.head_words
+            if self._section_has_text or p.head_has_text:
+                self._sections.append(self._section_words)
+        self._sections.extend(p.inner_sections)
+        self._section_words, self._section_has_text = p.tail_words, p.tail_has_text
+        self._in_section = True
+
+    def _count_sentence(self, words, first, transition):
+        self.sentence_count += 1
+        if transition:
+            self.transition_sentence_count += 1
+        if words > 20:
+            self.long_sentence_count += 1
+        if first == self._prev_first and first != "":
+            self._run += 1
+            self._pairs += 1
+            self._max_consecutive = max(self._max_consecutive, self._run)
+        else:
+            self._run = 1
+        self._prev_first = first
+
+    def finish(self) -> ArticleStats:
+        if self._pending is not None:
+            self._count_sentence(*self._pending)
+            self._pending = None
+        sections = list(self._sections)
+        if self._in_section:
+            if self._section_has_text:
+                sections.append(self._section_words)
+        else:
+            sections = [self.word_count]
+        return ArticleStats(
+            word_count=self.word_count,
+            external_link_count=self.external_link_count,
+            internal_link_count=self.internal_link_count,
+            image_count=self.image_count,
+            sentence_count=self.sentence_count,
+            transition_sentence_count=self.transition_sentence_count,
+            long_sentence_count=self.long_sentence_count,
+            max_consecutive=self._max_consecutive,
+            consecutive_pairs=self._pairs,
+            section_word_counts=sections,
+            paragraph_shapes=self.paragraph_shapes,
+            headings=self.headings,
+            intro_sentence=self.intro_sentence or "",
+        )
+
+
+def split_paragraphs(article_content: str):
+    """
+    Split an article into paragraph units the way evaluate_article does.
+
+    Each unit keeps the indentation of its first line, which decides whether
+    a heading there starts with '#' verbatim.
+
+    Returns:
+        list of str: The non-empty paragraph units in order
+    """
+    first = NON_SPACE_RE.search(article_content)
+    if first is None:
+        return []
+    body_end = len(article_content.rstrip())
+    units = []
+    start = first.start()
+    for m in PARAGRAPH_BREAK_RE.finditer(article_content, first.start(), body_end):
+        unit = article_content[start:m.start()].rstrip()
+        if unit.strip():
+            units.append(unit)
+        start = m.end()
+    unit = article_content[start:body_end].rstrip()
+    if unit.strip():
+        units.append(unit)
+    return units
+
+
+class IncrementalEvaluator:
+    """
+    Evaluator for articles that are edited and re-scored repeatedly.
+
+    Per-paragraph statistics are cached by paragraph text. On each call only
+    paragraphs that are new or have changed are parsed; the 13 scores are
+    then re-aggregated from the cached statistics. Results are identical to
+    evaluate_article.
+
+    Args:
+        max_paragraphs (int): Maximum number of paragraph statistics kept
+    """
+
+    def __init__(self, max_paragraphs=10_000):
+        self.max_paragraphs = max_paragraphs
+        self._paragraphs = OrderedDict()
+        # Number of paragraphs parsed / reused by the last evaluation
+        self.last_parsed = 0
+        self.last_reused = 0
+
+    def evaluate(self, article_content: str, focus_keyword: str):
+        """
+        Evaluate an article, re-parsing only the paragraphs that changed.
+
+        Args:
+            article_content (str): The article text
+            focus_keyword (str): The focus keyword or keyphrase
+
+        Returns:
+            dict: Maps each criterion to "Green", "Orange" or "Red"
+        """
+        return result_labels(self.evaluate_detailed(article_content, focus_keyword))
+
+    def evaluate_detailed(self, article_content: str, focus_keyword: str):
+        """Like evaluate, but maps each criterion to a CriterionResult."""
+        units = split_paragraphs(article_content)
+        paragraphs = self._update(units)
+        stats = self._aggregate(paragraphs, units)
+        keyphrase_words = focus_keyword.lower().strip().split()
+        keyphrase_index = self._keyphrase_index(paragraphs, keyphrase_words, stats.word_count)
+        return score_article_detailed(stats, focus_keyword, keyphrase_index)
+
+    def _update(self, units):
+        cache = self._paragraphs
+        paragraphs = []
+        self.last_parsed = self.last_reused = 0
+        for unit in units:
+            stats = cache.get(unit)
+            if stats is None:
+                stats = cache[unit] = ParagraphStats(unit)
+                self.last_parsed += 1
+            else:
+                cache.move_to_end(unit)
+                self.last_reused += 1
+            paragraphs.append(stats)
+        while len(cache) > max(self.max_paragraphs, len(units)):
+            cache.popitem(last=False)
+        return paragraphs
+
+    def _aggregate(self, paragraphs, units) -> ArticleStats:
+        aggregator = StatsAggregator()
+        for p in paragraphs:
+            aggregator.add(p)
+        stats = aggregator.finish()
+        # Markdown links and <img> tags may span a blank line; only the
+        # paragraphs where one is left open are scanned again
+        internal_link_count = _count_across_paragraphs(
+            INTERNAL_LINK_RE, OPEN_INTERNAL_LINK_RE, units,
+            [p.internal_link_count for p in paragraphs], [p.internal_link_open for p in paragraphs],
+        )
+        html_image_count = _count_across_paragraphs(
+            HTML_IMAGE_RE, OPEN_HTML_IMAGE_RE, units,
+            [p.html_image_count for p in paragraphs], [p.html_image_open for p in paragraphs],
+        )
+        return stats._replace(
+            internal_link_count=internal_link_count,
+            image_count=stats.image_count - sum(p.html_image_count for p in paragraphs) + html_image_count,
+        )
+
+    def _keyphrase_index(self, paragraphs, keyphrase_words, word_count) -> KeyphraseIndex:
+        k = len(keyphrase_words)
+        if k == 0:
+            return KeyphraseIndex(0, list(range(word_count + 1)), word_count)
+        offsets = []
+        base = 0
+        for i, p in enumerate(paragraphs):
+            offsets.extend(base + offset for offset in p.keyphrase_offsets(keyphrase_words))
+            if k > 1:
+                # Occurrences that start near the end of this paragraph and
+                # continue into the following ones
+                tail = p.tokens[-(k - 1):]
+                window = list(tail)
+                j = i + 1
+                while j < len(paragraphs) and len(window) < len(tail) + k - 1:
+                    window.extend(paragraphs[j].tokens[:k - 1])
+                    j += 1
+                tail_base = base + p.word_count - len(tail)
+                for s in range(len(tail)):
+                    if window[s:s + k] == keyphrase_words:
+                        offsets.append(tail_base + s)
+            base += p.word_count
+        return KeyphraseIndex(k, offsets, word_count)
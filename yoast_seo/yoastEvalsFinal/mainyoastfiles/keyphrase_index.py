@@ -0,0 +1,216 @@
+from collections import deque
+from typing import List, Sequence
+
+
+class KeyphraseIndex:
+    """
+    Token offsets of every occurrence of a keyphrase in an article.
+
+    Occurrences may overlap, matching the sliding-window comparison the
+    density and distribution checks have always used.
+
+    Args:
+        length (int): Number of words in the keyphrase
+        offsets (list of int): Token index at which each occurrence starts
+        token_count (int): Number of tokens in the article
+    """
+
+    def __init__(self, length: int, offsets: List[int], token_count: int):
+        self.length = length
+        self.offsets = offsets
+        self.token_count = token_count
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+
+    def segment_counts(self, segment_size: int = 150) -> List[int]:
+        """
+        Occurrences per consecutive block of ``segment_size`` tokens.
+
+        An occurrence is only counted in a segment if it lies entirely inside
+        it, so matches straddling two segments are not counted at all.
+        """
+        n = self.token_count
+        segments = (n + segment_size - 1) // segment_size
+        if self.length == 0:
+            # An empty keyphrase matches at every position of every segment
+            return [min(segment_size, n - s * segment_size) + 1 for s in range(segments)]
+        counts = [0] * segments
+        for offset in self.offsets:
+            seg = offset // segment_size
+            if offset + self.length <= min((seg + 1) * segment_size, n):
+                counts[seg] += 1
+        return counts
+
+
+def _failure_table(keyphrase_words):
+    """KMP table: length of the longest proper prefix that is also a suffix."""
+    failure = [0] * len(keyphrase_words)
+    j = 0
+    for i in range(1, len(keyphrase_words)):
+        while j and keyphrase_words[i] != keyphrase_words[j]:
+            j = failure[j - 1]
+        if keyphrase_words[i] == keyphrase_words[j]:
+            j += 1
+        failure[i] = j
+    return failure
+
+
+def find_keyphrase(tokens: Sequence[str], keyphrase_words: Sequence[str]) -> KeyphraseIndex:
+    """
+    Find all occurrences of a keyphrase with a single KMP scan over the tokens.
+
+    Args:
+        tokens (list of str): Lowercased article tokens
+        keyphrase_words (list of str): Lowercased keyphrase words
+
+    Returns:
+        KeyphraseIndex: Offsets of every (possibly overlapping) occurrence
+    """
+    n, k = len(tokens), len(keyphrase_words)
+    if k == 0:
+        return KeyphraseIndex(0, list(range(n + 1)), n)
+
+    failure = _failure_table(keyphrase_words)
+    offsets = []
+    first = keyphrase_words[0]
+    j = 0
+    for i, token in enumerate(tokens):
+        if j == 0 and token != first:
+            continue
+        while j and token != keyphrase_words[j]:
+            j = failure[j - 1]
+        if token == keyphrase_words[j]:
+            j += 1
+            if j == k:
+                offsets.append(i - k + 1)
+                j = failure[j - 1]
+    return KeyphraseIndex(k, offsets, n)
+
+
+def find_keyphrases(tokens: Sequence[str], keyphrases: Sequence[Sequence[str]]) -> List[KeyphraseIndex]:
+    """
+    Find all occurrences of several keyphrases with one scan over the tokens.
+
+    Builds a token-level Aho-Corasick automaton over the keyphrases so that
+    the article is walked once regardless of how many keyphrases are given.
+
+    Args:
+        tokens (list of str): Lowercased article tokens
+        keyphrases (list of list of str): Lowercased words of each keyphrase
+
+    Returns:
+        list of KeyphraseIndex: One index per keyphrase, in the same order
+    """
+    n = len(tokens)
+    offsets = [[] for _ in keyphrases]
+
+    # goto[state] maps a token to the next state; out[state] lists the
+    # keyphrases (by position) that end in that state
+    goto = [{}]
+    out = [[]]
+    for pattern_id, words in enumerate(keyphrases):
+        if not words:
+            offsets[pattern_id] = list(range(n + 1))
+            continue
+        state = 0
+        for word in words:
+            next_state = goto[state].get(word)
+            if next_state is None:
+                next_state = goto[state][word] = len(goto)
+                goto.append({})
+                out.append([])
+            state = next_state
+        out[state].append(pattern_id)
+
+    # Breadth-first construction of failure links
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for word, next_state in goto[state].items():
+            queue.append(next_state)
+            f = fail[state]
+            while f and word not in goto[f]:
+                f = fail[f]
+            fail[next_state] = goto[f].get(word, 0)
+            out[next_state] = out[next_state] + out[fail[next_state]]
+
+    state = 0
+    for i, token in enumerate(tokens):
+        while state and token not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(token, 0)
+        for pattern_id in out[state]:
+            offsets[pattern_id].append(i - len(keyphrases[pattern_id]) + 1)
+
+    return [KeyphraseIndex(len(words), found, n) for words, found in zip(keyphrases, offsets)]
+
+
+class StreamingKeyphraseCounter:
+    """
+    KMP matcher fed one batch of tokens at a time.
+
+    Keeps only the match state, the occurrence count and the per-segment
+    counts, so it can follow an article of any length. It offers the same
+    ``count`` and ``segment_counts`` as KeyphraseIndex.
+
+    Args:
+        keyphrase_words (list of str): Lowercased keyphrase words
+        segment_size (int): Size of the segments counted for distribution
+    """
+
+    def __init__(self, keyphrase_words: Sequence[str], segment_size: int = 150):
+        self.keyphrase_words = list(keyphrase_words)
+        self.length = len(self.keyphrase_words)
+        self.segment_size = segment_size
+        self.token_count = 0
+        self._failure = _failure_table(self.keyphrase_words)
+        self._state = 0
+        self._count = 0
+        self._segment_counts = []
+
+    @property
+    def count(self) -> int:
+        if self.length == 0:
+            return self.token_count + 1
+        return self._count
+
+    def feed(self, tokens: Sequence[str]):
+        words, k = self.keyphrase_words, self.length
+        if k == 0:
+            self.token_count += len(tokens)
+            return
+        failure, size = self._failure, self.segment_size
+        first = words[0]
+        j = self._state
+        i = self.token_count
+        for token in tokens:
+            if j or token == first:
+                while j and token != words[j]:
+                    j = failure[j - 1]
+                if token == words[j]:
+                    j += 1
+                    if j == k:
+                        j = failure[j - 1]
+                        self._record(i - k + 1, size)
+            i += 1
+        self._state = j
+        self.token_count = i
+
+    def _record(self, offset, size):
+        self._count += 1
+        seg = offset // size
+        if offset + self.length <= (seg + 1) * size:
+            while len(self._segment_counts) <= seg:
+                self._segment_counts.append(0)
+            self._segment_counts[seg] += 1
+
+    def segment_counts(self, segment_size: int = 150) -> List[int]:
+        if segment_size != self.segment_size:
+            raise ValueError(f"counts were collected for segments of {self.segment_size} words")
+        if self.length == 0:
+            return KeyphraseIndex(0, [], self.token_count).segment_counts(segment_size)
+        segments = (self.token_count + segment_size - 1) // segment_size
+        return self._segment_counts + [0] * (segments - len(self._segment_counts))
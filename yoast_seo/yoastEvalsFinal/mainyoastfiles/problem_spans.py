@@ -0,0 +1,323 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+from article_document import NON_SPACE_RE, parse_article, rstrip_end
+from keyphrase_index import find_keyphrase
+from yoastevals import collect_stats, score_article_detailed
+
+TERMINATORS = ".?!"
+# Paragraphs starting with one of these are headings, lists, tables, quotes,
+# images or HTML rather than prose and are not asked to grow to 3 sentences
+NON_PROSE_PREFIXES = ("#", "*", "-", "+", "|", ">", "!", "<", "`")
+
+# Criteria measured over the whole article: no single passage is to blame,
+# so they can only be fixed by a whole-article rewrite
+GLOBAL_CRITERIA = (
+    "Content Length",
+    "Outbound Links",
+    "Internal Links",
+    "Images",
+    "Keyphrase Density",
+    "Keyphrase Distribution",
+    "Transition Words",
+)
+
+
+class ProblemSpan(NamedTuple):
+    """
+    A passage of the article (``text[start:end]``) that on its own causes one
+    or more criteria to fail, with what a rewrite of it has to achieve.
+    """
+    start: int
+    end: int
+    criteria: Tuple[str, ...]
+    instructions: Tuple[str, ...]
+
+
+def find_problem_spans(article_content: str, focus_keyword: str, results=None) -> List[ProblemSpan]:
+    """
+    Locate the passages responsible for failing passage-level criteria.
+
+    Overlapping passages are merged, so the spans are disjoint and sorted.
+    Criteria in GLOBAL_CRITERIA are never attributed to a passage; see
+    global_failures.
+
+    Args:
+        article_content (str): The article text
+        focus_keyword (str): The focus keyword or keyphrase
+        results (dict): evaluate_article_detailed or evaluate_article
+            results for the article, computed here if not given
+
+    Returns:
+        list of ProblemSpan: The passages to rewrite, in article order
+    """
+    doc = parse_article(article_content)
+    focus_keyword_lower = focus_keyword.lower().strip()
+    if results is None:
+        stats = collect_stats(doc)
+        results = score_article_detailed(stats, focus_keyword, find_keyphrase(doc.tokens, focus_keyword_lower.split()))
+
+    def failing(criterion):
+        return _label(results[criterion]) != "Green"
+
+    spans = []
+    if failing("Keyphrase in Introduction"):
+        spans.extend(_intro_spans(doc, focus_keyword))
+    if failing("Keyphrase in Subheadings"):
+        spans.extend(_heading_spans(doc, focus_keyword, focus_keyword_lower))
+    if failing("Subheading Distribution"):
+        spans.extend(_section_spans(doc))
+    if failing("Paragraph Length"):
+        spans.extend(_paragraph_spans(doc))
+    if failing("Sentence Length"):
+        spans.extend(_long_sentence_spans(doc))
+    if failing("Consecutive Sentences"):
+        spans.extend(_repeated_start_spans(doc, _label(results["Consecutive Sentences"]) == "Red"))
+    return merge_spans(spans)
+
+
+def global_failures(results) -> List[str]:
+    """
+    Failing criteria that a passage-level rewrite cannot address.
+
+    Args:
+        results (dict): evaluate_article_detailed or evaluate_article results
+    """
+    return [criterion for criterion in GLOBAL_CRITERIA if _label(results[criterion]) != "Green"]
+
+
+def _label(result):
+    # A CriterionResult, or the bare label evaluate_article returns
+    return getattr(result, "score", result)
+
+
+def distribution_spans(article_content: str, focus_keyword: str, segment_size: int = 150) -> List[ProblemSpan]:
+    """
+    Prose paragraphs that should each gain one use of the keyphrase for the
+    keyphrase distribution to turn Green (6+ occurrences, present in at
+    least half of the segments).
+
+    Paragraphs are taken from segments without the keyphrase, spread over
+    the article. No more are proposed than keep the density within 2.5%.
+
+    Args:
+        article_content (str): The article text
+        focus_keyword (str): The focus keyword or keyphrase
+        segment_size (int): Words per distribution segment
+
+    Returns:
+        list of ProblemSpan: The paragraphs to rewrite, in article order
+    """
+    doc = parse_article(article_content)
+    keyphrase_words = focus_keyword.lower().strip().split()
+    if not keyphrase_words or not doc.tokens:
+        return []
+    index = find_keyphrase(doc.tokens, keyphrase_words)
+    segment_counts = index.segment_counts(segment_size)
+    covered = sum(1 for c in segment_counts if c > 0)
+    needed = max((len(segment_counts) + 1) // 2 - covered, 6 - sum(segment_counts))
+    # Each addition raises the density; stay inside the Green range
+    needed = min(needed, int(doc.word_count * 0.025) - index.count)
+    if needed <= 0:
+        return []
+
+    prose = [
+        p for p in doc.paragraphs
+        if p.token_end > p.token_start
+        and not doc.text.startswith(NON_PROSE_PREFIXES, p.start)
+        and not _is_link_list(doc, p.start, p.end)
+    ]
+    chosen = []
+    for segment, count in enumerate(segment_counts):
+        if count:
+            continue
+        lo, hi = segment * segment_size, (segment + 1) * segment_size
+        # The prose paragraph with the most words in this segment
+        best, best_overlap = None, 0
+        for p in prose:
+            overlap = min(hi, p.token_end) - max(lo, p.token_start)
+            if overlap > best_overlap:
+                best, best_overlap = p, overlap
+        if best is not None and best not in chosen:
+            chosen.append(best)
+    if len(chosen) > needed:
+        # Keep an evenly spread selection
+        step = len(chosen) / needed
+        chosen = [chosen[int(i * step)] for i in range(needed)]
+    instruction = f'Work the exact keyphrase "{focus_keyword}" naturally into this paragraph once.'
+    return [ProblemSpan(p.start, p.end, ("Keyphrase Distribution",), (instruction,)) for p in chosen]
+
+
+def merge_spans(spans) -> List[ProblemSpan]:
+    """Sort spans and merge those that overlap, combining their instructions."""
+    merged = []
+    for span in sorted(spans):
+        if merged and span.start < merged[-1].end:
+            last = merged[-1]
+            merged[-1] = ProblemSpan(
+                last.start,
+                max(last.end, span.end),
+                tuple(dict.fromkeys(last.criteria + span.criteria)),
+                tuple(dict.fromkeys(last.instructions + span.instructions)),
+            )
+        else:
+            merged.append(span)
+    return merged
+
+
+def splice_spans(article_content: str, spans, replacements) -> str:
+    """
+    Replace each span of the article with its rewrite.
+
+    Args:
+        article_content (str): The article text the spans were found in
+        spans (list of ProblemSpan): Disjoint spans in article order
+        replacements (list of str): New text per span; None keeps the original
+
+    Returns:
+        str: The article with the rewritten passages
+    """
+    pieces = []
+    position = 0
+    for span, replacement in zip(spans, replacements):
+        pieces.append(article_content[position:span.start])
+        pieces.append(article_content[span.start:span.end] if replacement is None else replacement.strip())
+        position = span.end
+    pieces.append(article_content[position:])
+    return "".join(pieces)
+
+
+def _span(text, start, end, criterion, instruction) -> Optional[ProblemSpan]:
+    """Span of text[start:end] without surrounding whitespace, or None if blank."""
+    m = NON_SPACE_RE.search(text, start, end)
+    if m is None:
+        return None
+    return ProblemSpan(m.start(), rstrip_end(text, m.start(), end), (criterion,), (instruction,))
+
+
+def _is_link_list(doc, start, end):
+    """True if URLs make up most of text[start:end], e.g. a reference list."""
+    link_chars = sum(min(e, end) - max(s, start) for s, e in doc.external_link_spans if s < end and e > start)
+    return link_chars * 2 > end - start
+
+
+def _with_terminators(text, end):
+    """Extend a sentence end over the [.?!] run that closes it."""
+    while end < len(text) and text[end] in TERMINATORS:
+        end += 1
+    return end
+
+
+def _intro_spans(doc, focus_keyword):
+    start, end = doc.intro_span
+    if start == end:
+        return []
+    # Only the first line: the first "sentence" may run on into an image or
+    # a link, which must not be rewritten
+    line_end = doc.text.find('\n', start, end)
+    if line_end != -1:
+        end = line_end
+    span = _span(
+        doc.text, start, end, "Keyphrase in Introduction",
+        f'Include the exact keyphrase "{focus_keyword}" in this opening sentence.',
+    )
+    return [span] if span else []
+
+
+def _heading_spans(doc, focus_keyword, focus_keyword_lower):
+    text = doc.text
+    heading_lines = [
+        doc.line_spans[i] for i in doc.heading_line_indices
+        if text.startswith('#', *doc.line_spans[i])
+    ]
+    have = sum(1 for start, end in heading_lines if focus_keyword_lower in text[start:end].lower())
+    # Enough headings to reach the 50% needed for Green
+    needed = (len(heading_lines) + 1) // 2 - have
+    spans = []
+    for start, end in heading_lines:
+        if needed <= 0:
+            break
+        if focus_keyword_lower in text[start:end].lower():
+            continue
+        span = _span(
+            text, start, end, "Keyphrase in Subheadings",
+            f'Include the exact keyphrase "{focus_keyword}" in this heading, keeping its "#" level.',
+        )
+        if span:
+            spans.append(span)
+            needed -= 1
+    return spans
+
+
+def _section_spans(doc):
+    text = doc.text
+    spans = []
+    for heading_index, start, end in doc.section_spans():
+        if doc.count_tokens(start, end) <= 300 or _is_link_list(doc, start, end):
+            continue
+        level = 1
+        if heading_index is not None:
+            line_start, line_end = doc.line_spans[heading_index]
+            heading = text[line_start:line_end].strip()
+            level = min(6, len(heading) - len(heading.lstrip('#')) + 1)
+        span = _span(
+            text, start, end, "Subheading Distribution",
+            f'Add "{"#" * level}" subheadings so that no part of this section is longer than 300 words.',
+        )
+        if span:
+            spans.append(span)
+    return spans
+
+
+def _paragraph_spans(doc):
+    text = doc.text
+    spans = []
+    for p in doc.paragraphs:
+        words = p.token_end - p.token_start
+        if _is_link_list(doc, p.start, p.end):
+            continue
+        if words >= 150:
+            instruction = "Split this into paragraphs of fewer than 150 words with at least three sentences each."
+        elif p.sentence_count < 3 and not text.startswith(NON_PROSE_PREFIXES, p.start):
+            instruction = "Expand this paragraph to at least three sentences, staying under 150 words."
+        else:
+            continue
+        spans.append(ProblemSpan(p.start, p.end, ("Paragraph Length",), (instruction,)))
+    return spans
+
+
+def _long_sentence_spans(doc):
+    text = doc.text
+    spans = []
+    for s in doc.sentences:
+        if s.token_end - s.token_start <= 20:
+            continue
+        span = _span(
+            text, s.start, _with_terminators(text, s.end), "Sentence Length",
+            "Break this into sentences of at most 20 words each.",
+        )
+        if span:
+            spans.append(span)
+    return spans
+
+
+def _repeated_start_spans(doc, runs_only):
+    """Runs of sentences starting with the same word (3+ if runs_only, else 2+)."""
+    tokens = doc.tokens
+    sentences = doc.sentences
+    first_words = [tokens[s.token_start] if s.token_end > s.token_start else "" for s in sentences]
+    min_run = 3 if runs_only else 2
+    spans = []
+    run_start = 0
+    for i in range(1, len(sentences) + 1):
+        if i < len(sentences) and first_words[i] == first_words[i - 1] and first_words[i] != "":
+            continue
+        if i - run_start >= min_run:
+            span = _span(
+                doc.text, sentences[run_start].start, _with_terminators(doc.text, sentences[i - 1].end),
+                "Consecutive Sentences",
+                "Vary the opening word of these sentences so that no two in a row start the same way.",
+            )
+            if span:
+                spans.append(span)
+        run_start = i
+    return spans
@@ -0,0 +1,344 @@
+import argparse
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from batch_eval import detailed_json
+from eval_cache import EvaluationCache
+from yoastevals import RULESET_VERSION, evaluate_article, evaluate_article_detailed
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _score_json(items, detailed):
+    """
+    Worker entry point: score (content, keyphrase) items and return each
+    result already encoded as JSON, so the server only concatenates text.
+    """
+    encoded = []
+    for content, keyphrase in items:
+        if detailed:
+            encoded.append(json.dumps(detailed_json(evaluate_article_detailed(content, keyphrase))))
+        else:
+            encoded.append(json.dumps(evaluate_article(content, keyphrase)))
+    return encoded
+
+
+def _warm_up(_):
+    # Runs once in every worker so that the first real request does not pay
+    # for starting the process and importing the evaluator
+    evaluate_article("Warm up. The pool.", "pool")
+
+
+class ServiceMetrics:
+    """Request counters and latency histograms in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = {}
+        self.latency = {}
+        self.articles = 0
+        self.in_flight = 0
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, endpoint, status, seconds, articles=0):
+        with self._lock:
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            buckets = self.latency.get(endpoint)
+            if buckets is None:
+                # One count per bucket, then +Inf, then the sum of latencies
+                buckets = self.latency[endpoint] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            buckets[-1] += seconds
+            self.articles += articles
+
+    def render(self, cache=None) -> str:
+        with self._lock:
+            lines = [
+                "# TYPE yoast_requests_total counter",
+                *(
+                    f'yoast_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                    for (endpoint, status), count in sorted(self.requests.items())
+                ),
+                "# TYPE yoast_request_seconds histogram",
+            ]
+            for endpoint, buckets in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+                    cumulative += count
+                    lines.append(f'yoast_request_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                lines.append(f'yoast_request_seconds_sum{{endpoint="{endpoint}"}} {buckets[-1]}')
+                lines.append(f'yoast_request_seconds_count{{endpoint="{endpoint}"}} {cumulative}')
+            lines += [
+                "# TYPE yoast_articles_scored_total counter",
+                f"yoast_articles_scored_total {self.articles}",
+                "# TYPE yoast_requests_in_flight gauge",
+                f"yoast_requests_in_flight {self.in_flight}",
+                "# TYPE yoast_uptime_seconds gauge",
+                f"yoast_uptime_seconds {time.time() - self.started:.0f}",
+            ]
+        if cache is not None:
+            stats = cache.stats()
+            lines += [
+                "# TYPE yoast_cache_hits_total counter",
+                f"yoast_cache_hits_total {stats['hits']}",
+                "# TYPE yoast_cache_misses_total counter",
+                f"yoast_cache_misses_total {stats['misses']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class RequestError(Exception):
+    """A client error answered with ``status`` and a JSON error message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """
+    Scores articles for the HTTP handler in a pre-started process pool.
+
+    Batches are split into tasks of at most ``chunksize`` articles that
+    run on all workers at once. Label results of unchanged articles are served from an
+    in-memory EvaluationCache without reaching the pool.
+
+    Args:
+        workers (int): Worker processes (defaults to all cores)
+        chunksize (int): Articles per pool task in a batch
+        cache_size (int): Label results kept in memory; 0 disables caching
+        max_batch (int): Largest number of articles in one batch request
+    """
+
+    def __init__(self, workers=None, chunksize=8, cache_size=1024, max_batch=1000):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.max_batch = max_batch
+        self.cache = EvaluationCache(maxsize=cache_size) if cache_size else None
+        self.metrics = ServiceMetrics()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Start every worker now rather than on the first requests
+        list(self.pool.map(_warm_up, range(self.workers)))
+
+    def score(self, items, detailed=False):
+        """
+        Score (content, keyphrase) items.
+
+        Returns:
+            list of str: The JSON-encoded results, one per item
+        """
+        encoded = [None] * len(items)
+        todo = []
+        for index, (content, keyphrase) in enumerate(items):
+            cached = None
+            if self.cache is not None and not detailed:
+                cached = self.cache.lookup(content, keyphrase)
+            if cached is not None:
+                encoded[index] = json.dumps(cached)
+            else:
+                todo.append(index)
+        if todo:
+            # Spread a batch over every worker, in tasks of at most chunksize
+            size = min(self.chunksize, -(-len(todo) // self.workers))
+            chunks = [todo[i:i + size] for i in range(0, len(todo), size)]
+            futures = [
+                self.pool.submit(_score_json, [items[i] for i in chunk], detailed)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                for index, result in zip(chunk, future.result()):
+                    encoded[index] = result
+                    if self.cache is not None and not detailed:
+                        self.cache.store(*items[index], json.loads(result))
+        return encoded
+
+    def close(self):
+        self.pool.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _article(record):
+    if not isinstance(record, dict):
+        raise RequestError(400, "each article must be an object")
+    content, keyphrase = record.get("content"), record.get("keyphrase")
+    if not isinstance(content, str) or not isinstance(keyphrase, str):
+        raise RequestError(400, "'content' and 'keyphrase' must be strings")
+    return content, keyphrase
+
+
+def _parse_json(body):
+    try:
+        request = json.loads(body)
+    except ValueError:
+        raise RequestError(400, "invalid JSON")
+    if not isinstance(request, dict):
+        raise RequestError(400, "the request must be a JSON object")
+    return request
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints:
+
+    - POST /evaluate: {"content", "keyphrase", "detailed"?} -> {"results"}
+    - POST /evaluate/batch: {"articles": [{"content", "keyphrase", "id"?}],
+      "detailed"?} -> {"results": [{"id"?, "results"}]}
+    - GET /health: {"status": "ok", "workers", "ruleset_version"}
+    - GET /metrics: Prometheus text format
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "YoastScoring/1.0"
+    # Headers and body go out in separate writes; with Nagle's algorithm the
+    # body would wait for the client's delayed ACK (about 40 ms)
+    disable_nagle_algorithm = True
+    # Set by make_server
+    service = None
+    max_body = 10 * 1024 * 1024
+
+    def do_GET(self):
+        started = time.perf_counter()
+        if self.path == "/health":
+            endpoint, status = self.path, 200
+            self._send(status, json.dumps({
+                "status": "ok",
+                "workers": self.service.workers,
+                "ruleset_version": RULESET_VERSION,
+            }))
+        elif self.path == "/metrics":
+            endpoint, status = self.path, 200
+            self._send(status, self.service.metrics.render(self.service.cache), "text/plain; version=0.0.4")
+        else:
+            endpoint, status = "other", 404
+            self._send(status, json.dumps({"error": "not found"}))
+        self.service.metrics.observe(endpoint, status, time.perf_counter() - started)
+
+    def do_POST(self):
+        started = time.perf_counter()
+        endpoint = self.path if self.path in ("/evaluate", "/evaluate/batch") else "other"
+        metrics = self.service.metrics
+        metrics.request_started()
+        articles = 0
+        try:
+            # Read the body even for unknown paths, so that the connection
+            # can carry on with the next request
+            body = self._read_body()
+            if endpoint == "other":
+                raise RequestError(404, "not found")
+            request = _parse_json(body)
+            detailed = bool(request.get("detailed", False))
+            if endpoint == "/evaluate":
+                (result,) = self.service.score([_article(request)], detailed)
+                articles = 1
+                body = '{"results": ' + result + '}'
+            else:
+                records = request.get("articles")
+                if not isinstance(records, list):
+                    raise RequestError(400, "'articles' must be a list")
+                if len(records) > self.service.max_batch:
+                    raise RequestError(413, f"at most {self.service.max_batch} articles per batch")
+                results = self.service.score([_article(record) for record in records], detailed)
+                articles = len(results)
+                rows = []
+                for record, result in zip(records, results):
+                    prefix = f'{{"id": {json.dumps(record["id"])}, ' if "id" in record else "{"
+                    rows.append(prefix + '"results": ' + result + "}")
+                body = '{"results": [' + ", ".join(rows) + "]}"
+            status = 200
+        except RequestError as e:
+            status, body = e.status, json.dumps({"error": str(e)})
+        except Exception as e:
+            status, body = 500, json.dumps({"error": f"{type(e).__name__}: {e}"})
+        finally:
+            metrics.request_finished()
+        self._send(status, body)
+        metrics.observe(endpoint, status, time.perf_counter() - started, articles)
+
+    def _read_body(self):
+        length = self.headers.get("Content-Length", "")
+        if not length.isdigit():
+            self.close_connection = True
+            raise RequestError(411, "Content-Length required")
+        if int(length) > self.max_body:
+            self.close_connection = True
+            raise RequestError(413, f"request body over {self.max_body} bytes")
+        return self.rfile.read(int(length))
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            # The unread body would otherwise be parsed as the next request
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # One line per request on stderr is too slow under load; use /metrics
+        pass
+
+
+def make_server(host="127.0.0.1", port=8000, service=None, **kwargs):
+    """
+    Create the HTTP server; call ``serve_forever()`` on it to run.
+
+    Args:
+        host (str): Interface to listen on
+        port (int): Port to listen on (0 picks a free one)
+        service (ScoringService): Defaults to one built from ``kwargs``
+        **kwargs: ScoringService options
+
+    Returns:
+        ThreadingHTTPServer: The server, with the service as ``.service``
+    """
+    service = service or ScoringService(**kwargs)
+    handler = type("Handler", (ScoringHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Yoast SEO evaluator over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Articles per worker task in a batch")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Results kept in memory (0 disables)")
+    parser.add_argument("--max-batch", type=int, default=1000, help="Largest batch request")
+    args = parser.parse_args(argv)
+
+    server = make_server(
+        args.host, args.port,
+        workers=args.workers, chunksize=args.chunksize, cache_size=args.cache_size, max_batch=args.max_batch,
+    )
+    print(f"Serving on http://{args.host}:{server.server_port} with {server.service.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+if __name__ == "__main__":
+    main()
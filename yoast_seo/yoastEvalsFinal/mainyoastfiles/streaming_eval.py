@@ -0,0 +1,140 @@
+import argparse
+import sys
+
+from article_document import NON_SPACE_RE, PARAGRAPH_BREAK_RE, rstrip_end
+from incremental_eval import ParagraphStats, StatsAggregator
+from keyphrase_index import StreamingKeyphraseCounter
+from yoastevals import score_article
+
+
+class StreamingEvaluator:
+    """
+    Evaluate an article fed in chunks, e.g. read from a large file or a feed.
+
+    Text is buffered only until the current paragraph is complete. Each
+    finished paragraph is measured, folded into running totals and dropped,
+    so memory is bounded by the largest paragraph rather than the article.
+
+    Markdown links or ``<img>`` tags broken across a blank line are not
+    detected, since the text on either side is never held at the same time.
+
+    Args:
+        focus_keyword (str): The focus keyword or keyphrase
+    """
+
+    def __init__(self, focus_keyword: str):
+        self.focus_keyword = focus_keyword
+        self._aggregator = StatsAggregator()
+        self._keyphrase = StreamingKeyphraseCounter(focus_keyword.lower().strip().split())
+        self._buffer = ""
+        # Where in the buffer a paragraph break may start
+        self._scan_from = 0
+        # True while between paragraphs (or before the first one)
+        self._in_gap = True
+        self._started = False
+
+    def feed(self, chunk: str):
+        """Add the next chunk of article text."""
+        buf = self._buffer + chunk
+        pos = 0
+        while True:
+            if self._in_gap:
+                m = NON_SPACE_RE.search(buf, pos)
+                if m is None:
+                    # Keep only what follows the last newline: the indentation
+                    # of the next paragraph's first line
+                    newline = buf.rfind('\n', pos)
+                    self._buffer = buf[newline + 1:] if newline >= 0 else buf[pos:]
+                    if not self._started:
+                        self._buffer = ""
+                    self._scan_from = 0
+                    return
+                if self._started:
+                    newline = buf.rfind('\n', pos, m.start())
+                    pos = newline + 1 if newline >= 0 else pos
+                else:
+                    pos = m.start()
+                    self._started = True
+                self._in_gap = False
+                self._scan_from = pos
+
+            m = PARAGRAPH_BREAK_RE.search(buf, self._scan_from)
+            if m is None:
+                self._buffer = buf[pos:]
+                self._scan_from = rstrip_end(self._buffer, 0, len(self._buffer))
+                return
+            self._add_paragraph(buf[pos:m.start()].rstrip())
+            pos = m.start()
+            self._in_gap = True
+
+    def finish(self):
+        """
+        Score the article once all chunks have been fed.
+
+        Returns:
+            dict: Maps each criterion to "Green", "Orange" or "Red"
+        """
+        if not self._in_gap:
+            unit = self._buffer.rstrip()
+            if unit.strip():
+                self._add_paragraph(unit)
+            self._buffer = ""
+            self._in_gap = True
+        return score_article(self._aggregator.finish(), self.focus_keyword, self._keyphrase)
+
+    def _add_paragraph(self, unit: str):
+        paragraph = ParagraphStats(unit)
+        self._aggregator.add(paragraph)
+        self._keyphrase.feed(paragraph.tokens)
+
+
+def evaluate_stream(chunks, focus_keyword: str):
+    """
+    Evaluate an article given as an iterable of text chunks.
+
+    Args:
+        chunks (iterable of str): The article text, in order
+        focus_keyword (str): The focus keyword or keyphrase
+
+    Returns:
+        dict: Maps each criterion to "Green", "Orange" or "Red"
+    """
+    evaluator = StreamingEvaluator(focus_keyword)
+    for chunk in chunks:
+        evaluator.feed(chunk)
+    return evaluator.finish()
+
+
+def evaluate_file(fileobj, focus_keyword: str, chunk_size: int = 1 << 16):
+    """
+    Evaluate an article read chunk by chunk from a text file object.
+
+    Args:
+        fileobj: An open text file (or sys.stdin)
+        focus_keyword (str): The focus keyword or keyphrase
+        chunk_size (int): Number of characters read at a time
+
+    Returns:
+        dict: Maps each criterion to "Green", "Orange" or "Red"
+    """
+    return evaluate_stream(iter(lambda: fileobj.read(chunk_size), ""), focus_keyword)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a large article without loading it into memory.")
+    parser.add_argument("input", help="Article file ('-' for stdin)")
+    parser.add_argument("-k", "--keyphrase", required=True, help="Focus keyword or keyphrase")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        scores = evaluate_file(sys.stdin, args.keyphrase)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            scores = evaluate_file(f, args.keyphrase)
+    print("SEO Evaluation Results:")
+    for criterion, score in scores.items():
+        print(f"{criterion}: {score}")
+
+
+if __name__ == "__main__":
+    main()
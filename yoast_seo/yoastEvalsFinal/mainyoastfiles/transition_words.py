@@ -0,0 +1,208 @@
+from typing import List
+
+from article_document import ArticleDocument, WORD_RE
+
+TRANSITION_WORDS = [
+    # Addition
+    "also", "moreover", "furthermore", "besides", "in addition", "additionally", "what’s more", 
+    "not only that", "too", "as well",
+    
+    # Contrast
+    "however", "but", "on the other hand", "yet", "although", "though", "even though", "whereas", 
+    "while", "conversely",
+    
+    # Cause and Effect
+    "therefore", "consequently", "as a result", "thus", "hence", "so", "because", "since", 
+    "for this reason", "due to",
+    
+    # Comparison
+    "similarly", "likewise", "in the same way", "just as", "equally", "correspondingly", 
+    "in like manner", "by the same token",
+    
+    # Clarification
+    "in other words", "that is", "namely", "specifically", "to clarify", "to put it another way",
+    
+    # Sequence/Order
+    "first", "second", "third", "next", "then", "afterwards", "subsequently", "finally", 
+    "at last", "in the meantime", "meanwhile", "earlier", "later", "previously",
+    
+    # Examples/Illustration
+    "for example", "for instance", "such as", "including", "to illustrate", "in particular", 
+    "specifically", "like",
+    
+    # Emphasis
+    "indeed", "in fact", "certainly", "of course", "without a doubt", "surely", "to be sure", 
+    "undoubtedly",
+    
+    # Summary/Conclusion
+    "in conclusion", "to summarize", "in summary", "in short", "in brief", "all in all", "overall", 
+    "finally",
+    
+    # Time
+    "before", "after", "during", "while", "as soon as", "once", "until", "when", "whenever", 
+    "at the same time", "nowadays",
+    
+    # Place
+    "here", "there", "over there", "nearby", "above", "below", "wherever",
+    
+    # Concession
+    "although", "even though", "though", "granted", "nonetheless", "nevertheless", "still", 
+    "despite", "regardless",
+    
+    # Purpose
+    "in order to", "so that", "for the purpose of", "with this in mind", "to this end",
+    
+    # Condition
+    "if", "unless", "provided that", "as long as", "in case",
+    
+    # Illustration
+    "for instance", "such as", "including", "namely", "to illustrate",
+    
+    # Agreement
+    "of course", "certainly", "naturally", "undoubtedly",
+    
+    # Addition (Informal)
+    "plus", "and then", "on top of that",
+    
+    # Opinion
+    "in my opinion", "i believe", "from my perspective", "as i see it",
+    
+    # Frequency
+    "always", "often", "sometimes", "rarely", "never",
+    
+    # Intensification
+    "above all", "beyond", "most importantly", "especially", "chiefly",
+    
+    # Repetition
+    "again", "over and over", "repeatedly", "once more",
+    
+    # Cause and Reason
+    "because of", "owing to", "due to", "as a result of",
+    
+    # Generalization
+    "generally", "overall", "broadly", "as a rule", "on the whole",
+    
+    # Alternatives
+    "or", "alternatively", "otherwise",
+    
+    # Agreement/Disagreement
+    "admittedly", "in contrast", "while it is true", "on the contrary",
+    
+    # Informal
+    "anyway", "by the way", "in any case",
+    
+    # Formal
+    "henceforth", "thereby", "herein",
+    
+    # Colloquial
+    "for starters", "to top it off", "at the end of the day",
+    
+    # Qualifying
+    "almost", "nearly", "sometimes", "possibly", "apparently",
+    
+    # Conditional
+    "supposing", "provided that", "on condition that",
+    
+    # Contrast (Advanced)
+    "albeit", "alike", "distinct",
+    
+    # Frequency/Intensity
+    "rarely", "constantly", "perpetually",
+    
+    # Opinion (Advanced)
+    "it is evident", "undeniably", "arguably",
+    
+    # Cause/Effect (Formal)
+    "consequently", "inevitably", "ergo",
+    
+    # Conclusion (Advanced)
+    "in hindsight", "retrospectively", "to sum up",
+    
+    # Additive (Advanced)
+    "moreover", "what’s more"
+]
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        # Keyed by (separator, token) so that "in addition" only matches when
+        # the words are joined by exactly the same separator as in the phrase
+        self.children = {}
+        self.terminal = False
+
+
+class TransitionMatcher:
+    """
+    Token-level phrase trie that finds transition phrases in one pass.
+
+    A phrase matches when its lowercased tokens appear consecutively in the
+    article and the text between them is exactly the separator used in the
+    phrase. This is the same as searching each sentence for
+    ``\\b<phrase>\\b``, without compiling or running one regex per phrase.
+
+    Args:
+        phrases (iterable of str): Transition words and phrases
+    """
+
+    def __init__(self, phrases):
+        self.roots = {}
+        self.phrases = sorted(set(p.lower() for p in phrases))
+        for phrase in self.phrases:
+            words = list(WORD_RE.finditer(phrase))
+            if not words:
+                continue
+            first = words[0].group()
+            node = self.roots.get(first)
+            if node is None:
+                node = self.roots[first] = _TrieNode()
+            for prev, word in zip(words, words[1:]):
+                key = (phrase[prev.end():word.start()], word.group())
+                child = node.children.get(key)
+                if child is None:
+                    child = node.children[key] = _TrieNode()
+                node = child
+            node.terminal = True
+
+    def _matches_at(self, doc: ArticleDocument, i: int, end: int) -> bool:
+        node = self.roots.get(doc.tokens[i])
+        if node is None:
+            return False
+        tokens, starts, ends, text = doc.tokens, doc.token_starts, doc.token_ends, doc.text
+        while True:
+            if node.terminal:
+                return True
+            i += 1
+            if i >= end or not node.children:
+                return False
+            node = node.children.get((text[ends[i - 1]:starts[i]], tokens[i]))
+            if node is None:
+                return False
+
+    def sentence_flags(self, doc: ArticleDocument) -> List[bool]:
+        """
+        Flag every sentence of the document that contains a transition phrase.
+
+        Args:
+            doc (ArticleDocument): The parsed article
+
+        Returns:
+            list of bool: One flag per entry in ``doc.sentences``
+        """
+        roots = self.roots
+        tokens = doc.tokens
+        flags = []
+        for sentence in doc.sentences:
+            end = sentence.token_end
+            found = False
+            for i in range(sentence.token_start, end):
+                if tokens[i] in roots and self._matches_at(doc, i, end):
+                    found = True
+                    break
+            flags.append(found)
+        return flags
+
+
+# Built once at import time and shared by every evaluation
+TRANSITION_MATCHER = TransitionMatcher(TRANSITION_WORDS)
@@ -1,76 +1,353 @@
-import re
+from typing import Dict, List, NamedTuple, Tuple
+
+from article_document import parse_article
+from keyphrase_index import find_keyphrase, find_keyphrases
+from transition_words import TRANSITION_MATCHER
+
+# Bump whenever a criterion or threshold changes so that cached results
+# computed under the old rules are not reused
+RULESET_VERSION = "1"
+
+# Criterion names in the order they are reported
+CRITERIA = (
+    "Content Length",
+    "Outbound Links",
+    "Internal Links",
+    "Images",
+    "Keyphrase in Introduction",
+    "Keyphrase Density",
+    "Keyphrase Distribution",
+    "Transition Words",
+    "Consecutive Sentences",
+    "Subheading Distribution",
+    "Paragraph Length",
+    "Sentence Length",
+    "Keyphrase in Subheadings",
+)
+
+# What each score means, reported next to the measured value
+THRESHOLDS = {
+    "Content Length": "Green: more than 900 words; Orange: 600-900; Red: fewer than 600",
+    "Outbound Links": "Green: at least one outbound link; Red: none",
+    "Internal Links": "Green: at least one internal link; Red: none",
+    "Images": "Green: at least one image; Red: none",
+    "Keyphrase in Introduction": "Green: keyphrase in the first sentence; Red: otherwise",
+    "Keyphrase Density": "Green: 0.5-2.5%; Orange: 2.5-3%; Red: otherwise",
+    "Keyphrase Distribution": (
+        "Green: 6+ occurrences in at least half of the 150-word segments; "
+        "Orange: 4+ occurrences; Red: fewer than 4"
+    ),
+    "Transition Words": "Green: 30%+ of sentences; Orange: 20-30%; Red: under 20%",
+    "Consecutive Sentences": (
+        "Green: at most one pair of sentences starting with the same word; "
+        "Orange: several pairs; Red: 3+ in a row"
+    ),
+    "Subheading Distribution": "Green: no section over 300 words; Orange: one; Red: several",
+    "Paragraph Length": (
+        "Green: every paragraph under 150 words with 3+ sentences; "
+        "Orange: a paragraph of 150-200 words; Red: a paragraph over 200 words or under 3 sentences"
+    ),
+    "Sentence Length": "Green: at most 25% of sentences over 20 words; Orange: 25-30%; Red: over 30%",
+    "Keyphrase in Subheadings": "Green: keyphrase in 50%+ of headings; Orange: 20-50%; Red: under 20%",
+}
+
+
+class CriterionResult(NamedTuple):
+    """
+    Outcome of one criterion: the label together with the number it was
+    decided on, so results can be compared and aggregated numerically.
+    """
+    score: str
+    # The measurement compared against the thresholds, in ``unit``
+    value: float
+    unit: str
+    thresholds: str
+    # Supporting measurements (counts, per-segment or per-section figures)
+    details: dict
+
+
+def _result(criterion, score, value, unit, **details) -> CriterionResult:
+    return CriterionResult(score, float(value), unit, THRESHOLDS[criterion], details)
+
+
+class ArticleStats(NamedTuple):
+    """
+    Keyphrase-independent measurements that the 13 criteria are scored from.
+
+    Built from a parsed document by collect_stats, or aggregated from partial
+    statistics by the incremental evaluator.
+    """
+    word_count: int
+    external_link_count: int
+    internal_link_count: int
+    image_count: int
+    sentence_count: int
+    transition_sentence_count: int
+    long_sentence_count: int
+    # Longest run of sentences starting with the same word, and the number
+    # of adjacent sentence pairs starting with the same word
+    max_consecutive: int
+    consecutive_pairs: int
+    section_word_counts: List[int]
+    # (word count, sentence count) of every paragraph
+    paragraph_shapes: List[Tuple[int, int]]
+    headings: List[str]
+    intro_sentence: str
+
+
+# Called with an EvaluationProfile after every evaluate_article call; see
+# set_profile_hook
+_profile_hook = None
+
+
+def set_profile_hook(hook):
+    """
+    Time every evaluate_article / evaluate_article_detailed call.
+
+    While a hook is set, evaluations run through eval_profiler and the hook
+    receives the EvaluationProfile of each one, e.g. to forward it to a
+    metrics system. Without a hook nothing is timed.
+
+    Args:
+        hook (callable): Called with each EvaluationProfile; None disables
+            profiling
+    """
+    global _profile_hook
+    _profile_hook = hook
+
 
 def evaluate_article(article_content: str, focus_keyword: str):
+    return result_labels(evaluate_article_detailed(article_content, focus_keyword))
+
+
+def evaluate_article_detailed(article_content: str, focus_keyword: str) -> Dict[str, CriterionResult]:
+    """
+    Evaluate an article, keeping the measured value behind every label.
+
+    Args:
+        article_content (str): The article text
+        focus_keyword (str): The focus keyword or keyphrase
+
+    Returns:
+        dict: Maps each criterion to a CriterionResult
+    """
+    if _profile_hook is not None:
+        from eval_profiler import profile_evaluation
+        results, profile = profile_evaluation(article_content, focus_keyword)
+        _profile_hook(profile)
+        return results
+
+    # Parse the article once; every criterion below reads from this document
+    doc = parse_article(article_content)
+    return score_document(doc, focus_keyword)[0]
+
+
+def score_document(doc, focus_keyword: str, timer=None):
+    """
+    Measure and score a parsed document against a focus keyphrase.
+
+    Args:
+        doc (ArticleDocument): The parsed article
+        focus_keyword (str): The focus keyword or keyphrase
+        timer (callable): Optional, see collect_stats; also called with
+            "keyphrase search" and "scoring"
+
+    Returns:
+        tuple: (dict of CriterionResult, KeyphraseIndex)
+    """
     focus_keyword_lower = focus_keyword.lower().strip()
+    if timer is not None:
+        return _score_document_timed(doc, focus_keyword, focus_keyword_lower, timer)
+    stats = collect_stats(doc)
 
-    lines = article_content.strip().split('\n')
-    
-    # Identify headings
-    headings = []
-    for line in lines:
-        if line.startswith('#'):
-            headings.append(line.strip())
+    # Locate every keyphrase occurrence once; density and distribution
+    # are both derived from these token offsets
+    keyphrase_index = find_keyphrase(doc.tokens, focus_keyword_lower.split())
 
-    # Extract words
-    words = re.findall(r"\w+", article_content)
-    total_word_count = len(words)
+    return score_article_detailed(stats, focus_keyword, keyphrase_index), keyphrase_index
 
-    # Extract sentences
-    sentence_candidates = re.split(r'[.?!]+', article_content)
-    sentences = [s.strip() for s in sentence_candidates if s.strip()]
-    total_sentences = len(sentences)
 
-    # Extract paragraphs
-    paragraph_candidates = re.split(r'\n\s*\n', article_content.strip())
-    paragraphs = [p.strip() for p in paragraph_candidates if p.strip()]
+def _score_document_timed(doc, focus_keyword, focus_keyword_lower, timer):
+    # score_document with every step timed; kept apart so that the plain
+    # path runs no timing code at all
+    stats = collect_stats(doc, timer)
+    with timer("keyphrase search"):
+        keyphrase_index = find_keyphrase(doc.tokens, focus_keyword_lower.split())
+    with timer("scoring"):
+        results = score_article_detailed(stats, focus_keyword, keyphrase_index)
+    return results, keyphrase_index
 
-    # Identify images
-    has_image = bool(re.search(r'!\[.*?\]\(.*?\)', article_content)) or bool(re.search(r'<img\s+[^>]*>', article_content))
 
-    # Identify external links
-    external_links = re.findall(r'https?://[^\s)]+', article_content)
-    external_link_count = len(external_links)
+def result_labels(results: Dict[str, CriterionResult]):
+    """Reduce detailed results to the criterion -> label dict of evaluate_article."""
+    return {criterion: result.score for criterion, result in results.items()}
 
-    # Identify internal links
-    # Internal links are assumed to be markdown links without http/https
-    internal_links = re.findall(r'\[[^\]]*\]\((?!https?://)[^)]+\)', article_content)
-    internal_link_count = len(internal_links)
 
-    # -----------------------------
-    # Criteria Checks
-    # -----------------------------
+def evaluate_keyphrases(article_content: str, keyphrases):
+    """
+    Evaluate an article against several keyphrases (e.g. a focus keyphrase
+    plus its synonyms) in one pass.
 
-    # 1. Content Length
-    if total_word_count > 900:
-        content_length_score = "Green"
-    elif 600 <= total_word_count <= 900:
-        content_length_score = "Orange"
-    else:
-        content_length_score = "Red"
+    The article is parsed once, the keyphrase-independent criteria are scored
+    once, and all keyphrases are located with a single multi-pattern scan.
 
-    # 2. Outbound Links
-    outbound_links_score = "Green" if external_link_count > 0 else "Red"
+    Args:
+        article_content (str): The article text
+        keyphrases (list of str): Focus keyphrase and related keyphrases
 
-    # 3. Internal Links
-    internal_links_score = "Green" if internal_link_count > 0 else "Red"
+    Returns:
+        dict: Maps each keyphrase to a results dict shaped like the one
+            returned by evaluate_article
+    """
+    doc = parse_article(article_content)
+    stats = collect_stats(doc)
+    shared_scores = _document_scores(stats)
 
-    # 4. Images
-    images_score = "Green" if has_image else "Red"
+    keyphrases = list(dict.fromkeys(keyphrases))
+    lowered = [kp.lower().strip() for kp in keyphrases]
+    indexes = find_keyphrases(doc.tokens, [kp.split() for kp in lowered])
+
+    return {
+        kp: result_labels(_compile_results(shared_scores, _keyphrase_scores(stats, kp_lower, index)))
+        for kp, kp_lower, index in zip(keyphrases, lowered, indexes)
+    }
+
+
+def collect_stats(doc, timer=None) -> ArticleStats:
+    """
+    Measure a parsed document for scoring.
+
+    Args:
+        doc (ArticleDocument): The parsed article
+        timer (callable): Optional; called with the criterion name before
+            each measurement and returns a context manager wrapped around
+            it (this is how eval_profiler times the evaluation)
+
+    Returns:
+        ArticleStats: The keyphrase-independent measurements
+    """
+    if timer is not None:
+        return _collect_stats_timed(doc, timer)
+    tokens = doc.tokens
+    sentences = doc.sentences
+    first_words = [tokens[s.token_start] if s.token_end > s.token_start else "" for s in sentences]
+    max_consecutive, consecutive_pairs = first_word_runs(first_words)
+    return ArticleStats(
+        word_count=doc.word_count,
+        external_link_count=len(doc.external_link_spans),
+        internal_link_count=len(doc.internal_link_spans),
+        image_count=len(doc.image_spans),
+        sentence_count=len(sentences),
+        transition_sentence_count=sum(TRANSITION_MATCHER.sentence_flags(doc)),
+        long_sentence_count=sum(1 for s in sentences if s.token_end - s.token_start > 20),
+        max_consecutive=max_consecutive,
+        consecutive_pairs=consecutive_pairs,
+        section_word_counts=doc.section_word_counts(),
+        paragraph_shapes=[(p.token_end - p.token_start, p.sentence_count) for p in doc.paragraphs],
+        headings=doc.headings,
+        intro_sentence=doc.intro_sentence(),
+    )
+
+
+def _collect_stats_timed(doc, timer) -> ArticleStats:
+    # collect_stats one measurement at a time, for the profiler. Any change
+    # to the measurements above must be made here too; tests/test_eval_profiler.py
+    # checks that both give the same results.
+    tokens = doc.tokens
+    sentences = doc.sentences
+    with timer("Transition Words"):
+        transition_sentence_count = sum(TRANSITION_MATCHER.sentence_flags(doc))
+    with timer("Consecutive Sentences"):
+        first_words = [tokens[s.token_start] if s.token_end > s.token_start else "" for s in sentences]
+        max_consecutive, consecutive_pairs = first_word_runs(first_words)
+    with timer("Sentence Length"):
+        long_sentence_count = sum(1 for s in sentences if s.token_end - s.token_start > 20)
+    with timer("Subheading Distribution"):
+        section_word_counts = doc.section_word_counts()
+    with timer("Paragraph Length"):
+        paragraph_shapes = [(p.token_end - p.token_start, p.sentence_count) for p in doc.paragraphs]
+    with timer("Keyphrase in Introduction"):
+        intro_sentence = doc.intro_sentence()
+    return ArticleStats(
+        word_count=doc.word_count,
+        external_link_count=len(doc.external_link_spans),
+        internal_link_count=len(doc.internal_link_spans),
+        image_count=len(doc.image_spans),
+        sentence_count=len(sentences),
+        transition_sentence_count=transition_sentence_count,
+        long_sentence_count=long_sentence_count,
+        max_consecutive=max_consecutive,
+        consecutive_pairs=consecutive_pairs,
+        section_word_counts=section_word_counts,
+        paragraph_shapes=paragraph_shapes,
+        headings=doc.headings,
+        intro_sentence=intro_sentence,
+    )
+
+
+def first_word_runs(first_words):
+    """
+    Measure how often consecutive sentences start with the same word.
+
+    Args:
+        first_words (list of str): Lowercased first word of every sentence
+            ("" for sentences without words)
+
+    Returns:
+        tuple: (longest run of equal first words, number of adjacent pairs
+            with equal first words)
+    """
+    max_consecutive = 1
+    current_run = 1
+    pairs_count = 0
+    for i in range(1, len(first_words)):
+        if first_words[i] == first_words[i-1] and first_words[i] != "":
+            current_run += 1
+            pairs_count += 1
+            max_consecutive = max(max_consecutive, current_run)
+        else:
+            current_run = 1
+    return max_consecutive, pairs_count
+
+
+def score_article(stats: ArticleStats, focus_keyword: str, keyphrase_index):
+    """
+    Score all 13 criteria from precomputed statistics.
+
+    Args:
+        stats (ArticleStats): Keyphrase-independent measurements
+        focus_keyword (str): The focus keyword or keyphrase
+        keyphrase_index (KeyphraseIndex): Occurrences of the keyphrase
+
+    Returns:
+        dict: Maps each criterion to "Green", "Orange" or "Red"
+    """
+    return result_labels(score_article_detailed(stats, focus_keyword, keyphrase_index))
+
+
+def score_article_detailed(stats: ArticleStats, focus_keyword: str, keyphrase_index) -> Dict[str, CriterionResult]:
+    """Like score_article, but maps each criterion to a CriterionResult."""
+    focus_keyword_lower = focus_keyword.lower().strip()
+    return _compile_results(_document_scores(stats), _keyphrase_scores(stats, focus_keyword_lower, keyphrase_index))
+
+
+def _compile_results(document_scores, keyphrase_scores):
+    scores = {**document_scores, **keyphrase_scores}
+    return {criterion: scores[criterion] for criterion in CRITERIA}
+
+
+def _keyphrase_scores(stats, focus_keyword_lower, keyphrase_index):
+    """Score the criteria that depend on the focus keyphrase."""
+    total_word_count = stats.word_count
+    headings = stats.headings
 
     # 5. Keyphrase in Introduction
-    introduction = paragraphs[0] if paragraphs else article_content
-    intro_first_sentence = re.split(r'[.?!]+', introduction)
-    intro_first_sentence = intro_first_sentence[0].strip().lower() if intro_first_sentence else ""
+    intro_first_sentence = stats.intro_sentence.lower()
     keyphrase_in_introduction = focus_keyword_lower in intro_first_sentence
     keyphrase_intro_score = "Green" if keyphrase_in_introduction else "Red"
 
     # 6. Keyphrase Density
-    keyword_words = focus_keyword_lower.split()
-    count_occurrences = 0
-    article_words_lower = [w.lower() for w in words]
-    for i in range(len(article_words_lower) - len(keyword_words) + 1):
-        if article_words_lower[i:i+len(keyword_words)] == keyword_words:
-            count_occurrences += 1
+    count_occurrences = keyphrase_index.count
     keyphrase_density = (count_occurrences / total_word_count * 100) if total_word_count > 0 else 0
     if 0.5 <= keyphrase_density <= 2.5:
         keyphrase_density_score = "Green"
@@ -81,152 +358,70 @@ def evaluate_article(article_content: str, focus_keyword: str):
 
     # 7. Keyphrase Distribution
     segment_size = 150
-    segments = [article_words_lower[i:i+segment_size] for i in range(0, len(article_words_lower), segment_size)]
-    segment_counts = []
-    for seg in segments:
-        seg_count = 0
-        for i in range(len(seg)-len(keyword_words)+1):
-            if seg[i:i+len(keyword_words)] == keyword_words:
-                seg_count += 1
-        segment_counts.append(seg_count)
+    # Occurrences straddling two segments are not counted in either
+    segment_counts = keyphrase_index.segment_counts(segment_size)
     total_occ = sum(segment_counts)
+    segments_with_occ = sum(1 for c in segment_counts if c > 0)
     if total_occ < 4:
         keyphrase_distribution_score = "Red"
     else:
-        segments_with_occ = sum(1 for c in segment_counts if c > 0)
-        if total_occ >= 6 and segments_with_occ >= len(segments)/2:
+        if total_occ >= 6 and segments_with_occ >= len(segment_counts)/2:
             keyphrase_distribution_score = "Green"
         else:
             keyphrase_distribution_score = "Orange"
 
-    # 8. Transition Words
-    transition_words = [
-        # Addition
-        "also", "moreover", "furthermore", "besides", "in addition", "additionally", "what’s more", 
-        "not only that", "too", "as well",
-        
-        # Contrast
-        "however", "but", "on the other hand", "yet", "although", "though", "even though", "whereas", 
-        "while", "conversely",
-        
-        # Cause and Effect
-        "therefore", "consequently", "as a result", "thus", "hence", "so", "because", "since", 
-        "for this reason", "due to",
-        
-        # Comparison
-        "similarly", "likewise", "in the same way", "just as", "equally", "correspondingly", 
-        "in like manner", "by the same token",
-        
-        # Clarification
-        "in other words", "that is", "namely", "specifically", "to clarify", "to put it another way",
-        
-        # Sequence/Order
-        "first", "second", "third", "next", "then", "afterwards", "subsequently", "finally", 
-        "at last", "in the meantime", "meanwhile", "earlier", "later", "previously",
-        
-        # Examples/Illustration
-        "for example", "for instance", "such as", "including", "to illustrate", "in particular", 
-        "specifically", "like",
-        
-        # Emphasis
-        "indeed", "in fact", "certainly", "of course", "without a doubt", "surely", "to be sure", 
-        "undoubtedly",
-        
-        # Summary/Conclusion
-        "in conclusion", "to summarize", "in summary", "in short", "in brief", "all in all", "overall", 
-        "finally",
-        
-        # Time
-        "before", "after", "during", "while", "as soon as", "once", "until", "when", "whenever", 
-        "at the same time", "nowadays",
-        
-        # Place
-        "here", "there", "over there", "nearby", "above", "below", "wherever",
-        
-        # Concession
-        "although", "even though", "though", "granted", "nonetheless", "nevertheless", "still", 
-        "despite", "regardless",
-        
-        # Purpose
-        "in order to", "so that", "for the purpose of", "with this in mind", "to this end",
-        
-        # Condition
-        "if", "unless", "provided that", "as long as", "in case",
-        
-        # Illustration
-        "for instance", "such as", "including", "namely", "to illustrate",
-        
-        # Agreement
-        "of course", "certainly", "naturally", "undoubtedly",
-        
-        # Addition (Informal)
-        "plus", "and then", "on top of that",
-        
-        # Opinion
-        "in my opinion", "i believe", "from my perspective", "as i see it",
-        
-        # Frequency
-        "always", "often", "sometimes", "rarely", "never",
-        
-        # Intensification
-        "above all", "beyond", "most importantly", "especially", "chiefly",
-        
-        # Repetition
-        "again", "over and over", "repeatedly", "once more",
-        
-        # Cause and Reason
-        "because of", "owing to", "due to", "as a result of",
-        
-        # Generalization
-        "generally", "overall", "broadly", "as a rule", "on the whole",
-        
-        # Alternatives
-        "or", "alternatively", "otherwise",
-        
-        # Agreement/Disagreement
-        "admittedly", "in contrast", "while it is true", "on the contrary",
-        
-        # Informal
-        "anyway", "by the way", "in any case",
-        
-        # Formal
-        "henceforth", "thereby", "herein",
-        
-        # Colloquial
-        "for starters", "to top it off", "at the end of the day",
-        
-        # Qualifying
-        "almost", "nearly", "sometimes", "possibly", "apparently",
-        
-        # Conditional
-        "supposing", "provided that", "on condition that",
-        
-        # Contrast (Advanced)
-        "albeit", "alike", "distinct",
-        
-        # Frequency/Intensity
-        "rarely", "constantly", "perpetually",
-        
-        # Opinion (Advanced)
-        "it is evident", "undeniably", "arguably",
-        
-        # Cause/Effect (Formal)
-        "consequently", "inevitably", "ergo",
-        
-        # Conclusion (Advanced)
-        "in hindsight", "retrospectively", "to sum up",
-        
-        # Additive (Advanced)
-        "moreover", "what’s more"
-    ]
-    transition_words = list(set(tw.lower() for tw in transition_words))  # Remove duplicates and lowercase
-
-    sentences_with_transition = 0
-    for s in sentences:
-        s_lower = s.lower()
-        if any(re.search(r'\b' + re.escape(tw) + r'\b', s_lower) for tw in transition_words):
-            sentences_with_transition += 1
+    # 13. Keyphrase in Subheadings
+    keyphrase_in_headings = sum(1 for h in headings if focus_keyword_lower in h.lower())
+    kp_heading_ratio = (keyphrase_in_headings / len(headings) * 100) if len(headings) > 0 else 0
+    if kp_heading_ratio >= 50:
+        keyphrase_subheading_score = "Green"
+    elif 20 <= kp_heading_ratio < 50:
+        keyphrase_subheading_score = "Orange"
+    else:
+        keyphrase_subheading_score = "Red"
+
+    return {
+        "Keyphrase in Introduction": _result(
+            "Keyphrase in Introduction", keyphrase_intro_score, keyphrase_in_introduction, "bool"),
+        "Keyphrase Density": _result(
+            "Keyphrase Density", keyphrase_density_score, keyphrase_density, "%",
+            occurrences=count_occurrences, word_count=total_word_count),
+        "Keyphrase Distribution": _result(
+            "Keyphrase Distribution", keyphrase_distribution_score, total_occ, "occurrences",
+            segment_size=segment_size, segment_counts=segment_counts),
+        "Keyphrase in Subheadings": _result(
+            "Keyphrase in Subheadings", keyphrase_subheading_score, kp_heading_ratio, "%",
+            headings_with_keyphrase=keyphrase_in_headings, heading_count=len(headings)),
+    }
+
+
+def _document_scores(stats):
+    """Score the criteria that do not depend on the focus keyphrase."""
+    total_word_count = stats.word_count
+    total_sentences = stats.sentence_count
+    sentences_with_transition = stats.transition_sentence_count
+    external_link_count = stats.external_link_count
+    internal_link_count = stats.internal_link_count
+    image_count = stats.image_count
+
+    # 1. Content Length
+    if total_word_count > 900:
+        content_length_score = "Green"
+    elif 600 <= total_word_count <= 900:
+        content_length_score = "Orange"
+    else:
+        content_length_score = "Red"
+
+    # 2. Outbound Links
+    outbound_links_score = "Green" if external_link_count > 0 else "Red"
+
+    # 3. Internal Links
+    internal_links_score = "Green" if internal_link_count > 0 else "Red"
+
+    # 4. Images
+    images_score = "Green" if image_count > 0 else "Red"
 
+    # 8. Transition Words
     transition_percentage = (sentences_with_transition / total_sentences * 100) if total_sentences > 0 else 0
     if transition_percentage < 20:
         transition_score = "Red"
@@ -236,46 +431,17 @@ def evaluate_article(article_content: str, focus_keyword: str):
         transition_score = "Green"
 
     # 9. Consecutive Sentences Start with Same Word
-    def first_word(sentence):
-        w = re.findall(r"\w+", sentence)
-        return w[0].lower() if w else ""
-    
-    first_words = [first_word(s) for s in sentences]
-    
-    max_consecutive = 1
-    current_run = 1
-    for i in range(1, len(first_words)):
-        if first_words[i] == first_words[i-1] and first_words[i] != "":
-            current_run += 1
-            max_consecutive = max(max_consecutive, current_run)
-        else:
-            current_run = 1
-    
+    max_consecutive = stats.max_consecutive
+    # Instances of two consecutive sentences starting with the same word
+    pairs_count = stats.consecutive_pairs
     if max_consecutive >= 3:
         consecutive_sentences_score = "Red"
     else:
-        # Count instances of two consecutive sentences starting with the same word
-        pairs_count = 0
-        for i in range(1, len(first_words)):
-            if first_words[i] == first_words[i-1] and first_words[i] != "":
-                pairs_count += 1
         consecutive_sentences_score = "Orange" if pairs_count > 1 else "Green"
 
     # 10. Subheading Distribution
-    # Split article by headings into sections
-    heading_indices = [i for i, l in enumerate(lines) if l.strip().startswith('#')]
-    sections = []
-    if heading_indices:
-        for idx in range(len(heading_indices)):
-            start = heading_indices[idx] + 1
-            end = heading_indices[idx+1] if idx+1 < len(heading_indices) else len(lines)
-            section_text = '\n'.join(lines[start:end]).strip()
-            if section_text:
-                section_words = re.findall(r"\w+", section_text)
-                sections.append(len(section_words))
-    else:
-        # No headings at all, entire article is one section
-        sections = [total_word_count]
+    # Word counts of the sections between headings (whole article if none)
+    sections = stats.section_word_counts
 
     long_sections = [wcount for wcount in sections if wcount > 300]
     if len(long_sections) > 1:
@@ -287,11 +453,7 @@ def evaluate_article(article_content: str, focus_keyword: str):
 
     # 11. Paragraph Length
     paragraph_scores = []
-    for p in paragraphs:
-        p_words = re.findall(r"\w+", p)
-        p_word_count = len(p_words)
-        p_sentences = [s.strip() for s in re.split(r'[.?!]+', p) if s.strip()]
-        p_sentence_count = len(p_sentences)
+    for p_word_count, p_sentence_count in stats.paragraph_shapes:
         if p_word_count > 200:
             paragraph_scores.append("Red")
         elif 150 <= p_word_count <= 200:
@@ -310,7 +472,7 @@ def evaluate_article(article_content: str, focus_keyword: str):
         paragraph_length_score = "Green"
 
     # 12. Sentence Length
-    long_sentences = sum(1 for s in sentences if len(re.findall(r"\w+", s)) > 20)
+    long_sentences = stats.long_sentence_count
     long_percentage = (long_sentences / total_sentences * 100) if total_sentences > 0 else 0
     if long_percentage <= 25:
         sentence_length_score = "Green"
@@ -319,37 +481,29 @@ def evaluate_article(article_content: str, focus_keyword: str):
     else:
         sentence_length_score = "Red"
 
-    # 13. Keyphrase in Subheadings
-    keyphrase_in_headings = sum(1 for h in headings if focus_keyword_lower in h.lower())
-    kp_heading_ratio = (keyphrase_in_headings / len(headings) * 100) if len(headings) > 0 else 0
-    if kp_heading_ratio >= 50:
-        keyphrase_subheading_score = "Green"
-    elif 20 <= kp_heading_ratio < 50:
-        keyphrase_subheading_score = "Orange"
-    else:
-        keyphrase_subheading_score = "Red"
-
-    # -----------------------------
-    # Compile Results
-    # -----------------------------
-    results = {
-        "Content Length": content_length_score,
-        "Outbound Links": outbound_links_score,
-        "Internal Links": internal_links_score,
-        "Images": images_score,
-        "Keyphrase in Introduction": keyphrase_intro_score,
-        "Keyphrase Density": keyphrase_density_score,
-        "Keyphrase Distribution": keyphrase_distribution_score,
-        "Transition Words": transition_score,
-        "Consecutive Sentences": consecutive_sentences_score,
-        "Subheading Distribution": subheading_score,
-        "Paragraph Length": paragraph_length_score,
-        "Sentence Length": sentence_length_score,
-        "Keyphrase in Subheadings": keyphrase_subheading_score
+    return {
+        "Content Length": _result("Content Length", content_length_score, total_word_count, "words"),
+        "Outbound Links": _result("Outbound Links", outbound_links_score, external_link_count, "links"),
+        "Internal Links": _result("Internal Links", internal_links_score, internal_link_count, "links"),
+        "Images": _result("Images", images_score, image_count, "images"),
+        "Transition Words": _result(
+            "Transition Words", transition_score, transition_percentage, "%",
+            sentences_with_transition=sentences_with_transition, sentence_count=total_sentences),
+        "Consecutive Sentences": _result(
+            "Consecutive Sentences", consecutive_sentences_score, max_consecutive, "sentences",
+            pairs=pairs_count),
+        "Subheading Distribution": _result(
+            "Subheading Distribution", subheading_score, len(long_sections), "sections",
+            section_word_counts=list(sections)),
+        "Paragraph Length": _result(
+            "Paragraph Length", paragraph_length_score, len(paragraph_scores) - paragraph_scores.count("Green"),
+            "paragraphs", paragraph_word_counts=[words for words, _ in stats.paragraph_shapes],
+            paragraph_scores=paragraph_scores),
+        "Sentence Length": _result(
+            "Sentence Length", sentence_length_score, long_percentage, "%",
+            long_sentences=long_sentences, sentence_count=total_sentences),
     }
 
-    return results
-
 # Example usage with the provided article_content and a focus keyword:
 if __name__ == "__main__":
     article_content = """# US Demographics Reveal Surge in Herpes and Syphilis Cases Over 18 Months 